@@ -0,0 +1,201 @@
+"""识别任务跟踪模块 - 提交后立即返回，单线程轮询所有进行中的百炼识别任务"""
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from dashscope.audio.asr import Transcription
+    import dashscope
+except ImportError:
+    raise ImportError("缺少依赖库，请运行: pip install dashscope")
+
+from config import Config
+
+# 任务结束状态
+FINAL_STATUSES = ('SUCCEEDED', 'FAILED', 'CANCELED', 'UNKNOWN')
+
+# 查询连续出错多少次后放弃该任务
+MAX_FETCH_ERRORS = 5
+
+
+class AsrTracker:
+    """识别任务跟踪器
+
+    submit 提交任务后立即返回 Future，后台一个线程轮询所有进行中的任务（每个任务独立退避），
+    任务结束后在结果线程池中调用 on_done 并设置 Future 结果，轮询线程不做下载等耗时处理。进行中的任务记录在 SQLite 中，
+    进程重启后继续轮询，不重复提交；可按 key（音频哈希）找回进行中的任务。
+    """
+
+    def __init__(self, db_path: Path = None,
+                 on_done: Callable[[object, List[str], Dict[str, str]], Any] = None):
+        """
+        Args:
+            db_path: 任务记录数据库
+            on_done: 任务结束回调 (识别响应, file_urls, {file_url: key})，返回值作为 Future 的结果
+                （不设置时为识别响应）；重启后恢复的任务同样会调用
+        """
+        self.db_path = Path(db_path or Config.ASR_TASKS_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.on_done = on_done
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._tasks: Dict[str, dict] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._results = ThreadPoolExecutor(max_workers=Config.ASR_RESULT_WORKERS, thread_name_prefix='asr-result')
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS asr_tasks (
+                    task_id TEXT PRIMARY KEY,
+                    file_urls TEXT NOT NULL,
+                    keys TEXT,
+                    submitted_at TEXT
+                )
+            """)
+        self._resume()
+
+    def _resume(self):
+        """加载上次未完成的任务，继续轮询"""
+        with self._lock:
+            rows = self._conn.execute("SELECT task_id, file_urls, keys FROM asr_tasks").fetchall()
+            for task_id, file_urls, keys in rows:
+                self._track(task_id, json.loads(file_urls), json.loads(keys or '{}'))
+        if rows:
+            self._ensure_thread()
+
+    def _track(self, task_id: str, file_urls: List[str], keys: Dict[str, str]) -> Future:
+        future: Future = Future()
+        self._tasks[task_id] = {
+            'file_urls': file_urls,
+            'keys': keys,
+            'future': future,
+            'interval': Config.ASR_POLL_INTERVAL,
+            'next_poll': time.monotonic() + Config.ASR_POLL_INTERVAL,
+            'errors': 0,
+        }
+        return future
+
+    def submit(self, file_urls: List[str], keys: Dict[str, str] = None) -> Future:
+        """提交识别任务，立即返回 Future（结果为 on_done 的返回值）
+
+        Args:
+            file_urls: 音频公网 URL 列表
+            keys: {file_url: 音频哈希}，用于重启后找回任务
+        """
+        dashscope.api_key = Config.BAILIAN_API_KEY
+        response = Transcription.async_call(model='paraformer-v2', file_urls=file_urls)
+        if response.status_code != 200:
+            raise Exception(f"识别任务提交失败: {response.message}")
+
+        task_id = response.output.task_id
+        keys = keys or {}
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO asr_tasks (task_id, file_urls, keys, submitted_at) VALUES (?, ?, ?, ?)",
+                    (task_id, json.dumps(file_urls), json.dumps(keys), datetime.now().isoformat())
+                )
+            future = self._track(task_id, file_urls, keys)
+        self._ensure_thread()
+        self._wakeup.set()
+        return future
+
+    def find(self, key: str) -> Optional[Tuple[Future, str]]:
+        """按 key 找回进行中的任务（重启前已提交的同一段音频）
+
+        Returns:
+            (任务 Future, 该音频的 file_url)，没有则返回 None
+        """
+        with self._lock:
+            for task in self._tasks.values():
+                for file_url, task_key in task['keys'].items():
+                    if task_key == key:
+                        return task['future'], file_url
+        return None
+
+    def pending(self) -> int:
+        """进行中的任务数"""
+        with self._lock:
+            return len(self._tasks)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._poll_loop, name='asr-tracker', daemon=True)
+                self._thread.start()
+
+    def _poll_loop(self):
+        """轮询到期的任务；没有任务到期时休眠到最近的轮询时间"""
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                due = [task_id for task_id, task in self._tasks.items() if task['next_poll'] <= now]
+                next_poll = min(task['next_poll'] for task in self._tasks.values())
+
+            for task_id in due:
+                self._poll(task_id)
+
+            if not due:
+                self._wakeup.wait(max(0.0, next_poll - time.monotonic()))
+                self._wakeup.clear()
+
+    def _poll(self, task_id: str):
+        task = self._tasks[task_id]
+        try:
+            response = Transcription.fetch(task=task_id)
+            if response.status_code != 200:
+                raise Exception(f"查询识别任务失败: {response.message}")
+            task['errors'] = 0
+        except Exception as e:
+            task['errors'] += 1
+            if task['errors'] >= MAX_FETCH_ERRORS:
+                self._finish(task_id, None, e)
+            else:
+                self._backoff(task)
+            return
+
+        if response.output.task_status in FINAL_STATUSES:
+            self._finish(task_id, response)
+        else:
+            self._backoff(task)
+
+    def _backoff(self, task: dict):
+        task['interval'] = min(task['interval'] * 1.5, Config.ASR_POLL_MAX_INTERVAL)
+        task['next_poll'] = time.monotonic() + task['interval']
+
+    def _finish(self, task_id: str, response, error: Exception = None):
+        with self._lock:
+            task = self._tasks.pop(task_id)
+
+        if error is not None:
+            self._forget(task_id)
+            task['future'].set_exception(error)
+        else:
+            self._results.submit(self._complete, task_id, task, response)
+
+    def _complete(self, task_id: str, task: dict, response):
+        """在结果线程池中处理结束的任务，设置 Future 结果
+
+        on_done 成功后才删除任务记录：中途退出时重启后重新查询该任务，结果不会丢失。
+        """
+        try:
+            result = self.on_done(response, task['file_urls'], task['keys']) if self.on_done else response
+        except Exception as e:
+            task['future'].set_exception(e)
+        else:
+            self._forget(task_id)
+            task['future'].set_result(result)
+
+    def _forget(self, task_id: str):
+        """删除任务记录"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM asr_tasks WHERE task_id = ?", (task_id,))
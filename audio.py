@@ -0,0 +1,333 @@
+"""音频处理模块 - ffmpeg 音频提取、时长探测、内容哈希"""
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from config import Config
+
+# 音频输出格式（百炼 paraformer 均支持）：16kHz 单声道，语音码率
+# format: 可流式写入管道的容器格式（wav 头部需要回填长度，不支持流式）
+AUDIO_PROFILES = {
+    'wav': {'ext': 'wav', 'args': ['-acodec', 'pcm_s16le']},  # 无损，约 1.9MB/分钟
+    'opus': {'ext': 'ogg', 'format': 'ogg', 'args': ['-acodec', 'libopus', '-b:a', '24k', '-application', 'voip']},
+    'mp3': {'ext': 'mp3', 'format': 'mp3', 'args': ['-acodec', 'libmp3lame', '-b:a', '32k']},
+}
+
+
+def _get_profile(profile: str = None) -> dict:
+    """获取音频格式配置"""
+    profile = profile or Config.AUDIO_PROFILE
+    if profile not in AUDIO_PROFILES:
+        raise ValueError(f"不支持的音频格式: {profile}（可选: {', '.join(AUDIO_PROFILES)}）")
+    return AUDIO_PROFILES[profile]
+
+
+def supports_streaming(profile: str = None) -> bool:
+    """音频格式是否支持流式输出"""
+    return 'format' in _get_profile(profile)
+
+
+def _ffmpeg_audio_cmd(video_path: Path, audio_profile: dict, output: str,
+                      start: float = None, duration: float = None) -> List[str]:
+    """构建 ffmpeg 音频提取命令（可选只提取 start 起 duration 秒）"""
+    seek = ['-ss', f"{start:.3f}"] if start else []
+    limit = ['-t', f"{duration:.3f}"] if duration else []
+    return [
+        'ffmpeg',
+        *seek,
+        '-i', str(video_path),
+        *limit,
+        '-vn',  # 不处理视频
+        *audio_profile['args'],  # 音频编码
+        '-ar', '16000',  # 采样率
+        '-ac', '1',  # 单声道
+        '-y',
+        output
+    ]
+
+
+def extract_audio(video_path: Path, profile: str = None, start: float = None, end: float = None,
+                  output_dir: Path = None) -> Path:
+    """从视频中提取音频
+
+    Args:
+        video_path: 视频文件路径
+        profile: 输出格式（AUDIO_PROFILES 的键），默认 Config.AUDIO_PROFILE
+        start: 起始时间（秒），与 end 一起用于只提取一段
+        end: 结束时间（秒）
+        output_dir: 输出目录，默认系统临时目录（要移入数据目录时传暂存目录，避免跨文件系统复制）
+    """
+    audio_profile = _get_profile(profile)
+
+    temp_dir = Path(output_dir or tempfile.gettempdir())
+    suffix = f"_{int(start or 0)}" if start is not None or end is not None else ""
+    audio_path = temp_dir / f"{video_path.stem}_{datetime.now().strftime('%Y%m%d%H%M%S')}{suffix}.{audio_profile['ext']}"
+
+    duration = end - (start or 0) if end is not None else None
+    cmd = _ffmpeg_audio_cmd(video_path, audio_profile, str(audio_path), start, duration)
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise Exception(f"音频提取失败: {result.stderr[:100]}")
+
+    return audio_path
+
+
+def probe_duration(media_path: Path) -> float:
+    """用 ffprobe 获取媒体时长（秒）"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', str(media_path)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"获取时长失败: {result.stderr[:100]}")
+    return float(result.stdout.strip())
+
+
+def detect_silences(media_path: Path, noise_db: float = -35, min_seconds: float = 0.5) -> List[Tuple[float, float]]:
+    """用 ffmpeg silencedetect 找出静音区间 [(开始秒, 结束秒)]"""
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-i', str(media_path), '-vn',
+         '-af', f"silencedetect=noise={noise_db}dB:d={min_seconds}", '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"静音检测失败: {result.stderr[-100:]}")
+
+    silences = []
+    start = None
+    for line in result.stderr.splitlines():
+        if 'silence_start:' in line:
+            start = float(line.split('silence_start:')[1].split()[0])
+        elif 'silence_end:' in line and start is not None:
+            silences.append((start, float(line.split('silence_end:')[1].split('|')[0].strip())))
+            start = None
+    return silences
+
+
+def plan_segments(duration: float, silences: List[Tuple[float, float]], target: float,
+                  overlap: float = 0) -> List[Tuple[float, float]]:
+    """按目标时长把长音频切成若干段，尽量在静音处切分
+
+    在每个理想切点前后 target/4 范围内找离它最近的静音中点作为切点；
+    找不到静音时硬切，并让前一段多覆盖 overlap 秒，避免切断的词丢失（拼接时去重）。
+
+    Returns:
+        [(开始秒, 结束秒)]，相邻段可能有 overlap 秒重叠
+    """
+    segments = []
+    start = 0.0
+    while duration - start > target * 1.25:
+        ideal = start + target
+        window = target / 4
+        candidates = [
+            (a + b) / 2 for a, b in silences
+            if abs((a + b) / 2 - ideal) <= window
+        ]
+        if candidates:
+            cut = min(candidates, key=lambda c: abs(c - ideal))
+            segments.append((start, cut))
+        else:
+            cut = ideal
+            segments.append((start, min(duration, cut + overlap)))
+        start = cut
+    segments.append((start, duration))
+    return segments
+
+
+def benchmark_audio_profiles(video_path: Path, profiles: List[str] = None) -> List[Dict[str, float]]:
+    """对比各音频格式的体积和提取耗时（按每分钟音频折算）
+
+    Returns:
+        [{'profile', 'bytes', 'seconds', 'bytes_per_min', 'seconds_per_min'}]
+    """
+    minutes = probe_duration(video_path) / 60
+    if minutes <= 0:
+        raise Exception("视频时长为 0")
+
+    report = []
+    for profile in profiles or list(AUDIO_PROFILES):
+        start = time.monotonic()
+        audio_path = extract_audio(video_path, profile)
+        elapsed = time.monotonic() - start
+        try:
+            size = audio_path.stat().st_size
+        finally:
+            audio_path.unlink(missing_ok=True)
+        report.append({
+            'profile': profile,
+            'bytes': size,
+            'seconds': elapsed,
+            'bytes_per_min': size / minutes,
+            'seconds_per_min': elapsed / minutes,
+        })
+    return report
+
+
+def audio_fingerprint(video_path: Path) -> str:
+    """计算音频内容哈希（解码为 16kHz 单声道 PCM 后 SHA256）
+
+    与容器、视频画面无关，重新上传或不同创作者搬运的同一段音频得到相同哈希。
+    """
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', str(video_path), '-vn',
+         '-ac', '1', '-ar', '16000', '-f', 'hash', '-hash', 'sha256', '-'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0 or '=' not in result.stdout:
+        raise Exception(f"音频哈希计算失败: {result.stderr[:100]}")
+    return result.stdout.strip().split('=', 1)[1]
+
+
+# 采样率（提取音频、VAD 统一使用）
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class OffsetMap:
+    """静音裁剪的时间映射：裁剪后音频中的时间 → 原始视频中的时间
+
+    Attributes:
+        segments: 保留的原始区间 [(开始秒, 结束秒)]，按时间顺序拼接成裁剪后的音频
+        original_seconds: 原始音频时长（秒）
+    """
+    segments: List[Tuple[float, float]]
+    original_seconds: float
+
+    @property
+    def kept_seconds(self) -> float:
+        return sum(end - start for start, end in self.segments)
+
+    @property
+    def removed_seconds(self) -> float:
+        return self.original_seconds - self.kept_seconds
+
+    def to_original(self, t: float) -> float:
+        """把裁剪后音频中的时间（如句子时间戳）映射回原始视频时间"""
+        elapsed = 0.0
+        for start, end in self.segments:
+            length = end - start
+            if t <= elapsed + length:
+                return start + (t - elapsed)
+            elapsed += length
+        return self.segments[-1][1] if self.segments else t
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("缺少依赖库，请运行: pip install numpy")
+    return numpy
+
+
+def decode_pcm(video_path: Path):
+    """解码为 16kHz 单声道 int16 PCM（numpy 数组）"""
+    np = _require_numpy()
+
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', str(video_path), '-vn',
+         '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', '-'],
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"音频解码失败: {result.stderr.decode(errors='ignore')[:100]}")
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+
+def detect_speech(pcm, frame_ms: int = 30) -> List[Tuple[int, int]]:
+    """能量 + 语音频段占比的 CPU VAD，返回语音区间 [(开始采样点, 结束采样点)]
+
+    帧能量高于（噪声底 + Config.VAD_ENERGY_MARGIN_DB）且 300-3400Hz 能量占比高于
+    Config.VAD_BAND_RATIO 的帧判为语音；语音区间前后各保留 Config.VAD_PADDING_MS，
+    只裁掉长于 Config.VAD_MIN_SILENCE_MS 的非语音段。
+    """
+    np = _require_numpy()
+
+    frame = SAMPLE_RATE * frame_ms // 1000
+    n_frames = len(pcm) // frame
+    if n_frames == 0:
+        return [(0, len(pcm))] if len(pcm) else []
+
+    window = np.hanning(frame).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame, 1 / SAMPLE_RATE)
+    band = (freqs >= 300) & (freqs <= 3400)
+
+    energy_db = np.empty(n_frames, dtype=np.float32)
+    band_ratio = np.empty(n_frames, dtype=np.float32)
+    # 分块计算，长音频也不会一次性占用大量内存
+    block = 4096
+    for i in range(0, n_frames, block):
+        frames = pcm[i * frame:min(i + block, n_frames) * frame].astype(np.float32).reshape(-1, frame) / 32768
+        energy_db[i:i + len(frames)] = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        band_ratio[i:i + len(frames)] = spectrum[:, band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+
+    noise_floor = float(np.percentile(energy_db, 10))
+    threshold = max(noise_floor + Config.VAD_ENERGY_MARGIN_DB, Config.VAD_MIN_ENERGY_DB)
+    voiced = (energy_db > threshold) & (band_ratio > Config.VAD_BAND_RATIO)
+
+    # 帧 -> 区间，加前后余量，合并间隔过短的区间
+    padding = Config.VAD_PADDING_MS // frame_ms
+    min_gap = Config.VAD_MIN_SILENCE_MS // frame_ms
+    segments: List[List[int]] = []
+    for index in np.flatnonzero(voiced):
+        start, end = max(0, index - padding), min(n_frames, index + 1 + padding)
+        if segments and start - segments[-1][1] < min_gap:
+            segments[-1][1] = max(segments[-1][1], end)
+        else:
+            segments.append([start, end])
+
+    result = [(start * frame, end * frame) for start, end in segments]
+    # 末尾不足一帧的采样点归入最后一个区间
+    if result and segments[-1][1] == n_frames:
+        result[-1] = (result[-1][0], len(pcm))
+    return result
+
+
+def trim_silence(video_path: Path, profile: str = None) -> Tuple[Path, OffsetMap]:
+    """提取音频并裁掉静音/非语音段
+
+    Args:
+        video_path: 视频文件路径
+        profile: 输出格式（AUDIO_PROFILES 的键），默认 Config.AUDIO_PROFILE
+
+    Returns:
+        (裁剪后的音频文件, 时间映射)
+    """
+    np = _require_numpy()
+
+    audio_profile = _get_profile(profile)
+    pcm = decode_pcm(video_path)
+    segments = detect_speech(pcm)
+    if not segments:
+        # 没检测到语音时保留全部，交给识别服务判断
+        segments = [(0, len(pcm))]
+
+    kept = np.concatenate([pcm[start:end] for start, end in segments])
+    offset_map = OffsetMap(
+        segments=[(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in segments],
+        original_seconds=len(pcm) / SAMPLE_RATE,
+    )
+
+    temp_dir = Path(tempfile.gettempdir())
+    audio_path = temp_dir / f"{video_path.stem}_{datetime.now().strftime('%Y%m%d%H%M%S')}_vad.{audio_profile['ext']}"
+    cmd = [
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', '1', '-i', 'pipe:0',
+        *audio_profile['args'],
+        '-ar', str(SAMPLE_RATE),
+        '-ac', '1',
+        '-y',
+        str(audio_path)
+    ]
+    result = subprocess.run(cmd, input=kept.tobytes(), capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"音频编码失败: {result.stderr.decode(errors='ignore')[:100]}")
+
+    return audio_path, offset_map
@@ -0,0 +1,374 @@
+"""视频索引模块 - SQLite 目录索引，替代逐次 glob 扫描"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from config import Config
+from metadata_log import LOG_NAME
+
+# 文件后缀 -> 索引字段
+FILE_FIELDS = {
+    '.mp4': 'video_file',
+    '.txt': 'transcript_file',
+    '.json': 'metadata_file',
+    # 只保留音频（磁盘配额转码 / audio 采集模式）
+    '.ogg': 'audio_file',
+    '.mp3': 'audio_file',
+    '.wav': 'audio_file',
+    '.m4a': 'audio_file',
+    '.aac': 'audio_file',
+    '.opus': 'audio_file',
+}
+
+# 文件字段 -> 状态标记
+FLAG_FIELDS = {
+    'video_file': 'has_video',
+    'transcript_file': 'has_transcript',
+    'metadata_file': 'has_metadata',
+    'audio_file': 'has_audio',
+}
+
+# 元数据在日志文件（metadata.jsonl）中的位置
+OFFSET_FIELDS = ('metadata_offset', 'metadata_length')
+
+# 媒体文件字段 -> 大小字段（磁盘配额按索引统计用量，不扫描目录）
+SIZE_FIELDS = {
+    'video_file': 'video_size',
+    'audio_file': 'audio_size',
+}
+
+# 建表之后新增的列（旧版本数据库启动时补充）
+ADDED_COLUMNS = {
+    'metadata_offset': 'INTEGER',
+    'metadata_length': 'INTEGER',
+    'audio_file': 'TEXT',
+    'has_audio': 'INTEGER NOT NULL DEFAULT 0',
+    'video_size': 'INTEGER',
+    'audio_size': 'INTEGER',
+}
+
+
+def parse_filename(stem: str) -> tuple:
+    """从文件名解析 (video_id, 日期前缀)
+
+    文件名格式: {日期}_{视频ID} 或 {视频ID}
+    """
+    if '_' in stem:
+        date_part, video_id = stem.rsplit('_', 1)
+        return video_id, date_part
+    return stem, None
+
+
+class Catalog:
+    """视频索引 - 以 (创作者目录, 视频ID) 为主键记录文件路径和状态"""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path or Config.CATALOG_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        """初始化表结构"""
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    creator TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    base_name TEXT NOT NULL,
+                    create_time TEXT,
+                    video_file TEXT,
+                    transcript_file TEXT,
+                    metadata_file TEXT,
+                    has_video INTEGER NOT NULL DEFAULT 0,
+                    has_transcript INTEGER NOT NULL DEFAULT 0,
+                    has_metadata INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT,
+                    PRIMARY KEY (creator, video_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_videos_state
+                    ON videos (creator, has_video, has_transcript);
+                CREATE TABLE IF NOT EXISTS creators (
+                    creator TEXT PRIMARY KEY,
+                    indexed_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS fetch_state (
+                    creator TEXT PRIMARY KEY,
+                    high_water TEXT,
+                    resume_cursor TEXT,
+                    retry TEXT,
+                    updated_at TEXT
+                );
+            """)
+            # 旧版本数据库补充新增的列
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(videos)")}
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE videos ADD COLUMN {column} {definition}")
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(fetch_state)")}
+            for column in ('resume_cursor', 'retry'):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE fetch_state ADD COLUMN {column} TEXT")
+
+    def get(self, creator: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """获取单个视频的索引记录"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM videos WHERE creator = ? AND video_id = ?",
+                (creator, video_id)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def exists(self, creator: str, video_id: str) -> bool:
+        """检查视频是否已有任意文件"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM videos WHERE creator = ? AND video_id = ? "
+                "AND (has_video OR has_transcript OR has_metadata OR has_audio)",
+                (creator, video_id)
+            ).fetchone()
+        return row is not None
+
+    def upsert(self, creator: str, video_id: str, base_name: str = None,
+               create_time: str = None, **files: str):
+        """写入/合并索引记录
+
+        Args:
+            creator: 创作者目录名
+            video_id: 视频ID
+            base_name: 文件名（不含扩展名）
+            create_time: 创建时间
+            files: video_file / transcript_file / metadata_file / audio_file 文件名（None 表示已删除），
+                   metadata_offset / metadata_length 元数据日志中的位置，
+                   video_size / audio_size 媒体文件大小
+        """
+        with self._lock, self._conn:
+            self._upsert(creator, video_id, base_name, create_time, files)
+
+    def _upsert(self, creator: str, video_id: str, base_name: Optional[str],
+                create_time: Optional[str], files: Dict[str, str]):
+        """合并写入（调用方负责加锁和事务）"""
+        record = self.get(creator, video_id) or {
+            'creator': creator,
+            'video_id': video_id,
+            'base_name': base_name or video_id,
+            'create_time': None,
+            'video_file': None,
+            'transcript_file': None,
+            'metadata_file': None,
+            'metadata_offset': None,
+            'metadata_length': None,
+            'audio_file': None,
+            'video_size': None,
+            'audio_size': None,
+        }
+        if base_name:
+            record['base_name'] = base_name
+        if create_time:
+            record['create_time'] = create_time
+        for field, value in files.items():
+            if field not in FLAG_FIELDS and field not in OFFSET_FIELDS and field not in SIZE_FIELDS.values():
+                raise ValueError(f"未知索引字段: {field}")
+            record[field] = value
+
+        self._conn.execute(
+            """INSERT OR REPLACE INTO videos (
+                creator, video_id, base_name, create_time,
+                video_file, transcript_file, metadata_file, metadata_offset, metadata_length,
+                audio_file, video_size, audio_size,
+                has_video, has_transcript, has_metadata, has_audio, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                creator, video_id, record['base_name'], record['create_time'],
+                record['video_file'], record['transcript_file'], record['metadata_file'],
+                record['metadata_offset'], record['metadata_length'],
+                record['audio_file'], record['video_size'], record['audio_size'],
+                int(record['video_file'] is not None),
+                int(record['transcript_file'] is not None),
+                int(record['metadata_file'] is not None),
+                int(record['audio_file'] is not None),
+                datetime.now().isoformat(),
+            )
+        )
+
+    def list(self, creator: str, has_video: bool = None, has_transcript: bool = None,
+             has_metadata: bool = None) -> List[Dict[str, Any]]:
+        """按状态标记列出视频记录"""
+        sql = "SELECT * FROM videos WHERE creator = ?"
+        params: list = [creator]
+        for column, value in (('has_video', has_video),
+                              ('has_transcript', has_transcript),
+                              ('has_metadata', has_metadata)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(int(value))
+        sql += " ORDER BY create_time DESC, video_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_media(self, creator: str = None) -> List[Dict[str, Any]]:
+        """列出有视频或音频文件的记录（creator 为 None 时为全部创作者）"""
+        sql = "SELECT * FROM videos WHERE (has_video OR has_audio)"
+        params: list = []
+        if creator:
+            sql += " AND creator = ?"
+            params.append(creator)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def media_usage(self) -> Dict[str, int]:
+        """按创作者统计索引中记录的媒体文件字节数（视频 + 音频）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT creator, SUM(COALESCE(video_size, 0) + COALESCE(audio_size, 0)) AS n "
+                "FROM videos WHERE has_video OR has_audio GROUP BY creator"
+            ).fetchall()
+        return {row['creator']: row['n'] for row in rows}
+
+    def missing_sizes(self) -> List[Dict[str, Any]]:
+        """有媒体文件但未记录大小的记录（旧版本索引）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM videos WHERE (has_video AND video_size IS NULL) "
+                "OR (has_audio AND audio_size IS NULL)"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_metadata_offsets(self, creator: str, offsets: Dict[str, tuple]):
+        """批量更新元数据日志位置（压缩 / 重建索引后）
+
+        Args:
+            offsets: {视频ID: (文件名, 创建时间, 偏移, 长度)}
+        """
+        with self._lock, self._conn:
+            for video_id, (base_name, create_time, offset, length) in offsets.items():
+                self._upsert(creator, video_id, base_name, create_time, {
+                    'metadata_file': LOG_NAME,
+                    'metadata_offset': offset,
+                    'metadata_length': length,
+                })
+
+    def count_by_creator(self) -> Dict[str, int]:
+        """统计每个创作者已处理（有元数据）的视频数"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT creator, COUNT(*) AS n FROM videos WHERE has_metadata GROUP BY creator"
+            ).fetchall()
+        return {row['creator']: row['n'] for row in rows}
+
+    def is_indexed(self, creator: str) -> bool:
+        """检查创作者目录是否已建立索引"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM creators WHERE creator = ?", (creator,)
+            ).fetchone()
+        return row is not None
+
+    def get_high_water(self, creator: str) -> Optional[str]:
+        """获取创作者的抓取高水位（已完整处理到的视频创建时间）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water FROM fetch_state WHERE creator = ?", (creator,)
+            ).fetchone()
+        return row['high_water'] if row else None
+
+    def set_high_water(self, creator: str, create_time: str):
+        """推进抓取高水位（只前进不后退）"""
+        with self._lock, self._conn:
+            current = self.get_high_water(creator)
+            if current and current >= create_time:
+                return
+            self._conn.execute(
+                "INSERT INTO fetch_state (creator, high_water, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (creator) DO UPDATE SET high_water = excluded.high_water, updated_at = excluded.updated_at",
+                (creator, create_time, datetime.now().isoformat())
+            )
+
+    def get_resume_cursor(self, creator: str) -> Optional[str]:
+        """获取上次翻页因上限截断处的游标"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT resume_cursor FROM fetch_state WHERE creator = ?", (creator,)
+            ).fetchone()
+        return row['resume_cursor'] if row else None
+
+    def set_resume_cursor(self, creator: str, cursor: Optional[str]):
+        """保存翻页截断处的游标（None 清除）"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO fetch_state (creator, resume_cursor, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (creator) DO UPDATE SET resume_cursor = excluded.resume_cursor, updated_at = excluded.updated_at",
+                (creator, cursor, datetime.now().isoformat())
+            )
+
+    def get_retry(self, creator: str) -> Dict[str, str]:
+        """获取待重试的失败视频 {视频ID: 发布时间}"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT retry FROM fetch_state WHERE creator = ?", (creator,)
+            ).fetchone()
+        return json.loads(row['retry']) if row and row['retry'] else {}
+
+    def set_retry(self, creator: str, retry: Dict[str, str]):
+        """保存待重试的失败视频（空字典清除）"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO fetch_state (creator, retry, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (creator) DO UPDATE SET retry = excluded.retry, updated_at = excluded.updated_at",
+                (creator, json.dumps(retry) if retry else None, datetime.now().isoformat())
+            )
+
+    def reindex(self, creator: str, creator_dir: Path) -> int:
+        """扫描创作者目录，重建该创作者的索引
+
+        Returns:
+            索引的视频数
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        if creator_dir.exists():
+            for path in creator_dir.iterdir():
+                field = FILE_FIELDS.get(path.suffix)
+                if not field or not path.is_file():
+                    continue
+                video_id, date_part = parse_filename(path.stem)
+                entry = entries.setdefault(video_id, {
+                    'base_name': path.stem,
+                    'create_time': date_part,
+                })
+                entry[field] = path.name
+                if field in SIZE_FIELDS:
+                    entry[SIZE_FIELDS[field]] = path.stat().st_size
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM videos WHERE creator = ?", (creator,))
+            for video_id, entry in entries.items():
+                base_name = entry.pop('base_name')
+                create_time = entry.pop('create_time')
+                self._upsert(creator, video_id, base_name, create_time, entry)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO creators (creator, indexed_at) VALUES (?, ?)",
+                (creator, datetime.now().isoformat())
+            )
+        return len(entries)
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """获取进程内共享的索引实例"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
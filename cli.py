@@ -6,13 +6,23 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from config import CreatorConfig
+from config import Config, CreatorConfig
 from scheduler import CortexCore, CortexScheduler
 from knowledge import extract_knowledge
 
 console = Console()
 
 
+def _get_option(flag: str, cast=float):
+    """读取 "--flag 值" 形式的参数，未提供返回 None，值无效时抛出 ValueError"""
+    if flag not in sys.argv:
+        return None
+    index = sys.argv.index(flag)
+    if index + 1 >= len(sys.argv):
+        raise ValueError(flag)
+    return cast(sys.argv[index + 1])
+
+
 class CortexCLI:
     """Cortex 命令行界面"""
 
@@ -36,6 +46,7 @@ class CortexCLI:
         table.add_column("平台", style="green")
         table.add_column("ID", style="blue")
         table.add_column("间隔", style="yellow")
+        table.add_column("采集")
         table.add_column("状态", style="magenta")
 
         for c in creators:
@@ -45,6 +56,7 @@ class CortexCLI:
                 c['platform'],
                 c['id'][:20] + '...',
                 f"{c.get('interval_hours', 48)}h",
+                "仅音频" if c.get('ingest', Config.INGEST_MODE) == 'audio' else "视频",
                 status
             )
 
@@ -63,9 +75,9 @@ class CortexCLI:
         self.config.remove(name)
         console.print(f"[green]✓ 已删除创作者: {name}[/green]")
 
-    def cmd_run(self, force: bool = False):
+    def cmd_run(self, force: bool = False, jobs: int = None, use_async: bool = None):
         """运行一次所有创作者"""
-        self.core.run_once(force_check=force)
+        self.core.run_once(force_check=force, concurrency=jobs, use_async=use_async)
 
     def cmd_transcribe(self):
         """给已下载但未转录的视频补充转录"""
@@ -112,20 +124,347 @@ class CortexCLI:
                 console.print(f"    {v.get('video_id', '')} | {v.get('create_time', '')}")
 
         else:
-            # 显示所有创作者的视频统计
-            data_dir = Path(__file__).parent / "data"
+            # 显示所有创作者的视频统计（索引查询）
+            from catalog import get_catalog
+            counts = get_catalog().count_by_creator()
 
             total = 0
-            for creator_dir in data_dir.iterdir():
-                if not creator_dir.is_dir():
-                    continue
-
-                count = len(list(creator_dir.glob("*.json")))
+            for creator_dir, count in sorted(counts.items()):
                 total += count
-                console.print(f"  {creator_dir.name}: {count} 个视频")
+                console.print(f"  {creator_dir}: {count} 个视频")
 
             console.print(f"\n  总计: {total} 个视频")
 
+    def cmd_reindex(self, creator_name: str = None):
+        """从现有文件重建视频索引"""
+        from storage import StorageManager
+
+        creators = self.config.get_all()
+        if creator_name:
+            creators = [c for c in creators if c['name'] == creator_name]
+            if not creators:
+                console.print(f"[red]找不到名为 {creator_name} 的创作者[/red]")
+                return
+
+        total = 0
+        for c in creators:
+            storage = StorageManager(c['name'])
+            count = storage.reindex()
+            transcripts = storage.reindex_search()
+            total += count
+            console.print(f"  {c['name']}: {count} 个视频, {transcripts} 个转录")
+
+        console.print(f"[green]✓ 索引重建完成，共 {total} 个视频[/green]")
+
+    def cmd_search(self, query: str, creator: str = None, since: str = None, until: str = None,
+                   limit: int = None):
+        """全文检索转录文本"""
+        import time
+        from search_index import get_search_index, make_snippet
+
+        start = time.monotonic()
+        results = get_search_index().search(query, creator=creator, since=since, until=until, limit=limit or 20)
+        elapsed_ms = (time.monotonic() - start) * 1000
+
+        if not results:
+            console.print(f"[yellow]没有找到包含 \"{query}\" 的转录（{elapsed_ms:.1f}ms）[/yellow]")
+            console.print("  [dim]已有转录未建立检索索引时，先运行 python cli.py reindex[/dim]")
+            return
+
+        table = Table(title=f"搜索: {query}")
+        table.add_column("创作者", style="cyan")
+        table.add_column("日期")
+        table.add_column("标题")
+        table.add_column("片段")
+        for r in results:
+            try:
+                text = (Config.DATA_DIR / r['creator_key'] / r['transcript_file']).read_text(encoding='utf-8')
+                snippet = make_snippet(text, query)
+            except (OSError, TypeError):
+                snippet = "[dim]转录文件不存在[/dim]"
+            table.add_row(
+                r['creator'],
+                (r['create_time'] or '')[:10],
+                (r['title'] or r['video_id'])[:30],
+                snippet,
+            )
+        console.print(table)
+        console.print(f"  {len(results)} 条结果，检索耗时 {elapsed_ms:.1f}ms")
+
+    def cmd_compact(self, creator_name: str = None):
+        """压缩元数据日志（旧版本的单独 JSON 文件并入日志）"""
+        from storage import StorageManager
+
+        creators = self.config.get_all()
+        if creator_name:
+            creators = [c for c in creators if c['name'] == creator_name]
+            if not creators:
+                console.print(f"[red]找不到名为 {creator_name} 的创作者[/red]")
+                return
+
+        for c in creators:
+            report = StorageManager(c['name']).compact_metadata()
+            imported = f", 并入 {report['imported']} 个 JSON 文件" if report['imported'] else ""
+            console.print(f"  {c['name']}: {report['before'] / 1024:.1f}KB → {report['after'] / 1024:.1f}KB{imported}")
+
+        console.print("[green]✓ 元数据压缩完成[/green]")
+
+    def cmd_quota(self, creator_name: str = None, dry_run: bool = False):
+        """查看磁盘用量并执行配额（--dry-run 只列出计划淘汰的视频）"""
+        from quota import DiskQuota, GLOBAL
+
+        creator_key = None
+        if creator_name:
+            try:
+                creator_key = self.config.get_creator_dir(creator_name).name
+            except ValueError as e:
+                console.print(f"[red]{e}[/red]")
+                return
+
+        quota = DiskQuota()
+        usage = quota.usage()
+        mb = lambda n: f"{n / 1024 / 1024:.1f}MB"
+
+        table = Table(title=f"磁盘用量（视频 + 音频，策略: {quota.policy}）")
+        table.add_column("创作者", style="cyan")
+        table.add_column("用量", justify="right")
+        table.add_column("预算", justify="right")
+        for c in self.config.get_all():
+            if creator_key and c['directory'] != creator_key:
+                continue
+            budget = quota.budgets.get(c['directory'])
+            used = usage.get(c['directory'], 0)
+            style = "red" if budget and used > budget else ""
+            table.add_row(c['name'], f"[{style}]{mb(used)}[/{style}]" if style else mb(used),
+                          mb(budget) if budget else "-")
+        table.add_row("[bold]合计[/bold]", mb(sum(usage.values())),
+                      mb(quota.global_budget) if quota.global_budget else "-")
+        console.print(table)
+
+        if not quota.enabled:
+            console.print("[dim]未设置配额（.env 中 DISK_QUOTA_GB，或 python cli.py quota <名称> --set GB）[/dim]")
+            return
+
+        report = quota.enforce(creator_key, dry_run=dry_run)
+        plan = report['plan'] if dry_run else report['done']
+        if not report['plan']:
+            console.print("[green]✓ 未超出预算[/green]")
+            return
+
+        table = Table(title="计划淘汰（--dry-run，未执行）" if dry_run else "已淘汰")
+        table.add_column("创作者", style="cyan")
+        table.add_column("日期")
+        table.add_column("视频ID")
+        table.add_column("大小", justify="right")
+        table.add_column("已转录")
+        table.add_column("操作")
+        table.add_column("超出预算", style="dim")
+        for e in plan:
+            table.add_row(
+                quota.names.get(e.creator, e.creator),
+                (e.create_time or '')[:10],
+                e.video_id,
+                mb(e.size),
+                "✓" if e.transcribed else "[yellow]✗[/yellow]",
+                "转为音频" if e.action == 'audio' else "[red]删除视频[/red]",
+                "全局" if e.budget == GLOBAL else quota.names.get(e.budget, e.budget),
+            )
+        console.print(table)
+
+        for error in report['errors']:
+            console.print(f"  [yellow]⚠[/yellow] {error}")
+        if dry_run:
+            freed = sum(e.estimated_freed for e in plan)
+            console.print(f"[yellow]共 {len(plan)} 个视频，预计释放 {mb(freed)}（--dry-run，未删除）[/yellow]")
+        else:
+            console.print(f"[green]✓ 已处理 {len(plan)} 个视频，释放 {mb(report['freed'])}[/green]")
+
+    def cmd_set_quota(self, creator_name: str, quota_gb: float):
+        """设置创作者的磁盘配额（0 取消）"""
+        try:
+            self.config.set_quota(creator_name, quota_gb or None)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        if quota_gb:
+            console.print(f"[green]✓ {creator_name} 的磁盘配额设为 {quota_gb:g}GB[/green]")
+        else:
+            console.print(f"[green]✓ 已取消 {creator_name} 的磁盘配额[/green]")
+
+    def cmd_ingest(self, creator_name: str, mode: str):
+        """设置创作者的采集模式（audio 只下载音频 / video 下载完整视频）"""
+        try:
+            self.config.set_option(creator_name, 'ingest', mode)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        label = "只下载音频（纯音频流 / 最低码率视频）" if mode == 'audio' else "下载完整视频"
+        console.print(f"[green]✓ {creator_name} 的采集模式设为 {mode}：{label}[/green]")
+
+    def cmd_sweep(self, ttl_hours: float = None, dry_run: bool = False):
+        """清理 OSS 上遗留的临时音频"""
+        from transcriber import sweep_oss
+
+        with console.status("[yellow]扫描 OSS 临时文件..."):
+            report = sweep_oss(ttl_hours, dry_run=dry_run)
+
+        size_mb = report['bytes'] / 1024 / 1024
+        if dry_run:
+            console.print(f"[yellow]共 {report['scanned']} 个临时文件，{report['expired']} 个已过期 ({size_mb:.1f}MB)，未删除（--dry-run）[/yellow]")
+        else:
+            console.print(f"[green]✓ 共 {report['scanned']} 个临时文件，已删除 {report['deleted']} 个过期文件 ({size_mb:.1f}MB)[/green]")
+
+    def cmd_usage(self, days: int = None):
+        """查看 TikHub 调用次数和估算费用"""
+        from datetime import date, timedelta
+        from rate_limiter import get_tikhub_limiter
+
+        since = (date.today() - timedelta(days=days - 1)).isoformat() if days else None
+        limiter = get_tikhub_limiter()
+        rows = limiter.usage(since)
+        if not rows:
+            console.print("[yellow]暂无调用记录[/yellow]")
+            return
+
+        table = Table(title=f"TikHub 调用统计（最近 {days} 天）" if days else "TikHub 调用统计")
+        table.add_column("创作者", style="cyan")
+        table.add_column("调用", justify="right")
+        table.add_column("限流 (429)", justify="right", style="red")
+        table.add_column("估算费用", justify="right", style="green")
+        for r in rows:
+            table.add_row(r['creator'] or "-", str(r['calls']), str(r['throttled']), f"${r['cost']:.3f}")
+        table.add_row(
+            "[bold]合计[/bold]",
+            str(sum(r['calls'] for r in rows)),
+            str(sum(r['throttled'] for r in rows)),
+            f"${sum(r['cost'] for r in rows):.3f}",
+        )
+        console.print(table)
+
+    def cmd_bench_audio(self, video_path: str):
+        """对比各音频格式的体积和提取耗时"""
+        from audio import benchmark_audio_profiles
+
+        path = Path(video_path)
+        if not path.exists():
+            console.print(f"[red]文件不存在: {video_path}[/red]")
+            return
+
+        with console.status("[yellow]提取音频中..."):
+            report = benchmark_audio_profiles(path)
+
+        table = Table(title=f"音频格式对比 - {path.name}")
+        table.add_column("格式", style="cyan")
+        table.add_column("大小", justify="right")
+        table.add_column("耗时", justify="right")
+        table.add_column("每分钟大小", justify="right", style="green")
+        table.add_column("每分钟耗时", justify="right", style="yellow")
+        table.add_column("相对 wav", justify="right")
+
+        wav_size = next((r['bytes_per_min'] for r in report if r['profile'] == 'wav'), None)
+        for r in report:
+            ratio = f"{r['bytes_per_min'] / wav_size:.1%}" if wav_size else "-"
+            table.add_row(
+                r['profile'],
+                f"{r['bytes'] / 1024:.0f} KB",
+                f"{r['seconds']:.2f}s",
+                f"{r['bytes_per_min'] / 1024:.0f} KB",
+                f"{r['seconds_per_min']:.2f}s",
+                ratio,
+            )
+
+        console.print(table)
+
+    def cmd_bench_download(self, url: str = None):
+        """对比不同连接数的下载速度（不指定 URL 时使用本地限速测试服务）"""
+        from downloader import benchmark_download
+
+        with console.status("[yellow]下载测试中..."):
+            report = benchmark_download(url)
+
+        table = Table(title=f"下载速度对比 - {url or '本地测试服务（每连接限速 4MB/s）'}")
+        table.add_column("连接数", style="cyan", justify="right")
+        table.add_column("大小", justify="right")
+        table.add_column("耗时", justify="right")
+        table.add_column("速度", justify="right", style="green")
+
+        for r in report:
+            table.add_row(
+                str(r['connections']),
+                f"{r['bytes'] / 1024 / 1024:.1f} MB",
+                f"{r['seconds']:.2f}s",
+                f"{r['mb_per_s']:.1f} MB/s",
+            )
+
+        console.print(table)
+
+    def cmd_record(self, name: str, max_videos: int = None, with_asr: bool = True):
+        """录制创作者的接口响应、视频和识别结果为回放夹具"""
+        from replay import record_creator
+
+        creator = next((c for c in self.config.get_all() if c['name'] == name), None)
+        if not creator:
+            console.print(f"[red]找不到名为 {name} 的创作者[/red]")
+            return
+
+        with console.status(f"[yellow]录制 {name}（会消耗 API 配额）..."):
+            report = record_creator(creator, max_videos=max_videos or 10, with_asr=with_asr)
+
+        console.print(
+            f"[green]✓ 已录制到 {Config.REPLAY_DIR}: {report['pages']} 页列表, {report['videos']} 个视频 "
+            f"({report['bytes'] / 1024 / 1024:.1f}MB), {report['transcripts']} 份识别结果[/green]"
+        )
+
+    def cmd_replay_serve(self, port: int = None, latency_ms: float = None, bandwidth_mb: float = None):
+        """启动本地替身服务，回放录制的夹具"""
+        from replay import ReplayServer
+
+        server = ReplayServer(latency_ms=latency_ms, bandwidth_mb=bandwidth_mb, port=port or 8765)
+        if not server.users:
+            console.print(f"[yellow]夹具目录 {server.fixtures_dir} 中没有录制数据，先运行 python cli.py record <名称>[/yellow]")
+            server.stop()
+            return
+
+        console.print(f"[green]✓ 替身服务已启动: {server.url}（{len(server.users)} 个创作者）[/green]")
+        console.print(f"  在另一个终端运行: TIKHUB_API_URL={server.url} TRANSCRIBER=fake python cli.py run --force")
+        console.print("  按 Ctrl+C 停止")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+
+    def cmd_replay_bench(self, latency_ms: float = None, bandwidth_mb: float = None, jobs: int = None) -> bool:
+        """离线端到端基准，返回是否所有视频都处理完成"""
+        from replay import replay_benchmark
+
+        report = replay_benchmark(latency_ms=latency_ms, bandwidth_mb=bandwidth_mb, concurrency=jobs)
+
+        table = Table(title="离线回放基准")
+        table.add_column("创作者", justify="right")
+        table.add_column("视频", justify="right")
+        table.add_column("转写", justify="right")
+        table.add_column("大小", justify="right")
+        table.add_column("耗时", justify="right")
+        table.add_column("视频/秒", justify="right", style="green")
+        table.add_column("下载速度", justify="right", style="green")
+        table.add_row(
+            str(report['creators']),
+            f"{report['videos']}/{report['expected']}",
+            str(report['transcripts']),
+            f"{report['bytes'] / 1024 / 1024:.1f} MB",
+            f"{report['seconds']:.2f}s",
+            f"{report['videos_per_s']:.2f}",
+            f"{report['mb_per_s']:.1f} MB/s",
+        )
+        console.print(table)
+
+        complete = report['videos'] == report['expected'] == report['transcripts']
+        if not complete:
+            console.print("[red]✗ 有视频未下载或未转写[/red]")
+        return complete
+
     def run(self):
         """运行 CLI"""
         if len(sys.argv) < 2:
@@ -152,7 +491,16 @@ class CortexCLI:
 
         elif command == "run":
             force = "--force" in sys.argv or "-f" in sys.argv
-            self.cmd_run(force=force)
+            use_async = True if "--async" in sys.argv else None
+            jobs = None
+            for flag in ("--jobs", "-j"):
+                if flag in sys.argv:
+                    index = sys.argv.index(flag)
+                    if index + 1 >= len(sys.argv) or not sys.argv[index + 1].isdigit():
+                        console.print("[red]用法: python cli.py run [--force] [--jobs N] [--async][/red]")
+                        return
+                    jobs = int(sys.argv[index + 1])
+            self.cmd_run(force=force, jobs=jobs, use_async=use_async)
 
         elif command == "transcribe":
             self.cmd_transcribe()
@@ -173,6 +521,122 @@ class CortexCLI:
             creator = sys.argv[2] if len(sys.argv) > 2 else None
             self.cmd_videos(creator)
 
+        elif command == "bench-audio":
+            if len(sys.argv) < 3:
+                console.print("[red]用法: python cli.py bench-audio <视频文件>[/red]")
+                return
+            self.cmd_bench_audio(sys.argv[2])
+
+        elif command == "reindex":
+            creator = sys.argv[2] if len(sys.argv) > 2 else None
+            self.cmd_reindex(creator)
+
+        elif command == "search":
+            usage = "[red]用法: python cli.py search <关键词> [--creator 名称] [--since 日期] [--until 日期] [--limit N][/red]"
+            try:
+                creator = _get_option("--creator", str)
+                since = _get_option("--since", str)
+                until = _get_option("--until", str)
+                limit = _get_option("--limit", int)
+            except ValueError:
+                console.print(usage)
+                return
+            # 关键词：去掉选项及其值后剩下的参数
+            option_values = set()
+            for flag in ("--creator", "--since", "--until", "--limit"):
+                if flag in sys.argv:
+                    index = sys.argv.index(flag)
+                    option_values.update({index, index + 1})
+            words = [arg for i, arg in enumerate(sys.argv[2:], start=2) if i not in option_values]
+            if not words:
+                console.print(usage)
+                return
+            self.cmd_search(" ".join(words), creator, since, until, limit)
+
+        elif command == "compact":
+            creator = sys.argv[2] if len(sys.argv) > 2 else None
+            self.cmd_compact(creator)
+
+        elif command == "quota":
+            usage = "[red]用法: python cli.py quota [名称] [--dry-run] [--set GB][/red]"
+            try:
+                quota_gb = _get_option("--set")
+            except ValueError:
+                console.print(usage)
+                return
+            # 名称：去掉选项及 --set 的值后剩下的参数
+            option_values = set()
+            if quota_gb is not None:
+                index = sys.argv.index("--set")
+                option_values = {index, index + 1}
+            args = [arg for i, arg in enumerate(sys.argv[2:], start=2)
+                    if i not in option_values and not arg.startswith("--")]
+            creator = args[0] if args else None
+            if quota_gb is not None:
+                if not creator:
+                    console.print(usage)
+                    return
+                self.cmd_set_quota(creator, quota_gb)
+            else:
+                self.cmd_quota(creator, "--dry-run" in sys.argv)
+
+        elif command == "ingest":
+            if len(sys.argv) < 4 or sys.argv[3] not in ("audio", "video"):
+                console.print("[red]用法: python cli.py ingest <名称> <audio|video>[/red]")
+                return
+            self.cmd_ingest(sys.argv[2], sys.argv[3])
+
+        elif command == "bench-download":
+            self.cmd_bench_download(sys.argv[2] if len(sys.argv) > 2 else None)
+
+        elif command == "sweep":
+            dry_run = "--dry-run" in sys.argv
+            ttl_hours = None
+            if "--ttl" in sys.argv:
+                index = sys.argv.index("--ttl")
+                try:
+                    ttl_hours = float(sys.argv[index + 1])
+                except (IndexError, ValueError):
+                    console.print("[red]用法: python cli.py sweep [--ttl 小时] [--dry-run][/red]")
+                    return
+            self.cmd_sweep(ttl_hours, dry_run)
+
+        elif command == "record":
+            if len(sys.argv) < 3:
+                console.print("[red]用法: python cli.py record <名称> [--videos N] [--no-asr][/red]")
+                return
+            try:
+                max_videos = _get_option("--videos", int)
+            except ValueError:
+                console.print("[red]用法: python cli.py record <名称> [--videos N] [--no-asr][/red]")
+                return
+            self.cmd_record(sys.argv[2], max_videos, with_asr="--no-asr" not in sys.argv)
+
+        elif command in ("replay-serve", "replay-bench"):
+            try:
+                latency_ms = _get_option("--latency")
+                bandwidth_mb = _get_option("--bandwidth")
+                port = _get_option("--port", int)
+                jobs = _get_option("--jobs", int)
+            except ValueError:
+                console.print(f"[red]用法: python cli.py {command} [--latency 毫秒] [--bandwidth MB/s] "
+                              f"[--port 端口 | --jobs N][/red]")
+                return
+            if command == "replay-serve":
+                self.cmd_replay_serve(port, latency_ms, bandwidth_mb)
+            elif not self.cmd_replay_bench(latency_ms, bandwidth_mb, jobs):
+                sys.exit(1)
+
+        elif command == "usage":
+            days = None
+            if "--days" in sys.argv:
+                index = sys.argv.index("--days")
+                if index + 1 >= len(sys.argv) or not sys.argv[index + 1].isdigit():
+                    console.print("[red]用法: python cli.py usage [--days N][/red]")
+                    return
+                days = int(sys.argv[index + 1])
+            self.cmd_usage(days)
+
         else:
             console.print(f"[red]未知命令: {command}[/red]")
             self.show_help()
@@ -188,19 +652,42 @@ class CortexCLI:
   python cli.py [yellow]add[/yellow] <名称> <平台> <ID> [间隔]
                                   - 添加创作者
   python cli.py [yellow]remove[/yellow] <名称>    - 删除创作者
-  python cli.py [yellow]run[/yellow] [--force]  - 运行一次（手动执行）
+  python cli.py [yellow]run[/yellow] [--force] [--jobs N] [--async]
+                                  - 运行一次（手动执行，N 个创作者并发，--async 异步并发获取视频列表）
   python cli.py [yellow]transcribe[/yellow]     - 给已下载视频补充转录
   python cli.py [yellow]start[/yellow]          - 启动定时监控
   python cli.py [yellow]stop[/yellow]           - 停止监控
   python cli.py [yellow]status[/yellow]          - 查看状态
   python cli.py [yellow]knowledge[/yellow]       - 生成知识报告
   python cli.py [yellow]videos[/yellow] [名称]   - 查看已处理视频
+  python cli.py [yellow]reindex[/yellow] [名称]  - 从现有文件重建视频索引
+  python cli.py [yellow]compact[/yellow] [名称]  - 压缩元数据日志（旧版本 JSON 文件并入日志）
+  python cli.py [yellow]ingest[/yellow] <名称> <audio|video>
+                                  - 设置采集模式（audio 只下载音频直接转写，不下载完整视频）
+  python cli.py [yellow]quota[/yellow] [名称] [--dry-run] [--set GB]
+                                  - 查看磁盘用量并按配额淘汰已处理视频（--set 设置创作者配额）
+  python cli.py [yellow]search[/yellow] <关键词> [--creator 名称] [--since 日期] [--until 日期] [--limit N]
+                                  - 全文检索转录文本（按相关度排序）
+  python cli.py [yellow]bench-audio[/yellow] <视频> - 对比各音频格式的体积和提取耗时
+  python cli.py [yellow]bench-download[/yellow] [URL]
+                                  - 对比不同连接数的下载速度
+  python cli.py [yellow]sweep[/yellow] [--ttl 小时] [--dry-run]
+                                  - 清理 OSS 上超过 TTL 的遗留临时音频
+  python cli.py [yellow]usage[/yellow] [--days N]  - 查看 TikHub 调用次数和估算费用
+  python cli.py [yellow]record[/yellow] <名称> [--videos N] [--no-asr]
+                                  - 录制接口响应、视频和识别结果为回放夹具
+  python cli.py [yellow]replay-serve[/yellow] [--port 端口] [--latency 毫秒] [--bandwidth MB/s]
+                                  - 启动本地替身服务回放夹具（TIKHUB_API_URL 指向它）
+  python cli.py [yellow]replay-bench[/yellow] [--jobs N] [--latency 毫秒] [--bandwidth MB/s]
+                                  - 离线端到端基准（无夹具时使用合成数据），未全部完成时退出码为 1
 
 [bold]示例:[/bold]
 
   python cli.py add 九栢米电商 douyin MS4wLjABAAAA... 48
   python cli.py run
   python cli.py run --force  (强制检查，忽略时间间隔)
+  python cli.py run --jobs 8 (8 个创作者并发，结束后输出汇总表)
+  python cli.py run --async  (先在一个事件循环中并发获取所有创作者的视频列表)
   python cli.py start
   python cli.py knowledge
 
@@ -1,6 +1,7 @@
 """配置管理"""
 import os
 import json
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import List, Dict, Any
@@ -8,6 +9,16 @@ from typing import List, Dict, Any
 load_dotenv()
 
 
+def _parse_limits(value: str, cast=int) -> Dict[str, Any]:
+    """解析 "douyin=2,xiaohongshu=1" 格式的并发限制"""
+    limits = {}
+    for part in value.split(','):
+        if '=' in part:
+            key, num = part.split('=', 1)
+            limits[key.strip()] = cast(num)
+    return limits
+
+
 class Config:
     """全局配置"""
 
@@ -16,10 +27,22 @@ class Config:
     DATA_DIR = BASE_DIR / "data"
     KNOWLEDGE_DIR = BASE_DIR / "knowledge"
     CREATORS_FILE = BASE_DIR / "creators.json"
+    CATALOG_DB = DATA_DIR / "catalog.db"
+    TRANSCRIPT_CACHE_DB = DATA_DIR / "transcript_cache.db"
+    ASR_TASKS_DB = DATA_DIR / "asr_tasks.db"
+    RATE_LIMIT_DB = DATA_DIR / "rate_limit.db"
+    SEARCH_DB = DATA_DIR / "search.db"
 
     # API 配置
     TIKHUB_API_KEY = os.getenv("TIKHUB_API_KEY", "")
     TIKHUB_API_URL = os.getenv("TIKHUB_API_URL", "https://api.tikhub.io")
+    # TikHub 限流：同一 Key 的所有进程共享令牌桶，速率（请求/秒）和突发容量，可按接口单独设置速率
+    TIKHUB_RATE = float(os.getenv("TIKHUB_RATE", "5"))
+    TIKHUB_BURST = int(os.getenv("TIKHUB_BURST", "10"))
+    TIKHUB_ENDPOINT_RATES = _parse_limits(os.getenv("TIKHUB_ENDPOINT_RATES", ""), float)
+    # TikHub 计费：单次调用估算费用（美元），可按接口单独设置
+    TIKHUB_COST_PER_CALL = float(os.getenv("TIKHUB_COST_PER_CALL", "0.001"))
+    TIKHUB_ENDPOINT_COSTS = _parse_limits(os.getenv("TIKHUB_ENDPOINT_COSTS", ""), float)
 
     DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
     DEEPSEEK_API_URL = os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com/v1")
@@ -31,8 +54,104 @@ class Config:
     OSS_BUCKET = os.getenv("OSS_BUCKET", "")
     OSS_REGION = os.getenv("OSS_REGION", "oss-cn-beijing")
     OSS_ENDPOINT = os.getenv("OSS_ENDPOINT", "")
+    # sweep 清理遗留临时音频的保留时长（小时）
+    OSS_SWEEP_TTL_HOURS = float(os.getenv("OSS_SWEEP_TTL_HOURS", "24"))
+    # 临时音频批量删除：攒够多少个对象发一次 DeleteMultipleObjects（OSS 单次上限 1000）
+    OSS_DELETE_BATCH = max(1, min(int(os.getenv("OSS_DELETE_BATCH", "100")), 1000))
     BAILIAN_API_KEY = os.getenv("BAILIAN_API_KEY", "")
 
+    # 转写引擎：bailian（阿里云百炼）/ local（本地 faster-whisper）/ fake（离线测试）
+    TRANSCRIBER = os.getenv("TRANSCRIBER", "bailian")
+    LOCAL_ASR_MODEL = os.getenv("LOCAL_ASR_MODEL", "small")
+    LOCAL_ASR_COMPUTE_TYPE = os.getenv("LOCAL_ASR_COMPUTE_TYPE", "int8")
+    LOCAL_ASR_LANGUAGE = os.getenv("LOCAL_ASR_LANGUAGE", "zh")
+    LOCAL_ASR_WORKERS = int(os.getenv("LOCAL_ASR_WORKERS", "2"))
+    LOCAL_ASR_CPU_THREADS = int(os.getenv("LOCAL_ASR_CPU_THREADS", "4"))
+    # 假转写引擎：模拟识别耗时（秒）、模拟上传带宽（MB/s，0 不模拟）、并发数
+    FAKE_ASR_DELAY = float(os.getenv("FAKE_ASR_DELAY", "0"))
+    FAKE_UPLOAD_MB = float(os.getenv("FAKE_UPLOAD_MB", "0"))
+    FAKE_ASR_WORKERS = int(os.getenv("FAKE_ASR_WORKERS", "4"))
+
+    # 转写音频格式：wav（无损）/ opus / mp3（语音码率，上传体积约为 wav 的 1/10）
+    AUDIO_PROFILE = os.getenv("AUDIO_PROFILE", "opus")
+    # 流式上传：ffmpeg 输出经管道直接分片上传 OSS，不写临时音频文件（wav 不支持）
+    AUDIO_STREAMING = os.getenv("AUDIO_STREAMING", "true").lower() == "true"
+    # 识别任务轮询：首次间隔和退避上限（秒）
+    ASR_POLL_INTERVAL = float(os.getenv("ASR_POLL_INTERVAL", "2"))
+    ASR_POLL_MAX_INTERVAL = float(os.getenv("ASR_POLL_MAX_INTERVAL", "30"))
+    # 任务结束后处理结果（下载识别结果、写缓存）的线程数，不占用轮询线程
+    ASR_RESULT_WORKERS = int(os.getenv("ASR_RESULT_WORKERS", "4"))
+    # 长音频分段：超过 CHUNK_MIN_SECONDS 的音频在静音处切成约 CHUNK_SECONDS 秒的段并行识别（0 关闭）
+    CHUNK_MIN_SECONDS = int(os.getenv("CHUNK_MIN_SECONDS", "900"))
+    CHUNK_SECONDS = int(os.getenv("CHUNK_SECONDS", "300"))
+    CHUNK_OVERLAP_SECONDS = float(os.getenv("CHUNK_OVERLAP_SECONDS", "2"))
+    CHUNK_RETRIES = int(os.getenv("CHUNK_RETRIES", "2"))
+    # 静音裁剪（VAD）：上传前裁掉长静音 / 纯音乐段，减少上传和计费时长（需要 numpy）
+    VAD_TRIM = os.getenv("VAD_TRIM", "false").lower() == "true"
+    VAD_ENERGY_MARGIN_DB = float(os.getenv("VAD_ENERGY_MARGIN_DB", "12"))
+    VAD_MIN_ENERGY_DB = float(os.getenv("VAD_MIN_ENERGY_DB", "-50"))
+    VAD_BAND_RATIO = float(os.getenv("VAD_BAND_RATIO", "0.5"))
+    VAD_PADDING_MS = int(os.getenv("VAD_PADDING_MS", "300"))
+    VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "1000"))
+    # 转写缓存：按音频内容哈希缓存转录文本，超出容量按最近使用淘汰
+    TRANSCRIPT_CACHE = os.getenv("TRANSCRIPT_CACHE", "true").lower() == "true"
+    TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "256"))
+
+    # 抓取配置：incremental 按游标翻页，遇到已知/过期视频即停止；full 每次拉取固定一页
+    FETCH_MODE = os.getenv("FETCH_MODE", "incremental")
+    FETCH_PAGE_SIZE = int(os.getenv("FETCH_PAGE_SIZE", "20"))
+    FETCH_MAX_PAGES = int(os.getenv("FETCH_MAX_PAGES", "10"))
+    # 异步抓取：run 时先在一个事件循环中并发获取所有创作者的视频列表（需要 httpx），FETCH_CONCURRENCY 为同时请求的创作者数
+    RUN_ASYNC = os.getenv("RUN_ASYNC", "false").lower() == "true"
+    FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "8"))
+
+    # HTTP 客户端：默认超时（秒）、429/5xx 重试次数与退避系数、每主机连接池容量（可按主机单独设置）
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+    HTTP_POOL_SIZES = _parse_limits(os.getenv("HTTP_POOL_SIZES", ""))
+
+    # 采集模式：video 下载完整视频；audio 只下载纯音频流 / 最低码率视频，直接用于转写（creators.json 中 ingest 可单独设置）
+    INGEST_MODE = os.getenv("INGEST_MODE", "video")
+
+    # 视频下载：CDN 支持 Range 时的并发连接数，网络中断后的续传重试次数
+    DOWNLOAD_CONNECTIONS = int(os.getenv("DOWNLOAD_CONNECTIONS", "4"))
+    DOWNLOAD_RETRIES = int(os.getenv("DOWNLOAD_RETRIES", "3"))
+    # 元数据：追加写入每个创作者的 metadata.jsonl；旧版本行超过该比例时后台压缩；可另外导出每个视频一个 JSON 文件
+    METADATA_COMPACT_RATIO = float(os.getenv("METADATA_COMPACT_RATIO", "0.5"))
+    METADATA_COMPACT_MIN_KB = int(os.getenv("METADATA_COMPACT_MIN_KB", "64"))
+    METADATA_JSON_EXPORT = os.getenv("METADATA_JSON_EXPORT", "false").lower() == "true"
+
+    # 下载暂存目录：默认 data/.scratch（应与 DATA_DIR 在同一文件系统，完成后直接改名移入）；
+    # 启动时删除超过 SCRATCH_TTL_HOURS 的遗留文件
+    SCRATCH_DIR = os.getenv("SCRATCH_DIR", "")
+    SCRATCH_TTL_HOURS = float(os.getenv("SCRATCH_TTL_HOURS", "24"))
+
+    # 磁盘配额：全局媒体文件预算（GB，0 不限制；单个创作者的预算为 creators.json 中的 quota_gb），
+    # 超出时按策略淘汰已处理的视频：oldest（最早发布）/ lru（最久未访问）/ transcribed（已转录的优先）；
+    # DISK_QUOTA_KEEP_AUDIO 时把视频转为语音码率音频（DISK_QUOTA_AUDIO_PROFILE）而不是直接删除
+    DISK_QUOTA_GB = float(os.getenv("DISK_QUOTA_GB", "0"))
+    DISK_QUOTA_POLICY = os.getenv("DISK_QUOTA_POLICY", "transcribed")
+    DISK_QUOTA_KEEP_AUDIO = os.getenv("DISK_QUOTA_KEEP_AUDIO", "false").lower() == "true"
+    DISK_QUOTA_AUDIO_PROFILE = os.getenv("DISK_QUOTA_AUDIO_PROFILE", "opus")
+
+    # 流水线配置：各阶段并发数，阶段间队列容量
+    PIPELINE_DOWNLOAD_WORKERS = int(os.getenv("PIPELINE_DOWNLOAD_WORKERS", "4"))
+    PIPELINE_EXTRACT_WORKERS = int(os.getenv("PIPELINE_EXTRACT_WORKERS", "2"))
+    PIPELINE_UPLOAD_WORKERS = int(os.getenv("PIPELINE_UPLOAD_WORKERS", "4"))
+    PIPELINE_TRANSCRIBE_WORKERS = int(os.getenv("PIPELINE_TRANSCRIBE_WORKERS", "8"))
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+
+    # 离线回放：夹具目录，替身服务每个请求的延迟（毫秒）和每连接带宽（MB/s，0 不限速）
+    REPLAY_DIR = Path(os.getenv("REPLAY_DIR", str(BASE_DIR / "fixtures")))
+    REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", "50"))
+    REPLAY_BANDWIDTH_MB = float(os.getenv("REPLAY_BANDWIDTH_MB", "8"))
+
+    # 多创作者并发：全局同时处理的创作者数，按平台的并发上限
+    RUN_CONCURRENCY = int(os.getenv("RUN_CONCURRENCY", "1"))
+    PLATFORM_CONCURRENCY = _parse_limits(os.getenv("PLATFORM_CONCURRENCY", "douyin=4"))
+
     @classmethod
     def ensure_dirs(cls):
         """确保目录存在"""
@@ -40,6 +159,10 @@ class Config:
         cls.KNOWLEDGE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# creators.json 读写锁（并发处理多个创作者时各线程都会读写该文件）
+_creators_file_lock = threading.RLock()
+
+
 class CreatorConfig:
     """创作者配置管理"""
 
@@ -50,17 +173,19 @@ class CreatorConfig:
 
     def _load(self):
         """加载创作者配置"""
-        if self.creators_file.exists():
-            with open(self.creators_file, 'r', encoding='utf-8') as f:
-                self._creators = json.load(f).get('creators', [])
-        else:
-            self._creators = []
-            self._save()
+        with _creators_file_lock:
+            if self.creators_file.exists():
+                with open(self.creators_file, 'r', encoding='utf-8') as f:
+                    self._creators = json.load(f).get('creators', [])
+            else:
+                self._creators = []
+                self._save()
 
     def _save(self):
         """保存创作者配置"""
-        with open(self.creators_file, 'w', encoding='utf-8') as f:
-            json.dump({'creators': self._creators}, f, ensure_ascii=False, indent=2)
+        with _creators_file_lock:
+            with open(self.creators_file, 'w', encoding='utf-8') as f:
+                json.dump({'creators': self._creators}, f, ensure_ascii=False, indent=2)
 
     def get_all(self) -> List[Dict[str, Any]]:
         """获取所有创作者"""
@@ -117,11 +242,29 @@ class CreatorConfig:
         self._creators = [c for c in self._creators if c['name'] != name]
         self._save()
 
+    def set_option(self, name: str, key: str, value: Any = None):
+        """设置创作者的单项配置（value 为 None 时删除该项，恢复全局默认）"""
+        with _creators_file_lock:
+            for c in self._creators:
+                if c['name'] == name:
+                    if value is None:
+                        c.pop(key, None)
+                    else:
+                        c[key] = value
+                    self._save()
+                    return
+        raise ValueError(f"找不到名为 {name} 的创作者")
+
+    def set_quota(self, name: str, quota_gb: float = None):
+        """设置创作者的磁盘配额（GB，None 取消）"""
+        self.set_option(name, 'quota_gb', quota_gb)
+
     def update_last_check(self, name: str):
         """更新最后检查时间"""
         from datetime import datetime
-        for c in self._creators:
-            if c['name'] == name:
-                c['last_check'] = datetime.now().isoformat()
-                break
-        self._save()
+        with _creators_file_lock:
+            for c in self._creators:
+                if c['name'] == name:
+                    c['last_check'] = datetime.now().isoformat()
+                    break
+            self._save()
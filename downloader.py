@@ -0,0 +1,300 @@
+"""下载模块 - 多连接 HTTP Range 分段下载，断点续传"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from config import Config
+from http_client import get_session
+
+# 每个分段不小于该大小，小文件不拆分
+MIN_PART_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# 断点续传进度写入 sidecar 的最小间隔（秒）
+STATE_SAVE_INTERVAL = 1.0
+
+
+class _Forbidden(Exception):
+    """下载地址失效（CDN 链接过期返回 403）"""
+
+
+class _Incomplete(Exception):
+    """连接提前断开，分段未下载完"""
+
+
+def part_paths(output_path: str) -> Tuple[Path, Path]:
+    """未完成下载的数据文件和 sidecar 路径"""
+    return Path(f"{output_path}.part"), Path(f"{output_path}.part.json")
+
+
+def discard_partial(output_path: str):
+    """删除未完成的下载"""
+    for path in part_paths(output_path):
+        path.unlink(missing_ok=True)
+
+
+def download_file(url: str, output_path: str, headers: Dict[str, str] = None,
+                  connections: int = None, timeout: int = 120,
+                  resolve_url: Callable[[], Optional[str]] = None, retries: int = None) -> int:
+    """下载文件，服务器支持 Range 时多连接并行分段下载，支持断点续传
+
+    先用 Range: bytes=0-0 探测文件大小；返回 206 时各连接用 os.pwrite 写入 {output}.part 的各自区间，
+    进度记录在 {output}.part.json（URL、ETag、长度、各段已完成字节），中断后重试或下次运行从断点继续；
+    服务器忽略 Range（返回 200）时单连接流式写入。完成后重命名为 output_path。
+
+    Args:
+        url: 下载地址
+        output_path: 输出路径
+        headers: 请求头
+        connections: 并发连接数，默认 Config.DOWNLOAD_CONNECTIONS
+        timeout: 单个请求超时（秒）
+        resolve_url: 地址返回 403（过期）时重新获取下载地址
+        retries: 网络错误重试次数，默认 Config.DOWNLOAD_RETRIES
+
+    Returns:
+        文件大小（字节）
+    """
+    retries = Config.DOWNLOAD_RETRIES if retries is None else retries
+    attempt = 0
+    refreshed = False
+    while True:
+        try:
+            return _download(url, output_path, headers or {}, connections or Config.DOWNLOAD_CONNECTIONS, timeout)
+        except _Forbidden:
+            new_url = resolve_url() if resolve_url and not refreshed else None
+            if not new_url:
+                raise Exception("下载地址已失效 (HTTP 403)")
+            url = new_url
+            refreshed = True
+        except (requests.RequestException, _Incomplete):
+            attempt += 1
+            if attempt > retries:
+                raise
+            time.sleep(min(2 ** attempt, 10))
+
+
+def _download(url: str, output_path: str, headers: Dict[str, str], connections: int, timeout: int) -> int:
+    part_path, state_path = part_paths(output_path)
+
+    probe = get_session().get(url, headers={**headers, 'Range': 'bytes=0-0'}, stream=True, timeout=timeout)
+    try:
+        if probe.status_code == 403:
+            raise _Forbidden()
+        probe.raise_for_status()
+        total = _parse_total_size(probe)
+        if probe.status_code == 200 or total is None:
+            # 不支持 Range：直接用探测请求的响应流式写入（无法续传）
+            state_path.unlink(missing_ok=True)
+            size = _stream_to_file(probe, str(part_path))
+            part_path.replace(output_path)
+            return size
+        etag = probe.headers.get('ETag')
+    finally:
+        probe.close()
+
+    state = _load_state(state_path, part_path, total, etag)
+    if state is None:
+        state = {
+            'url': url,
+            'etag': etag,
+            'length': total,
+            'parts': [[start, end, 0] for start, end in _split_ranges(total, connections)],
+        }
+        with open(part_path, 'wb') as f:
+            f.truncate(total)
+    state['url'] = url
+    _save_state(state_path, state)
+
+    fd = os.open(part_path, os.O_WRONLY)
+    lock = threading.Lock()
+    last_save = [time.monotonic()]
+
+    def save_progress(force: bool = False):
+        with lock:
+            if force or time.monotonic() - last_save[0] >= STATE_SAVE_INTERVAL:
+                # 先落盘数据再记录进度，保证 sidecar 记录的字节都已写入
+                os.fsync(fd)
+                _save_state(state_path, state)
+                last_save[0] = time.monotonic()
+
+    try:
+        pending = [part for part in state['parts'] if part[2] < part[1] - part[0] + 1]
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = [
+                    pool.submit(_download_range, url, headers, fd, part, timeout, save_progress)
+                    for part in pending
+                ]
+                for future in futures:
+                    future.result()
+    finally:
+        save_progress(force=True)
+        os.close(fd)
+
+    part_path.replace(output_path)
+    state_path.unlink(missing_ok=True)
+    return total
+
+
+def _load_state(state_path: Path, part_path: Path, total: int, etag: Optional[str]) -> Optional[dict]:
+    """读取续传进度，文件长度或 ETag 变化时返回 None（重新下载）"""
+    if not state_path.exists() or not part_path.exists():
+        return None
+    try:
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if state.get('length') != total or part_path.stat().st_size != total:
+        return None
+    if etag and state.get('etag') and etag != state['etag']:
+        return None
+    return state
+
+
+def _save_state(state_path: Path, state: dict):
+    temp_path = state_path.with_suffix('.tmp')
+    temp_path.write_text(json.dumps(state), encoding='utf-8')
+    temp_path.replace(state_path)
+
+
+def _parse_total_size(resp: requests.Response):
+    """从 206 响应的 Content-Range（bytes 0-0/总大小）取文件总大小"""
+    if resp.status_code != 206:
+        return None
+    match = re.match(r'bytes\s+\d+-\d+/(\d+)', resp.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+def _split_ranges(total: int, connections: int) -> List[Tuple[int, int]]:
+    """把 [0, total) 切成最多 connections 段（闭区间，每段不小于 MIN_PART_SIZE）"""
+    count = max(1, min(connections, total // MIN_PART_SIZE))
+    size = -(-total // count)
+    return [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+
+def _download_range(url: str, headers: Dict[str, str], fd: int, part: list, timeout: int,
+                    on_progress: Callable[[], None]):
+    """从断点继续下载一个分段 [start, end, 已完成字节]，写入文件对应位置"""
+    start, end, done = part
+    with get_session().get(url, headers={**headers, 'Range': f'bytes={start + done}-{end}'},
+                      stream=True, timeout=timeout) as resp:
+        if resp.status_code == 403:
+            raise _Forbidden()
+        if resp.status_code != 206:
+            raise Exception(f"分段下载失败: HTTP {resp.status_code}")
+        for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+            os.pwrite(fd, chunk, start + part[2])
+            part[2] += len(chunk)
+            on_progress()
+    if part[2] != end - start + 1:
+        raise _Incomplete(f"分段下载不完整: {start}-{end} 只收到 {part[2]} 字节")
+
+
+def _stream_to_file(resp: requests.Response, output_path: str) -> int:
+    """单连接流式写入"""
+    size = 0
+    with open(output_path, 'wb') as f:
+        for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+class _RangeRequestHandler(SimpleHTTPRequestHandler):
+    """支持 Range 的测试文件服务，每个连接限速以模拟 CDN 单连接带宽"""
+
+    rate_limit = 0  # 每连接字节/秒，0 不限速
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404)
+            return
+        total = path.stat().st_size
+        start, end = 0, total - 1
+        match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{total}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.end_headers()
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            began = time.monotonic()
+            sent = 0
+            while remaining > 0:
+                data = f.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    break
+                self.wfile.write(data)
+                sent += len(data)
+                remaining -= len(data)
+                if self.rate_limit:
+                    delay = sent / self.rate_limit - (time.monotonic() - began)
+                    if delay > 0:
+                        time.sleep(delay)
+
+
+def benchmark_download(url: str = None, connection_counts: List[int] = None, size_mb: int = 32,
+                       rate_limit_mb: float = 4) -> List[Dict[str, float]]:
+    """对比不同连接数的下载速度
+
+    未指定 url 时在本地启动支持 Range 的测试服务（每连接限速 rate_limit_mb MB/s）下载 size_mb MB 的测试文件。
+
+    Returns:
+        [{'connections', 'bytes', 'seconds', 'mb_per_s'}]
+    """
+    connection_counts = connection_counts or [1, 2, 4, 8]
+    server = None
+    work_dir = Path(tempfile.mkdtemp(prefix='cortex-bench-'))
+    try:
+        if not url:
+            (work_dir / 'test.bin').write_bytes(os.urandom(size_mb * 1024 * 1024))
+            handler = type('Handler', (_RangeRequestHandler,), {'rate_limit': int(rate_limit_mb * 1024 * 1024)})
+            server = ThreadingHTTPServer(
+                ('127.0.0.1', 0),
+                lambda *args: handler(*args, directory=str(work_dir))
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}/test.bin"
+
+        report = []
+        output = work_dir / 'download.bin'
+        for connections in connection_counts:
+            start = time.monotonic()
+            size = download_file(url, str(output), connections=connections)
+            seconds = time.monotonic() - start
+            report.append({
+                'connections': connections,
+                'bytes': size,
+                'seconds': seconds,
+                'mb_per_s': size / 1024 / 1024 / seconds if seconds else 0.0,
+            })
+            output.unlink(missing_ok=True)
+        return report
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+        for path in work_dir.iterdir():
+            path.unlink(missing_ok=True)
+        work_dir.rmdir()
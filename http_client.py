@@ -0,0 +1,202 @@
+"""HTTP 客户端模块 - 进程内共享的连接池会话（同步 requests / 异步 httpx），失败重试，按主机统计"""
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+from weakref import WeakKeyDictionary
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+# 触发重试的状态码
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _JitteredRetry(Retry):
+    """指数退避 + 随机抖动，避免并发请求同时重试"""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return backoff * random.uniform(0.5, 1.5) if backoff else 0
+
+
+class _StatsAdapter(HTTPAdapter):
+    """记录每个主机的请求数、重试、错误、耗时"""
+
+    def __init__(self, stats: 'HostStats', **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        start = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.stats.record(host, time.monotonic() - start, error=True)
+            raise
+        retries = getattr(response.raw, 'retries', None)
+        self.stats.record(
+            host,
+            time.monotonic() - start,
+            retries=len(retries.history) if retries else 0,
+            error=response.status_code >= 400,
+        )
+        return response
+
+
+class HostStats:
+    """按主机汇总的请求统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def record(self, host: str, seconds: float, retries: int = 0, error: bool = False):
+        with self._lock:
+            stats = self._hosts.setdefault(host, {'requests': 0, 'retries': 0, 'errors': 0, 'seconds': 0.0})
+            stats['requests'] += 1
+            stats['retries'] += retries
+            stats['errors'] += int(error)
+            stats['seconds'] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._hosts.items()}
+
+
+class HttpSession(requests.Session):
+    """共享会话：keep-alive 连接池（按主机设置容量）、429/5xx 重试、默认超时"""
+
+    def __init__(self, timeout: float = None):
+        super().__init__()
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.stats = HostStats()
+        self._adapters: Dict[str, _StatsAdapter] = {}
+
+        self._mount('https://', Config.HTTP_POOL_SIZE)
+        self._mount('http://', Config.HTTP_POOL_SIZE)
+        for host, size in Config.HTTP_POOL_SIZES.items():
+            self._mount(f'https://{host}/', size)
+
+    def _mount(self, prefix: str, pool_size: int):
+        retry = _JitteredRetry(
+            total=Config.HTTP_RETRIES,
+            connect=Config.HTTP_RETRIES,
+            read=0,  # 读超时可能已在服务端执行，不自动重试
+            status=Config.HTTP_RETRIES,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # POST 也重试（429/5xx 时请求未被处理）
+            backoff_factor=Config.HTTP_BACKOFF,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _StatsAdapter(self.stats, pool_connections=Config.HTTP_POOL_SIZE,
+                                pool_maxsize=pool_size, max_retries=retry)
+        self._adapters[prefix] = adapter
+        self.mount(prefix, adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict[str, float]]:
+        """按主机统计：请求数、新建连接数（TCP+TLS 握手）、重试、错误、总耗时"""
+        stats = self.stats.snapshot()
+        for adapter in self._adapters.values():
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                if host in stats:
+                    stats[host]['connections'] = stats[host].get('connections', 0) + pool.num_connections
+        return stats
+
+
+_session: Optional[HttpSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HttpSession:
+    """获取进程内共享的 HTTP 会话"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
+
+
+class AsyncHttpClient:
+    """asyncio HTTP 客户端（httpx）：连接复用、429/5xx 抖动退避重试，主机统计与同步会话共用"""
+
+    def __init__(self, timeout: float = None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("缺少依赖库，请运行: pip install httpx")
+        self._client = httpx.AsyncClient(
+            timeout=timeout or Config.HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=Config.HTTP_POOL_SIZE),
+            follow_redirects=True,
+        )
+        self.stats = get_session().stats
+
+    async def request(self, method: str, url: str, **kwargs):
+        """发送请求并读取完整响应体，429/5xx 时按 Retry-After 或指数退避重试"""
+        host = urlparse(url).netloc
+        start = time.monotonic()
+        history = []
+        for attempt in range(Config.HTTP_RETRIES + 1):
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except Exception:
+                self.stats.record(host, time.monotonic() - start, retries=attempt, error=True)
+                raise
+            if response.status_code not in RETRY_STATUSES or attempt == Config.HTTP_RETRIES:
+                break
+            history.append(response.status_code)
+            await asyncio.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+
+        self.stats.record(host, time.monotonic() - start, retries=attempt, error=response.status_code >= 400)
+        # 重试过程中出现过的状态码（限流器据此判断是否被 429）
+        response.retry_history = history
+        return response
+
+    def stream(self, method: str, url: str, **kwargs):
+        """流式请求（async with client.stream(...) as response），不自动重试"""
+        return self._client.stream(method, url, **kwargs)
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return Config.HTTP_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+# 每个事件循环一个异步客户端（httpx 连接绑定所在的事件循环）
+_async_clients: 'WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]' = WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncHttpClient:
+    """获取当前事件循环共享的异步 HTTP 客户端"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient()
+    return client
+
+
+async def close_async_client():
+    """关闭当前事件循环的异步 HTTP 客户端"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client:
+        await client.aclose()
@@ -1,12 +1,14 @@
 """AI 知识提炼模块"""
 import json
-import requests
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
 from rich.console import Console
 
 from config import Config
+from catalog import parse_filename
+from http_client import get_session
+from metadata_log import MetadataLog
 
 console = Console()
 
@@ -27,17 +29,22 @@ def extract_knowledge(topics: List[str] = None) -> Dict[str, Any]:
     data_dir = Config.DATA_DIR
 
     for creator_dir in data_dir.iterdir():
-        if not creator_dir.is_dir():
+        if not creator_dir.is_dir() or creator_dir.name.startswith("."):
             continue
 
         console.print(f"  扫描: {creator_dir.name}")
+        # 元数据日志一次顺序读取
+        logged = MetadataLog(creator_dir).read_all()
 
         for txt_file in creator_dir.glob("*.txt"):
             try:
                 transcript = txt_file.read_text(encoding='utf-8')
+                video_id, _ = parse_filename(txt_file.stem)
                 metadata_file = txt_file.with_suffix('.json')
 
-                if metadata_file.exists():
+                if video_id in logged:
+                    metadata = logged[video_id]
+                elif metadata_file.exists():
                     metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
                 else:
                     metadata = {}
@@ -87,7 +94,7 @@ def extract_knowledge(topics: List[str] = None) -> Dict[str, Any]:
         prompt += f"\n\n--- {item['creator']} ---\n{item['content'][:500]}..."
 
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{Config.DEEPSEEK_API_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {Config.DEEPSEEK_API_KEY}",
@@ -0,0 +1,127 @@
+"""元数据日志模块 - 每个创作者一个追加写的 JSONL 元数据文件，替代每个视频一个 JSON 文件
+
+每行一条记录 {"video_id": ..., ...元数据}，同一视频更新时追加新行，以最后一行为准。
+索引（catalog.db）记录每条最新记录的偏移和长度，单条读取只需一次 seek；列出全部元数据是一次顺序读。
+旧版本行在压缩时清除。
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+LOG_NAME = 'metadata.jsonl'
+
+# 同一文件的追加和压缩互斥（按路径共享锁）
+_locks: Dict[str, threading.RLock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.RLock:
+    with _locks_guard:
+        return _locks.setdefault(str(path.resolve()), threading.RLock())
+
+
+class MetadataLog:
+    """追加写的元数据日志"""
+
+    def __init__(self, creator_dir: Path):
+        self.path = Path(creator_dir) / LOG_NAME
+        self.lock = _lock_for(self.path)
+
+    def append(self, video_id: str, metadata: Dict[str, Any]) -> Tuple[int, int]:
+        """追加一条记录
+
+        Returns:
+            (偏移, 长度)
+        """
+        line = json.dumps({'video_id': video_id, **metadata}, ensure_ascii=False).encode('utf-8') + b'\n'
+        with self.lock:
+            with open(self.path, 'a+b') as f:
+                offset = f.seek(0, os.SEEK_END)
+                if offset:
+                    # 上次崩溃留下写了一半的行时，先换行，避免与新记录粘在一起
+                    f.seek(offset - 1)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                        offset += 1
+                f.write(line)
+        return offset, len(line)
+
+    def read_at(self, video_id: str, offset: int, length: int) -> Optional[Dict[str, Any]]:
+        """按偏移读取一条记录，偏移失效（记录不属于该视频）时返回 None"""
+        with self.lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(offset)
+                    data = f.read(length)
+            except OSError:
+                return None
+        try:
+            record = json.loads(data)
+        except ValueError:
+            return None
+        if not isinstance(record, dict) or record.get('video_id') != video_id:
+            return None
+        return record
+
+    def scan(self) -> Dict[str, Tuple[Dict[str, Any], int, int]]:
+        """顺序读取整个日志
+
+        Returns:
+            {视频ID: (最新元数据, 偏移, 长度)}，写了一半的行（崩溃遗留）跳过
+        """
+        records: Dict[str, Tuple[Dict[str, Any], int, int]] = {}
+        with self.lock:
+            if not self.path.exists():
+                return records
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+                video_id = record['video_id']
+            except (ValueError, KeyError, TypeError):
+                video_id = None
+            if video_id is not None and line.endswith(b'\n'):
+                records[video_id] = (record, offset, len(line))
+            offset += len(line)
+        return records
+
+    def read_all(self) -> Dict[str, Dict[str, Any]]:
+        """读取所有视频的最新元数据"""
+        return {video_id: record for video_id, (record, _, _) in self.scan().items()}
+
+    def garbage_ratio(self, live_bytes: int = None) -> float:
+        """旧版本行占文件的比例"""
+        with self.lock:
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if not size:
+                return 0.0
+            if live_bytes is None:
+                live_bytes = sum(length for _, _, length in self.scan().values())
+        return 1 - live_bytes / size
+
+    def compact(self) -> Dict[str, Tuple[int, int]]:
+        """重写日志，只保留每个视频的最新记录（按创建时间从新到旧）
+
+        写入临时文件后 os.replace 原子替换，期间追加会等待。
+
+        Returns:
+            {视频ID: (新偏移, 长度)}
+        """
+        with self.lock:
+            records = self.scan()
+            ordered = sorted(records.items(), key=lambda item: item[1][0].get('create_time') or '', reverse=True)
+            temp = self.path.with_name(f".{LOG_NAME}.tmp")
+            offsets = {}
+            with open(temp, 'wb') as f:
+                for video_id, (record, _, _) in ordered:
+                    line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                    offsets[video_id] = (f.tell(), len(line))
+                    f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.path)
+        return offsets
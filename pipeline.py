@@ -0,0 +1,155 @@
+"""流水线模块 - 多阶段并发处理，阶段之间用有界队列连接"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# 队列结束标记
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """流水线阶段
+
+    Attributes:
+        name: 阶段名称
+        func: 处理函数，接收 Job，通过 job.data 传递中间结果；抛异常即视为该任务失败。
+              返回 Future 时为异步阶段：线程立即处理下一个任务，Future 完成后再交付下游
+        workers: 并发线程数
+        queue_size: 输入队列容量（None 使用流水线默认值）
+    """
+    name: str
+    func: Callable[['Job'], None]
+    workers: int = 1
+    queue_size: Optional[int] = None
+
+
+@dataclass
+class Job:
+    """流水线中的单个任务"""
+    item: Any
+    data: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[Exception] = None
+    failed_stage: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    finished: bool = False  # 阶段函数置为 True 表示已提前完成，跳过后续阶段
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Pipeline:
+    """阶段流水线
+
+    每个阶段有独立的线程池，阶段之间通过有界队列衔接（下游处理不过来时上游自动阻塞）。
+    单个任务在某阶段失败后不再进入后续阶段，直接交付结果，不影响其他任务。
+    总耗时趋近于最慢阶段的耗时，而不是各阶段之和。
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(f"阶段 {stage.name} 的并发数必须 >= 1")
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def process(self, items: Iterable[Any]) -> Iterator[Job]:
+        """处理所有任务，按完成顺序产出 Job
+
+        Args:
+            items: 任务列表；传入 Job 可携带初始 data
+        """
+        items = list(items)
+        if not items:
+            return
+
+        inboxes = [
+            queue.Queue(maxsize=stage.queue_size or self.queue_size)
+            for stage in self.stages
+        ]
+        done: queue.Queue = queue.Queue()
+        remaining = [stage.workers for stage in self.stages]
+        in_flight = [0] * len(self.stages)  # 异步阶段中尚未完成的 Future 数
+        lock = threading.Lock()
+
+        def stop_next(index: int):
+            """本阶段线程全部退出且没有进行中的异步任务时，通知下游阶段结束"""
+            if index < len(self.stages) - 1:
+                for _ in range(self.stages[index + 1].workers):
+                    inboxes[index + 1].put(_STOP)
+
+        def deliver(index: int, job: Job):
+            outbox = done if index == len(self.stages) - 1 else inboxes[index + 1]
+            # 失败或已提前完成的任务直接交付，不进入后续阶段
+            (outbox if job.ok and not job.finished else done).put(job)
+
+        def on_future_done(index: int, job: Job, start: float, future: Future):
+            try:
+                future.result()
+            except Exception as e:
+                job.error = e
+                job.failed_stage = self.stages[index].name
+            job.timings[self.stages[index].name] = time.monotonic() - start
+            deliver(index, job)
+            with lock:
+                in_flight[index] -= 1
+                last = in_flight[index] == 0 and remaining[index] == 0
+            if last:
+                stop_next(index)
+
+        def feed():
+            for item in items:
+                inboxes[0].put(item if isinstance(item, Job) else Job(item))
+            for _ in range(self.stages[0].workers):
+                inboxes[0].put(_STOP)
+
+        def work(index: int):
+            stage = self.stages[index]
+            inbox = inboxes[index]
+
+            while True:
+                job = inbox.get()
+                if job is _STOP:
+                    break
+                start = time.monotonic()
+                try:
+                    result = stage.func(job)
+                except Exception as e:
+                    result = None
+                    job.error = e
+                    job.failed_stage = stage.name
+                if isinstance(result, Future):
+                    with lock:
+                        in_flight[index] += 1
+                    result.add_done_callback(lambda f, job=job, start=start: on_future_done(index, job, start, f))
+                    continue
+                job.timings[stage.name] = time.monotonic() - start
+                deliver(index, job)
+
+            # 本阶段最后一个线程退出时，通知下游阶段结束
+            with lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0 and in_flight[index] == 0
+            if last:
+                stop_next(index)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=work, args=(index,), name=f"{stage.name}-{n}", daemon=True
+                ))
+        for t in threads:
+            t.start()
+
+        for _ in range(len(items)):
+            yield done.get()
+
+        for t in threads:
+            t.join()
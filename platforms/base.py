@@ -1,8 +1,11 @@
 """平台适配器基类"""
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
+from http_client import get_session
+
 
 @dataclass
 class Video:
@@ -15,6 +18,9 @@ class Video:
     share_url: str
     statistics: Dict[str, int]
     platform: str
+    pinned: bool = False  # 置顶视频，不按时间顺序出现
+    audio_url: str = ""  # 纯音频流地址（audio 采集模式优先使用）
+    low_video_url: str = ""  # 最低码率视频地址（没有纯音频流时使用）
 
 
 class PlatformAdapter(ABC):
@@ -23,6 +29,8 @@ class PlatformAdapter(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.platform_name = config.get('platform', 'unknown')
+        # 共享 HTTP 会话（连接复用、失败重试）
+        self.session = get_session()
 
     @abstractmethod
     def fetch_videos(self, creator_id: str, count: int = 20) -> List[Video]:
@@ -50,6 +58,151 @@ class PlatformAdapter(ABC):
         """
         pass
 
+    def download_audio(self, video: Video, output_path: str) -> Optional[str]:
+        """audio 采集模式下载：只取转写需要的音频
+
+        默认下载完整视频，有纯音频 / 低码率流的平台应覆盖此方法。
+
+        Args:
+            video: 视频信息
+            output_path: 输出路径（不含扩展名，按实际格式补充）
+
+        Returns:
+            下载的文件路径，失败返回 None
+        """
+        path = f"{output_path}.mp4"
+        return path if self.download_video(video, path) else None
+
+    def resolve_video_url(self, video: Video) -> Optional[str]:
+        """重新获取视频下载地址（CDN 链接过期时用于续传）
+
+        默认不支持，返回 None。
+        """
+        return None
+
+    def iter_video_pages(self, creator_id: str, page_size: int = 20,
+                         cursor: Optional[str] = None) -> Iterator[Tuple[List[Video], Optional[str]]]:
+        """按页遍历创作者的视频（从新到旧）
+
+        默认只返回一页、不支持游标，支持游标翻页的平台应覆盖此方法。
+
+        Args:
+            cursor: 从该游标处继续（上次翻页被截断的位置），None 从最新开始
+
+        Yields:
+            (一页视频, 继续翻页的游标)，没有更多时游标为 None
+        """
+        if cursor is None:
+            yield self.fetch_videos(creator_id, count=page_size), None
+
+    def fetch_new_videos(self, creator_id: str, is_known: Callable[[str], bool], days: int = 7,
+                         since: Optional[str] = None, page_size: int = 20, max_pages: int = 10,
+                         resume: Optional[str] = None, retry_since: Optional[str] = None
+                         ) -> Tuple[List[Video], Optional[str]]:
+        """增量获取新视频：从最新翻页直到遇到已知视频或超出时间窗口，再从上次截断处继续
+
+        Args:
+            creator_id: 创作者ID
+            is_known: 判断视频ID是否已存在
+            days: 时间窗口（天）
+            since: 高水位，早于该时间的视频视为已处理
+            page_size: 每页数量
+            max_pages: 最多翻页数（两段合计）
+            resume: 上次因 max_pages 截断处的游标
+            retry_since: 待重试的失败视频中最早的发布时间；不早于它的已知视频只跳过、不停止翻页，
+                否则排在已保存视频下面的失败视频再也翻不到
+
+        Returns:
+            (新视频列表（从新到旧）, 截断处游标)；翻页因 max_pages 停止、更早的视频还没获取时返回游标，
+            调用方保存后下次传入 resume，并且不应推进高水位；已翻到已处理的位置时为 None
+        """
+        cutoff = self._cutoff(days)
+        new_videos = []
+        pages_left = max_pages
+        for start in (None, resume) if resume else (None,):
+            if pages_left <= 0:
+                return new_videos, start
+            for page, cursor in self.iter_video_pages(creator_id, page_size, start):
+                pages_left -= 1
+                fresh, reached_known = self._take_new(page, is_known, cutoff, since, retry_since)
+                new_videos.extend(fresh)
+                if reached_known or cursor is None:
+                    break
+                if pages_left <= 0:
+                    return new_videos, cursor
+
+        return new_videos, None
+
+    @staticmethod
+    def _cutoff(days: int) -> str:
+        from datetime import datetime, timedelta
+        return (datetime.now() - timedelta(days=days)).isoformat()
+
+    @staticmethod
+    def _take_new(page: List[Video], is_known: Callable[[str], bool], cutoff: str,
+                  since: Optional[str], retry_since: Optional[str] = None) -> Tuple[List[Video], bool]:
+        """取出一页中的新视频，返回 (新视频, 是否已遇到已处理/过期视频)"""
+        fresh = []
+        for video in page:
+            known = is_known(video.video_id)
+            stale = video.create_time < cutoff or (since is not None and video.create_time < since) or (
+                known and (retry_since is None or video.create_time < retry_since)
+            )
+            if stale:
+                # 置顶视频不代表时间线位置，跳过继续
+                if video.pinned:
+                    continue
+                return fresh, True
+            if not known:
+                fresh.append(video)
+        return fresh, False
+
+    # ---- 异步接口：默认在线程中调用同步实现，支持 asyncio 的平台可覆盖 ----
+
+    async def afetch_videos(self, creator_id: str, count: int = 20) -> List[Video]:
+        """异步获取创作者的视频列表"""
+        return await asyncio.to_thread(self.fetch_videos, creator_id, count)
+
+    async def adownload_video(self, video: Video, output_path: str) -> bool:
+        """异步下载视频"""
+        return await asyncio.to_thread(self.download_video, video, output_path)
+
+    async def adownload_audio(self, video: Video, output_path: str) -> Optional[str]:
+        """异步下载音频（参数同 download_audio）"""
+        return await asyncio.to_thread(self.download_audio, video, output_path)
+
+    async def aiter_video_pages(self, creator_id: str, page_size: int = 20, cursor: Optional[str] = None
+                                ) -> AsyncIterator[Tuple[List[Video], Optional[str]]]:
+        """异步按页遍历视频（参数、产出同 iter_video_pages）"""
+        pages = self.iter_video_pages(creator_id, page_size, cursor)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            yield page
+
+    async def afetch_new_videos(self, creator_id: str, is_known: Callable[[str], bool], days: int = 7,
+                                since: Optional[str] = None, page_size: int = 20, max_pages: int = 10,
+                                resume: Optional[str] = None, retry_since: Optional[str] = None
+                                ) -> Tuple[List[Video], Optional[str]]:
+        """异步增量获取新视频（参数、返回值同 fetch_new_videos）"""
+        cutoff = self._cutoff(days)
+        new_videos = []
+        pages_left = max_pages
+        for start in (None, resume) if resume else (None,):
+            if pages_left <= 0:
+                return new_videos, start
+            async for page, cursor in self.aiter_video_pages(creator_id, page_size, start):
+                pages_left -= 1
+                fresh, reached_known = self._take_new(page, is_known, cutoff, since, retry_since)
+                new_videos.extend(fresh)
+                if reached_known or cursor is None:
+                    break
+                if pages_left <= 0:
+                    return new_videos, cursor
+
+        return new_videos, None
+
     def filter_new_videos(self, videos: List[Video], days: int = 7) -> List[Video]:
         """过滤指定天数内的新视频
 
@@ -1,12 +1,24 @@
 """抖音平台适配器"""
 import json
 import subprocess
-import requests
 from datetime import datetime
-from typing import List
+from typing import Callable, List, AsyncIterator, Iterator, Optional, Tuple
 from pathlib import Path
+from urllib.parse import urlparse
 from .base import PlatformAdapter, Video
 from config import Config
+from downloader import download_file, discard_partial
+from http_client import get_async_client
+from rate_limiter import get_tikhub_limiter, was_throttled
+
+# 下载视频直链的请求头
+DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Linux; Android 12) AppleWebKit/537.36",
+    "Referer": "https://www.douyin.com/",
+}
+
+# 音频直链的扩展名（无法从地址判断时按 AAC 处理）
+AUDIO_EXTS = ('.m4a', '.mp3', '.aac')
 
 
 class DouyinAdapter(PlatformAdapter):
@@ -16,21 +28,67 @@ class DouyinAdapter(PlatformAdapter):
         super().__init__(config)
         self.api_key = Config.TIKHUB_API_KEY
         self.api_url = Config.TIKHUB_API_URL
+        # 同一 API Key 的所有创作者、进程共享限流
+        self.limiter = get_tikhub_limiter()
 
-    def fetch_videos(self, creator_id: str, count: int = 20) -> List[Video]:
-        """获取抖音博主视频列表"""
-        response = requests.get(
-            f"{self.api_url}/api/v1/douyin/app/v3/fetch_user_post_videos",
-            params={
-                "sec_user_id": creator_id,
-                "max_cursor": "0",
-                "count": str(count),
-                "sort_type": "0"
-            },
+    def _api_get(self, endpoint: str, params: dict):
+        """调用 TikHub 抖音接口：先取令牌（桶空时等待），记录调用次数和费用，429 时降速"""
+        self.limiter.acquire(endpoint)
+        response = self.session.get(
+            f"{self.api_url}/api/v1/douyin/app/v3/{endpoint}",
+            params=params,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        self.limiter.record(endpoint, self.config.get('name', ''), throttled=was_throttled(response))
+        return response
+
+    async def _aapi_get(self, endpoint: str, params: dict):
+        """异步调用 TikHub 抖音接口（限流同 _api_get）"""
+        await self.limiter.aacquire(endpoint)
+        response = await get_async_client().request(
+            "GET",
+            f"{self.api_url}/api/v1/douyin/app/v3/{endpoint}",
+            params=params,
             headers={"Authorization": f"Bearer {self.api_key}"},
-            timeout=30
         )
+        self.limiter.record(endpoint, self.config.get('name', ''), throttled=was_throttled(response))
+        return response
+
+    def fetch_videos(self, creator_id: str, count: int = 20) -> List[Video]:
+        """获取抖音博主视频列表（第一页）"""
+        videos, _, _ = self._fetch_page(creator_id, "0", count)
+        return videos
+
+    def iter_video_pages(self, creator_id: str, page_size: int = 20,
+                         cursor: Optional[str] = None) -> Iterator[Tuple[List[Video], Optional[str]]]:
+        """按 max_cursor / has_more 游标翻页（max_cursor 按发布时间，新视频发布后仍然有效）"""
+        cursor = cursor or "0"
+        while True:
+            videos, cursor, has_more = self._fetch_page(creator_id, cursor, page_size)
+            more = has_more and bool(videos)
+            yield videos, cursor if more else None
+            if not more:
+                break
+
+    def _fetch_page(self, creator_id: str, max_cursor: str, count: int) -> Tuple[List[Video], str, bool]:
+        """获取一页视频
 
+        Returns:
+            (视频列表, 下一页游标, 是否还有更多)
+        """
+        response = self._api_get("fetch_user_post_videos", self._page_params(creator_id, max_cursor, count))
+        return self._parse_page(response)
+
+    def _page_params(self, creator_id: str, max_cursor: str, count: int) -> dict:
+        return {
+            "sec_user_id": creator_id,
+            "max_cursor": max_cursor,
+            "count": str(count),
+            "sort_type": "0"
+        }
+
+    def _parse_page(self, response) -> Tuple[List[Video], str, bool]:
+        """解析一页接口响应（requests / httpx 响应均可）"""
         if response.status_code != 200:
             raise Exception(f"HTTP 错误 {response.status_code}: {response.text}")
 
@@ -42,63 +100,177 @@ class DouyinAdapter(PlatformAdapter):
                 f"完整响应: {error_detail}"
             )
 
-        videos = []
-        for item in data.get("data", {}).get("aweme_list", []):
-            author = item.get("author", {})
-            statistics = item.get("statistics", {})
-            video = item.get("video", {})
-            play_addr = video.get("play_addr", {})
-            url_list = play_addr.get("url_list", [])
-
-            videos.append(Video(
-                video_id=item.get("aweme_id", ""),
-                title=item.get("desc", "无标题"),
-                author=author.get("nickname", "未知作者"),
-                create_time=f"{datetime.fromtimestamp(item.get('create_time', 0)).isoformat()}",
-                video_url=url_list[0] if url_list else "",
-                share_url=f"https://www.douyin.com/video/{item.get('aweme_id', '')}",
-                statistics={
-                    "digg_count": statistics.get("digg_count", 0),
-                    "comment_count": statistics.get("comment_count", 0),
-                    "share_count": statistics.get("share_count", 0),
-                    "play_count": statistics.get("play_count", 0),
-                },
-                platform="douyin"
-            ))
+        payload = data.get("data", {})
+        videos = [self._parse_video(item) for item in payload.get("aweme_list", [])]
+        return videos, str(payload.get("max_cursor", "0")), bool(payload.get("has_more"))
+
+    async def _afetch_page(self, creator_id: str, max_cursor: str, count: int) -> Tuple[List[Video], str, bool]:
+        """异步获取一页视频"""
+        response = await self._aapi_get("fetch_user_post_videos", self._page_params(creator_id, max_cursor, count))
+        return self._parse_page(response)
 
+    async def afetch_videos(self, creator_id: str, count: int = 20) -> List[Video]:
+        """异步获取视频列表（第一页）"""
+        videos, _, _ = await self._afetch_page(creator_id, "0", count)
         return videos
 
+    async def aiter_video_pages(self, creator_id: str, page_size: int = 20, cursor: Optional[str] = None
+                                ) -> AsyncIterator[Tuple[List[Video], Optional[str]]]:
+        """异步按 max_cursor / has_more 游标翻页"""
+        cursor = cursor or "0"
+        while True:
+            videos, cursor, has_more = await self._afetch_page(creator_id, cursor, page_size)
+            more = has_more and bool(videos)
+            yield videos, cursor if more else None
+            if not more:
+                break
+
+    def _parse_video(self, item: dict) -> Video:
+        """解析 aweme 条目"""
+        author = item.get("author", {})
+        statistics = item.get("statistics", {})
+        video = item.get("video", {})
+        play_addr = video.get("play_addr", {})
+        url_list = play_addr.get("url_list", [])
+
+        # 其他码率的视频流：取码率最低的
+        renditions = []
+        for rendition in video.get("bit_rate") or []:
+            urls = self._url_list((rendition.get("play_addr") or {}).get("url_list"))
+            if urls:
+                renditions.append((rendition.get("bit_rate") or 0, urls[0]))
+
+        return Video(
+            video_id=item.get("aweme_id", ""),
+            title=item.get("desc", "无标题"),
+            author=author.get("nickname", "未知作者"),
+            create_time=f"{datetime.fromtimestamp(item.get('create_time', 0)).isoformat()}",
+            video_url=url_list[0] if url_list else "",
+            share_url=f"https://www.douyin.com/video/{item.get('aweme_id', '')}",
+            statistics={
+                "digg_count": statistics.get("digg_count", 0),
+                "comment_count": statistics.get("comment_count", 0),
+                "share_count": statistics.get("share_count", 0),
+                "play_count": statistics.get("play_count", 0),
+            },
+            platform="douyin",
+            pinned=bool(item.get("is_top")),
+            audio_url=self._pick_audio_url(item),
+            low_video_url=min(renditions)[1] if renditions else "",
+        )
+
+    @staticmethod
+    def _url_list(value) -> List[str]:
+        """地址列表：列表，或 {"main_url": ..., "backup_url": ...}"""
+        if isinstance(value, dict):
+            return [url for url in value.values() if isinstance(url, str) and url]
+        return [url for url in value or [] if url]
+
+    def _pick_audio_url(self, item: dict) -> str:
+        """纯音频流地址：DASH 音频流（bit_rate_audio）中码率最低的；没有时用作者本人的原声
+
+        music 通常是背景音乐，只有标为原声、属于视频作者、时长与视频一致时才是视频本身的声音。
+        """
+        video = item.get("video") or {}
+        streams = []
+        for entry in video.get("bit_rate_audio") or []:
+            meta = entry.get("audio_meta") or {}
+            urls = self._url_list(meta.get("url_list"))
+            if urls:
+                streams.append((meta.get("bitrate") or 0, urls[0]))
+        if streams:
+            return min(streams)[1]
+
+        music = item.get("music") or {}
+        author_uid = (item.get("author") or {}).get("uid")
+        original = music.get("is_original") or music.get("is_original_sound")
+        same_length = abs((music.get("duration") or 0) - (video.get("duration") or 0) / 1000) <= 2
+        if original and author_uid and str(music.get("owner_id")) == str(author_uid) and same_length:
+            urls = self._url_list((music.get("play_url") or {}).get("url_list"))
+            if urls:
+                return urls[0]
+        return ""
+
+    @staticmethod
+    def _audio_ext(url: str) -> str:
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if suffix in AUDIO_EXTS:
+            return suffix
+        return ".mp3" if "audio_mpeg" in url else ".m4a"
+
+    def _download_direct(self, url: str, output_path: str, resolve_url: Callable[[], Optional[str]]) -> bool:
+        """直链下载（多连接分段、断点续传），文件太小（错误页面）视为失败"""
+        try:
+            # CDN 支持 Range 时多连接分段下载；中断后保留 .part 断点，链接过期时重新获取地址
+            size = download_file(url, output_path, headers=DOWNLOAD_HEADERS, timeout=120, resolve_url=resolve_url)
+            if size > 10000:
+                return True
+        except Exception:
+            pass
+        Path(output_path).unlink(missing_ok=True)
+        return False
+
+    def download_audio(self, video: Video, output_path: str) -> Optional[str]:
+        """audio 采集模式下载：纯音频流 → 最低码率视频 → yt-dlp -f bestaudio，都不可用时下载完整视频"""
+        attempted = []
+        if video.audio_url:
+            path = f"{output_path}{self._audio_ext(video.audio_url)}"
+            attempted.append(path)
+            if self._download_direct(video.audio_url, path,
+                                     lambda: self.resolve_video_url(video) and video.audio_url or None):
+                return path
+        if video.low_video_url:
+            path = f"{output_path}.mp4"
+            attempted.append(path)
+            if self._download_direct(video.low_video_url, path,
+                                     lambda: self.resolve_video_url(video) and video.low_video_url or None):
+                return path
+
+        # 直链下载失败留下的 .part 已按总长预分配，与 yt-dlp 的临时文件同名，会被当作已下载完成
+        for path in attempted:
+            discard_partial(path)
+        try:
+            result = subprocess.run(
+                [
+                    "yt-dlp",
+                    "--no-warnings",
+                    "--no-continue",
+                    # 只要 m4a / mp3：webm、opus 等会被当作视频按 .mp4 保存
+                    "-f", "bestaudio[ext=m4a]/bestaudio[ext=mp3]",
+                    "-o", f"{output_path}.%(ext)s",
+                    "--print", "after_move:filepath",
+                    video.share_url,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=180,
+            )
+            lines = result.stdout.strip().splitlines()
+            if result.returncode == 0 and lines and Path(lines[-1]).exists():
+                if Path(lines[-1]).suffix in AUDIO_EXTS:
+                    return lines[-1]
+                Path(lines[-1]).unlink(missing_ok=True)
+        except Exception:
+            pass
+
+        path = f"{output_path}.mp4"
+        return path if self.download_video(video, path) else None
+
     def download_video(self, video: Video, output_path: str) -> bool:
         """下载抖音视频（纯 Python，优先用 API 直链，降级用 yt-dlp）"""
         # 方式一：直接从 API 返回的 video_url 下载
-        if video.video_url:
-            try:
-                resp = requests.get(
-                    video.video_url,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Linux; Android 12) AppleWebKit/537.36",
-                        "Referer": "https://www.douyin.com/",
-                    },
-                    stream=True,
-                    timeout=120,
-                )
-                if resp.status_code == 200:
-                    with open(output_path, "wb") as f:
-                        for chunk in resp.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    if Path(output_path).stat().st_size > 10000:
-                        return True
-                    # 文件太小，可能是错误页面，删掉走降级
-                    Path(output_path).unlink(missing_ok=True)
-            except Exception:
-                Path(output_path).unlink(missing_ok=True)
-
-        # 方式二：yt-dlp 降级
+        if video.video_url and self._download_direct(video.video_url, output_path,
+                                                      lambda: self.resolve_video_url(video)):
+            return True
+
+        # 方式二：yt-dlp 降级（先删除直链下载留下的预分配 .part，yt-dlp 的临时文件与它同名）
+        discard_partial(output_path)
         try:
             result = subprocess.run(
                 [
                     "yt-dlp",
                     "--no-warnings",
+                    "--no-continue",
                     "-o", output_path,
                     video.share_url,
                 ],
@@ -106,6 +278,24 @@ class DouyinAdapter(PlatformAdapter):
                 text=True,
                 timeout=180,
             )
-            return result.returncode == 0 and Path(output_path).exists()
+            if result.returncode == 0 and Path(output_path).exists():
+                return True
+            return False
         except Exception:
             return False
+
+    def resolve_video_url(self, video: Video) -> Optional[str]:
+        """通过 TikHub 单视频接口重新获取播放地址"""
+        response = self._api_get("fetch_one_video", {"aweme_id": video.video_id})
+        if response.status_code != 200:
+            return None
+        detail = (response.json().get("data") or {}).get("aweme_detail") or {}
+        if not detail:
+            return None
+        fresh = self._parse_video(detail)
+        # 纯音频 / 低码率地址同时更新（audio 采集模式续传时使用）
+        video.audio_url = fresh.audio_url or video.audio_url
+        video.low_video_url = fresh.low_video_url or video.low_video_url
+        if fresh.video_url:
+            video.video_url = fresh.video_url
+        return fresh.video_url or None
@@ -0,0 +1,228 @@
+"""磁盘配额模块 - 按创作者 / 全局字节预算淘汰已处理视频的 mp4（删除，或转为语音码率音频）
+
+用量按索引（catalog.db）中记录的文件大小汇总，每批处理完成后检查一次，不扫描目录。
+转录、元数据始终保留；未转录的视频只会转为音频（仍可补充转录），不会直接删除。
+"""
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import Config, CreatorConfig
+from catalog import get_catalog, SIZE_FIELDS
+from storage import StorageManager, get_scratch_dir
+
+GB = 1024 ** 3
+
+# 淘汰策略：最早发布 / 最久未访问 / 已转录的优先（同类中最早发布的优先）
+POLICIES = ('oldest', 'lru', 'transcribed')
+
+# 全局预算在计划中的名称
+GLOBAL = '*'
+
+# 规划时估算转为音频后的体积（语音码率音频约为视频的 5%），执行时按实际大小重新统计
+AUDIO_SIZE_RATIO = 0.05
+
+# 同一时间只有一个线程执行淘汰（多个创作者并发处理时各自在批次结束后检查）
+_enforce_lock = threading.Lock()
+
+
+@dataclass
+class Eviction:
+    """一项淘汰操作"""
+    creator: str  # 创作者目录名
+    video_id: str
+    path: Path  # 视频文件
+    size: int
+    create_time: Optional[str]
+    transcribed: bool
+    action: str  # delete 删除视频 / audio 转为音频后删除视频
+    budget: str = GLOBAL  # 触发淘汰的预算：创作者目录名，或 GLOBAL
+
+    @property
+    def estimated_freed(self) -> int:
+        """预计释放的字节数"""
+        return self.size if self.action == 'delete' else int(self.size * (1 - AUDIO_SIZE_RATIO))
+
+
+class DiskQuota:
+    """磁盘配额管理
+
+    预算：全局 DISK_QUOTA_GB，单个创作者为 creators.json 中的 quota_gb。
+    超出时按策略挑选视频，直到预计用量回到预算以内；先满足创作者预算，再满足全局预算。
+    """
+
+    def __init__(self, policy: str = None, keep_audio: bool = None, global_gb: float = None):
+        """
+        Args:
+            policy: 淘汰策略（POLICIES），默认 Config.DISK_QUOTA_POLICY
+            keep_audio: 是否转为音频而不是删除，默认 Config.DISK_QUOTA_KEEP_AUDIO
+            global_gb: 全局预算（GB，0 不限制），默认 Config.DISK_QUOTA_GB
+        """
+        self.policy = policy or Config.DISK_QUOTA_POLICY
+        if self.policy not in POLICIES:
+            raise ValueError(f"不支持的淘汰策略: {self.policy}（可选: {', '.join(POLICIES)}）")
+        self.keep_audio = Config.DISK_QUOTA_KEEP_AUDIO if keep_audio is None else keep_audio
+        global_gb = Config.DISK_QUOTA_GB if global_gb is None else global_gb
+        self.global_budget = int(global_gb * GB) if global_gb else None
+        self.catalog = get_catalog()
+
+        creators = CreatorConfig().get_all()
+        # 创作者目录名 -> 名称 / 预算（字节）
+        self.names = {c['directory']: c['name'] for c in creators}
+        self.budgets = {c['directory']: int(c['quota_gb'] * GB) for c in creators if c.get('quota_gb')}
+
+    @property
+    def enabled(self) -> bool:
+        """是否设置了任何预算"""
+        return bool(self.global_budget or self.budgets)
+
+    def usage(self) -> Dict[str, int]:
+        """各创作者目录的媒体文件字节数（旧版本索引缺少大小时先补齐）"""
+        for record in self.catalog.missing_sizes():
+            sizes = {}
+            for field, size_field in SIZE_FIELDS.items():
+                if record[field] and record[size_field] is None:
+                    try:
+                        sizes[size_field] = (Config.DATA_DIR / record['creator'] / record[field]).stat().st_size
+                    except OSError:
+                        sizes[size_field] = 0
+            self.catalog.upsert(record['creator'], record['video_id'], **sizes)
+        return self.catalog.media_usage()
+
+    def _excess(self, usage: Dict[str, int], budget: str) -> int:
+        """超出预算的字节数（未超出时 <= 0）"""
+        if budget == GLOBAL:
+            return sum(usage.values()) - self.global_budget if self.global_budget else 0
+        return usage.get(budget, 0) - self.budgets[budget] if budget in self.budgets else 0
+
+    def _candidates(self, records: List[Dict[str, Any]]) -> List[Eviction]:
+        """可淘汰的视频，按策略排序"""
+        candidates = []
+        for record in records:
+            # 元数据最后保存，没有元数据的视频还在流水线中处理
+            if not record['video_file'] or not record['has_metadata'] or record['creator'] not in self.names:
+                continue
+            transcribed = bool(record['has_transcript'])
+            if self.keep_audio and not record['audio_file']:
+                action = 'audio'
+            elif transcribed or record['audio_file']:
+                action = 'delete'
+            else:
+                # 未转录且没有音频：删除后无法补充转录
+                continue
+            candidates.append(Eviction(
+                creator=record['creator'],
+                video_id=record['video_id'],
+                path=Config.DATA_DIR / record['creator'] / record['video_file'],
+                size=record['video_size'] or 0,
+                create_time=record['create_time'],
+                transcribed=transcribed,
+                action=action,
+            ))
+
+        if self.policy == 'lru':
+            candidates.sort(key=lambda e: (self._last_access(e.path), e.video_id))
+        elif self.policy == 'transcribed':
+            candidates.sort(key=lambda e: (not e.transcribed, e.create_time or '', e.video_id))
+        else:
+            candidates.sort(key=lambda e: (e.create_time or '', e.video_id))
+        return candidates
+
+    @staticmethod
+    def _last_access(path: Path) -> float:
+        """最后访问时间（文件系统 atime，挂载为 noatime 时退化为修改时间）"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return 0.0
+        return max(stat.st_atime, stat.st_mtime)
+
+    def plan(self, creator: str = None) -> List[Eviction]:
+        """计划淘汰（不执行）
+
+        Args:
+            creator: 只检查该创作者目录的预算（以及全局预算），None 检查全部
+
+        Returns:
+            按执行顺序排列的淘汰操作，未超出预算时为空
+        """
+        usage = self.usage()
+        budgets = [key for key in self.budgets if creator is None or key == creator]
+        budgets.append(GLOBAL)
+        if all(self._excess(usage, budget) <= 0 for budget in budgets):
+            return []
+
+        evictions: List[Eviction] = []
+        chosen = set()
+        for budget in budgets:
+            excess = self._excess(usage, budget)
+            if excess <= 0:
+                continue
+            records = self.catalog.list_media(None if budget == GLOBAL else budget)
+            for eviction in self._candidates(records):
+                if excess <= 0:
+                    break
+                if (eviction.creator, eviction.video_id) in chosen:
+                    continue
+                eviction.budget = budget
+                evictions.append(eviction)
+                chosen.add((eviction.creator, eviction.video_id))
+                freed = eviction.estimated_freed
+                excess -= freed
+                # 预计用量同步扣减，后面的预算按扣减后的用量计算
+                usage[eviction.creator] = usage.get(eviction.creator, 0) - freed
+        return evictions
+
+    def enforce(self, creator: str = None, dry_run: bool = False) -> Dict[str, Any]:
+        """按计划淘汰，直到实际用量回到预算以内
+
+        Args:
+            creator: 只检查该创作者目录的预算（以及全局预算），None 检查全部
+            dry_run: 只生成计划，不删除文件
+
+        Returns:
+            {'plan': 计划, 'done': 已执行的操作, 'freed': 实际释放字节数, 'errors': 失败信息}
+        """
+        with _enforce_lock:
+            plan = self.plan(creator)
+            report = {'plan': plan, 'done': [], 'freed': 0, 'errors': []}
+            if dry_run:
+                return report
+
+            storages: Dict[str, StorageManager] = {}
+            for eviction in plan:
+                # 转音频的实际体积与估算不同，执行前按实际用量确认仍超出
+                if self._excess(self.catalog.media_usage(), eviction.budget) <= 0:
+                    continue
+                storage = storages.get(eviction.creator)
+                if storage is None:
+                    storage = storages[eviction.creator] = StorageManager(self.names[eviction.creator])
+                try:
+                    report['freed'] += self._evict(storage, eviction)
+                    report['done'].append(eviction)
+                except Exception as e:
+                    report['errors'].append(f"{eviction.video_id}: {e}")
+            return report
+
+    def _evict(self, storage: StorageManager, eviction: Eviction) -> int:
+        """执行一项淘汰，返回实际释放的字节数"""
+        added = 0
+        if eviction.action == 'audio':
+            from audio import extract_audio
+            # 提取到暂存目录（与数据目录同一文件系统），保存时直接改名移入
+            audio_path = extract_audio(eviction.path, profile=Config.DISK_QUOTA_AUDIO_PROFILE,
+                                       output_dir=get_scratch_dir())
+            try:
+                added = storage.save_audio(eviction.video_id, str(audio_path)).stat().st_size
+            finally:
+                audio_path.unlink(missing_ok=True)
+        return storage.remove_video(eviction.video_id) - added
+
+
+def enforce_quota(creator: str = None) -> Optional[Dict[str, Any]]:
+    """检查并执行磁盘配额（未设置任何预算时返回 None）"""
+    quota = DiskQuota()
+    if not quota.enabled:
+        return None
+    return quota.enforce(creator)
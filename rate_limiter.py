@@ -0,0 +1,178 @@
+"""限流模块 - 按 API Key 共享的令牌桶（跨进程持久化），429 自适应降速，调用次数与费用统计"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import Config
+
+# 429 后速率减半，不低于配置速率的该比例
+MIN_RATE_RATIO = 0.05
+# 每次成功请求恢复配置速率的该比例（加性恢复）
+RECOVERY_RATIO = 0.1
+
+
+class RateLimiter:
+    """令牌桶限流器
+
+    每个 (API Key, 接口) 一个桶，状态保存在 SQLite 中，同一台机器上的多个进程、线程共享。
+    取令牌时预占：桶空时令牌数记为负数，调用方按欠账等待，不会失败。
+    收到 429 时速率减半并清空令牌，之后每次成功请求逐步恢复到配置速率（AIMD）。
+    同时按 日期 / 创作者 / 接口 累计调用次数和估算费用。
+    """
+
+    def __init__(self, api_key: str, db_path: Path = None, rate: float = None, burst: int = None,
+                 endpoint_rates: Dict[str, float] = None, cost_per_call: float = None,
+                 endpoint_costs: Dict[str, float] = None):
+        """
+        Args:
+            api_key: API Key（只保存其哈希，用于区分不同 Key 的桶）
+            db_path: 状态数据库
+            rate: 默认速率（请求/秒）
+            burst: 桶容量（允许的突发请求数）
+            endpoint_rates: 按接口单独设置的速率
+            cost_per_call: 默认单次调用费用
+            endpoint_costs: 按接口单独设置的单次费用
+        """
+        self.key_id = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+        self.db_path = Path(db_path or Config.RATE_LIMIT_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate = rate or Config.TIKHUB_RATE
+        self.burst = burst or Config.TIKHUB_BURST
+        self.endpoint_rates = endpoint_rates if endpoint_rates is not None else Config.TIKHUB_ENDPOINT_RATES
+        self.cost_per_call = cost_per_call if cost_per_call is not None else Config.TIKHUB_COST_PER_CALL
+        self.endpoint_costs = endpoint_costs if endpoint_costs is not None else Config.TIKHUB_ENDPOINT_COSTS
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    rate REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS usage (
+                    key_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    creator TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    calls INTEGER NOT NULL DEFAULT 0,
+                    throttled INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (key_id, day, creator, endpoint)
+                );
+            """)
+
+    def _base_rate(self, endpoint: str) -> float:
+        return self.endpoint_rates.get(endpoint, self.rate)
+
+    def _bucket(self, endpoint: str) -> str:
+        return f"{self.key_id}:{endpoint}"
+
+    def reserve(self, endpoint: str) -> float:
+        """预占一个令牌，返回需要等待的秒数"""
+        base_rate = self._base_rate(endpoint)
+        now = time.time()
+        with self._lock, self._conn:
+            # IMMEDIATE：读改写期间持有写锁，多进程不会同时取到同一个令牌
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT tokens, rate, updated_at FROM buckets WHERE name = ?", (self._bucket(endpoint),)
+            ).fetchone()
+            tokens, rate, updated_at = row if row else (self.burst, base_rate, now)
+            rate = min(rate, base_rate)
+            tokens = min(self.burst, tokens + max(0.0, now - updated_at) * rate) - 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, rate, updated_at) VALUES (?, ?, ?, ?)",
+                (self._bucket(endpoint), tokens, rate, now)
+            )
+        return -tokens / rate if tokens < 0 else 0.0
+
+    def acquire(self, endpoint: str):
+        """取令牌，桶空时阻塞等待"""
+        wait = self.reserve(endpoint)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, endpoint: str):
+        """异步取令牌，桶空时等待（不阻塞事件循环）"""
+        wait = await asyncio.to_thread(self.reserve, endpoint)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def record(self, endpoint: str, creator: str = '', throttled: bool = False):
+        """记录一次调用：累计次数和费用；被限流（429）时降速，否则逐步恢复速率"""
+        base_rate = self._base_rate(endpoint)
+        cost = self.endpoint_costs.get(endpoint, self.cost_per_call)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if throttled:
+                # 速率减半并清空令牌，排队中的请求随之放慢
+                self._conn.execute(
+                    "UPDATE buckets SET rate = MAX(rate * 0.5, ?), tokens = MIN(tokens, 0) WHERE name = ?",
+                    (base_rate * MIN_RATE_RATIO, self._bucket(endpoint))
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE buckets SET rate = MIN(rate + ?, ?) WHERE name = ?",
+                    (base_rate * RECOVERY_RATIO, base_rate, self._bucket(endpoint))
+                )
+            self._conn.execute(
+                "INSERT INTO usage (key_id, day, creator, endpoint, calls, throttled, cost) "
+                "VALUES (?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (key_id, day, creator, endpoint) DO UPDATE SET "
+                "calls = calls + 1, throttled = throttled + excluded.throttled, cost = cost + excluded.cost",
+                (self.key_id, date.today().isoformat(), creator, endpoint, int(throttled), cost)
+            )
+
+    def current_rate(self, endpoint: str) -> float:
+        """当前速率（请求/秒），未使用过的接口返回配置速率"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rate FROM buckets WHERE name = ?", (self._bucket(endpoint),)
+            ).fetchone()
+        return row[0] if row else self._base_rate(endpoint)
+
+    def usage(self, since: str = None) -> List[dict]:
+        """按创作者汇总调用次数、被限流次数和估算费用
+
+        Args:
+            since: 起始日期（YYYY-MM-DD），默认全部
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT creator, SUM(calls), SUM(throttled), SUM(cost) FROM usage "
+                "WHERE key_id = ? AND day >= ? GROUP BY creator ORDER BY SUM(cost) DESC",
+                (self.key_id, since or '')
+            ).fetchall()
+        return [
+            {'creator': creator, 'calls': calls, 'throttled': throttled, 'cost': cost}
+            for creator, calls, throttled, cost in rows
+        ]
+
+
+def was_throttled(response) -> bool:
+    """响应或其自动重试过程中是否出现过 429（requests / httpx 响应均可）"""
+    if response.status_code == 429 or 429 in getattr(response, 'retry_history', ()):
+        return True
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    return bool(retries) and any(h.status == 429 for h in retries.history)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_tikhub_limiter() -> RateLimiter:
+    """获取 TikHub API Key 共享的限流器"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(Config.TIKHUB_API_KEY)
+        return _limiter
@@ -0,0 +1,341 @@
+"""离线回放模块 - 录制 TikHub 响应 / 视频 / 识别结果为本地夹具，本地替身服务按配置的延迟和带宽回放
+
+夹具目录结构：
+    tikhub/{sec_user_id}.json   {"creator": 名称, "pages": [fetch_user_post_videos 的 data, ...]}
+    videos/{aweme_id}.mp4       视频文件
+    asr/{aweme_id}.txt          识别结果（TRANSCRIBER=fake 时返回）
+"""
+import contextlib
+import copy
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+from config import Config, CreatorConfig
+from downloader import _RangeRequestHandler
+
+API_PREFIX = '/api/v1/douyin/app/v3/'
+
+
+def record_creator(creator: dict, fixtures_dir: Path = None, max_videos: int = 10,
+                   with_asr: bool = True) -> Dict[str, int]:
+    """录制一个抖音创作者的视频列表、视频文件和识别结果（会消耗 API 配额）
+
+    Args:
+        creator: 创作者配置
+        fixtures_dir: 夹具目录，默认 Config.REPLAY_DIR
+        max_videos: 最多录制的视频数
+        with_asr: 是否调用转写引擎录制识别结果
+
+    Returns:
+        {'pages', 'videos', 'bytes', 'transcripts'}
+    """
+    from platforms import get_adapter
+    from transcribers import get_transcriber
+
+    if creator['platform'] != 'douyin':
+        raise Exception(f"暂不支持录制 {creator['platform']} 平台")
+
+    fixtures_dir = Path(fixtures_dir or Config.REPLAY_DIR)
+    for sub in ('tikhub', 'videos', 'asr'):
+        (fixtures_dir / sub).mkdir(parents=True, exist_ok=True)
+    adapter = get_adapter('douyin', creator)
+    report = {'pages': 0, 'videos': 0, 'bytes': 0, 'transcripts': 0}
+
+    # 视频列表：保存原始接口数据，按游标翻页直到够 max_videos 条
+    pages = []
+    awemes = []
+    cursor = "0"
+    while len(awemes) < max_videos and len(pages) < Config.FETCH_MAX_PAGES:
+        response = adapter._api_get("fetch_user_post_videos", adapter._page_params(creator['id'], cursor, 20))
+        adapter._parse_page(response)  # 校验响应
+        payload = response.json()['data']
+        pages.append(payload)
+        awemes += payload.get('aweme_list', [])
+        cursor = str(payload.get('max_cursor', '0'))
+        if not payload.get('has_more'):
+            break
+    fixture = {'creator': creator['name'], 'pages': pages}
+    (fixtures_dir / 'tikhub' / f"{creator['id']}.json").write_text(
+        json.dumps(fixture, ensure_ascii=False), encoding='utf-8'
+    )
+    report['pages'] = len(pages)
+
+    backend = get_transcriber(Config.TRANSCRIBER, creator) if with_asr and Config.TRANSCRIBER != 'fake' else None
+    try:
+        for item in awemes[:max_videos]:
+            video = adapter._parse_video(item)
+            video_path = fixtures_dir / 'videos' / f"{video.video_id}.mp4"
+            if not video_path.exists() and not adapter.download_video(video, str(video_path)):
+                continue
+            report['videos'] += 1
+            report['bytes'] += video_path.stat().st_size
+
+            asr_path = fixtures_dir / 'asr' / f"{video.video_id}.txt"
+            if backend and not asr_path.exists():
+                asr_path.write_text(backend.transcribe(video_path), encoding='utf-8')
+            if asr_path.exists():
+                report['transcripts'] += 1
+    finally:
+        if backend:
+            backend.close()
+    return report
+
+
+def generate_fixtures(fixtures_dir: Path, creators: int = 3, videos: int = 10, page_size: int = 5,
+                      video_mb: float = 2) -> Path:
+    """生成合成夹具（视频为随机字节，只用于测下载 / 流水线吞吐，需配合 TRANSCRIBER=fake）"""
+    fixtures_dir = Path(fixtures_dir)
+    for sub in ('tikhub', 'videos', 'asr'):
+        (fixtures_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    now = int(time.time())
+    for c in range(creators):
+        sec_user_id = f"replay-user-{c}"
+        items = []
+        for v in range(videos):
+            aweme_id = f"{7000000000000000000 + c * 100000 + v}"
+            items.append({
+                'aweme_id': aweme_id,
+                'desc': f"回放视频 {c}-{v}",
+                'create_time': now - (v + 1) * 3600,
+                'author': {'nickname': f"回放创作者{c}"},
+                'statistics': {'digg_count': v, 'comment_count': 0, 'share_count': 0, 'play_count': v * 10},
+                'video': {'play_addr': {'url_list': []}},
+            })
+            (fixtures_dir / 'videos' / f"{aweme_id}.mp4").write_bytes(os.urandom(int(video_mb * 1024 * 1024)))
+            (fixtures_dir / 'asr' / f"{aweme_id}.txt").write_text(f"回放转录 {c}-{v}", encoding='utf-8')
+
+        pages = []
+        for start in range(0, videos, page_size):
+            has_more = start + page_size < videos
+            pages.append({
+                'aweme_list': items[start:start + page_size],
+                'max_cursor': items[min(start + page_size, videos) - 1]['create_time'] * 1000,
+                'has_more': int(has_more),
+            })
+        fixture = {'creator': f"回放创作者{c}", 'pages': pages}
+        (fixtures_dir / 'tikhub' / f"{sec_user_id}.json").write_text(
+            json.dumps(fixture, ensure_ascii=False), encoding='utf-8'
+        )
+    return fixtures_dir
+
+
+def load_fixtures(fixtures_dir: Path) -> Dict[str, dict]:
+    """读取夹具：{sec_user_id: {'creator', 'pages', 'cursors': {游标: 页序号}}}"""
+    users = {}
+    for path in sorted((Path(fixtures_dir) / 'tikhub').glob('*.json')):
+        fixture = json.loads(path.read_text(encoding='utf-8'))
+        pages = fixture.get('pages', [])
+        # 第一页游标为 "0"，之后每页用上一页返回的 max_cursor
+        cursors = {'0': 0}
+        for index, page in enumerate(pages[:-1]):
+            cursors[str(page.get('max_cursor', ''))] = index + 1
+        users[path.stem] = {'creator': fixture.get('creator', path.stem), 'pages': pages, 'cursors': cursors}
+    return users
+
+
+class _ReplayRequestHandler(_RangeRequestHandler):
+    """替身服务：回放 TikHub 接口，视频按 Range 分段返回（每连接限速），每个请求先等待固定延迟"""
+
+    users: Dict[str, dict] = {}
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return super().do_GET()
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path[len(API_PREFIX):]
+        if endpoint == 'fetch_user_post_videos':
+            user = self.users.get(params.get('sec_user_id', ''))
+            index = user['cursors'].get(params.get('max_cursor', '0')) if user else None
+            if index is None:
+                return self._send_json(404, {'code': 404, 'message': '夹具中没有该用户或游标'})
+            return self._send_json(200, {'code': 200, 'data': self._rewrite(user['pages'][index])})
+        if endpoint == 'fetch_one_video':
+            aweme_id = params.get('aweme_id', '')
+            for user in self.users.values():
+                for page in user['pages']:
+                    for item in page.get('aweme_list', []):
+                        if item.get('aweme_id') == aweme_id:
+                            aweme = self._rewrite({'aweme_list': [item]})['aweme_list'][0]
+                            return self._send_json(200, {'code': 200, 'data': {'aweme_detail': aweme}})
+            return self._send_json(404, {'code': 404, 'message': '夹具中没有该视频'})
+        self._send_json(404, {'code': 404, 'message': f'不支持的接口: {endpoint}'})
+
+    def _rewrite(self, page: dict) -> dict:
+        """把视频地址改成替身服务上的夹具文件
+
+        其他码率、纯音频流和原声地址指向真实 CDN，一并去掉，audio 采集模式也只下载夹具文件。
+        """
+        page = copy.deepcopy(page)
+        host = self.headers.get('Host')
+        for item in page.get('aweme_list', []):
+            video = item.setdefault('video', {})
+            video.pop('bit_rate', None)
+            video.pop('bit_rate_audio', None)
+            (item.get('music') or {}).pop('play_url', None)
+            play_addr = video.setdefault('play_addr', {})
+            play_addr['url_list'] = [f"http://{host}/videos/{item.get('aweme_id')}.mp4"]
+        return page
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ReplayServer:
+    """本地替身服务（TikHub 接口 + 视频 CDN），用法：
+
+        with ReplayServer() as server:
+            Config.TIKHUB_API_URL = server.url
+    """
+
+    def __init__(self, fixtures_dir: Path = None, latency_ms: float = None, bandwidth_mb: float = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            fixtures_dir: 夹具目录，默认 Config.REPLAY_DIR
+            latency_ms: 每个请求的延迟（毫秒），默认 Config.REPLAY_LATENCY_MS
+            bandwidth_mb: 每连接带宽（MB/s，0 不限速），默认 Config.REPLAY_BANDWIDTH_MB
+            host: 监听地址
+            port: 监听端口，0 自动分配
+        """
+        self.fixtures_dir = Path(fixtures_dir or Config.REPLAY_DIR)
+        self.users = load_fixtures(self.fixtures_dir)
+        latency_ms = Config.REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        bandwidth_mb = Config.REPLAY_BANDWIDTH_MB if bandwidth_mb is None else bandwidth_mb
+        handler = type('Handler', (_ReplayRequestHandler,), {
+            'users': self.users,
+            'latency': latency_ms / 1000,
+            'rate_limit': int(bandwidth_mb * 1024 * 1024),
+        })
+        directory = str(self.fixtures_dir)
+        self._server = ThreadingHTTPServer((host, port), lambda *args: handler(*args, directory=directory))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'ReplayServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextlib.contextmanager
+def _override(obj, **attrs):
+    """临时替换对象属性"""
+    saved = {name: getattr(obj, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(obj, name, value)
+
+
+def replay_benchmark(fixtures_dir: Path = None, latency_ms: float = None, bandwidth_mb: float = None,
+                     concurrency: int = None) -> dict:
+    """离线端到端基准：对替身服务跑一次完整 run（抓取 → 下载 → 假转写），数据写入临时目录
+
+    夹具目录为空时先生成合成夹具。
+
+    Returns:
+        {'creators', 'expected', 'videos', 'transcripts', 'bytes', 'seconds', 'videos_per_s', 'mb_per_s'}
+    """
+    import catalog
+    import rate_limiter
+    import search_index
+    import transcript_cache
+    from scheduler import CortexCore
+
+    work_dir = Path(tempfile.mkdtemp(prefix='cortex-replay-'))
+    try:
+        fixtures_dir = Path(fixtures_dir or Config.REPLAY_DIR)
+        if not load_fixtures(fixtures_dir):
+            fixtures_dir = generate_fixtures(work_dir / 'fixtures')
+        data_dir = work_dir / 'data'
+
+        with ReplayServer(fixtures_dir, latency_ms, bandwidth_mb) as server, _override(
+            Config,
+            DATA_DIR=data_dir,
+            KNOWLEDGE_DIR=work_dir / 'knowledge',
+            CREATORS_FILE=work_dir / 'creators.json',
+            CATALOG_DB=data_dir / 'catalog.db',
+            TRANSCRIPT_CACHE_DB=data_dir / 'transcript_cache.db',
+            ASR_TASKS_DB=data_dir / 'asr_tasks.db',
+            RATE_LIMIT_DB=data_dir / 'rate_limit.db',
+            SEARCH_DB=data_dir / 'search.db',
+            REPLAY_DIR=fixtures_dir,
+            TIKHUB_API_URL=server.url,
+            TIKHUB_API_KEY='replay',
+            TRANSCRIBER='fake',
+        ), _override(catalog, _catalog=None), _override(transcript_cache, _cache=None), \
+                _override(rate_limiter, _limiter=None), _override(search_index, _index=None):
+            # 索引、缓存、限流器单例指向临时目录，结束后恢复
+            Config.ensure_dirs()
+            creator_config = CreatorConfig()
+            expected = 0
+            for sec_user_id, user in server.users.items():
+                creator_config.add(user['creator'], 'douyin', sec_user_id)
+                expected += len({
+                    item.get('aweme_id')
+                    for page in user['pages'][:Config.FETCH_MAX_PAGES]
+                    for item in page.get('aweme_list', [])
+                })
+            # 夹具里的视频可能很旧，放宽时间窗口
+            for creator in creator_config.get_all():
+                creator['days'] = 36500
+            creator_config._save()
+
+            start = time.monotonic()
+            CortexCore().run_once(force_check=True, concurrency=concurrency)
+            seconds = time.monotonic() - start
+
+            videos = list(data_dir.glob('*/*.mp4'))
+            size = sum(path.stat().st_size for path in videos)
+            return {
+                'creators': len(server.users),
+                'expected': expected,
+                'videos': len(videos),
+                'transcripts': len(list(data_dir.glob('*/*.txt'))),
+                'bytes': size,
+                'seconds': seconds,
+                'videos_per_s': len(videos) / seconds if seconds else 0.0,
+                'mb_per_s': size / 1024 / 1024 / seconds if seconds else 0.0,
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
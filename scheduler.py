@@ -1,18 +1,50 @@
 """定时调度和核心处理逻辑"""
+import asyncio
 import time
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from rich.console import Console
 from rich.progress import track
+from rich.table import Table
 
 from config import CreatorConfig, Config
-from platforms import get_adapter
-from storage import StorageManager
+from platforms import get_adapter, Video
+from storage import StorageManager, get_scratch_dir, cleanup_scratch
+from catalog import FILE_FIELDS
+from pipeline import Pipeline, Stage, Job
+from transcribers import TranscriberBackend, get_transcriber
+from transcript_cache import get_transcript_cache
+from quota import enforce_quota
+from http_client import get_session, close_async_client
 
 console = Console()
+# 并发模式下各创作者的过程输出不打印，最后统一输出汇总表
+_quiet_console = Console(quiet=True)
+
+
+@dataclass
+class CreatorSummary:
+    """单个创作者的处理汇总"""
+    name: str
+    platform: str
+    fetched: int = 0
+    new: int = 0
+    downloaded: int = 0
+    transcribed: int = 0
+    transcribe_failed: int = 0
+    failed: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    trimmed_seconds: float = 0.0
+    elapsed: float = 0.0
+    error: Optional[str] = None
 
 
 class CortexCore:
@@ -21,21 +53,30 @@ class CortexCore:
     def __init__(self):
         self.config = CreatorConfig()
         Config.ensure_dirs()
+        # 清理上次崩溃遗留的暂存文件
+        cleanup_scratch()
 
-    def process_creator(self, creator: dict, skip_transcribe: bool = False, transcribe_existing: bool = False):
+    def process_creator(self, creator: dict, skip_transcribe: bool = False, transcribe_existing: bool = False,
+                        quiet: bool = False, videos: Union[Tuple[List[Video], Optional[str]], Exception] = None
+                        ) -> 'CreatorSummary':
         """处理单个创作者
 
         Args:
             creator: 创作者配置
             skip_transcribe: 是否跳过转录
             transcribe_existing: 是否给已下载但未转录的视频补充转录
+            quiet: 不输出过程信息（并发模式下由汇总表统一展示）
+            videos: 已获取的 (视频列表, 截断处游标)（异步模式预先并发获取），None 时由本方法获取
+
+        Returns:
+            处理汇总
         """
         name = creator['name']
         platform = creator['platform']
-        creator_id = creator['id']
-        days = creator.get('days', 7)
+        out = _quiet_console if quiet else console
+        summary = CreatorSummary(name=name, platform=platform)
 
-        console.print(f"\n[bold cyan]🎯 处理创作者: {name}[/bold cyan]")
+        out.print(f"\n[bold cyan]🎯 处理创作者: {name}[/bold cyan]")
 
         # 初始化
         storage = StorageManager(name)
@@ -43,19 +84,31 @@ class CortexCore:
 
         # 如果是补充转录模式
         if transcribe_existing:
-            self._transcribe_existing_videos(storage, name, skip_transcribe)
-            return
-
-        # 获取视频列表
-        with console.status(f"[yellow]获取视频列表..."):
-            videos = adapter.fetch_videos(creator_id, count=50)
-
-        console.print(f"  获取到 {len(videos)} 个视频")
+            backend = self._get_transcriber(creator)
+            try:
+                self._transcribe_existing_videos(storage, name, skip_transcribe, out, summary, backend)
+            finally:
+                backend.close()
+            return summary
+
+        # 获取视频列表（增量模式：翻页直到遇到已知视频/超出时间窗口/低于高水位）
+        if videos is None:
+            with out.status(f"[yellow]获取视频列表..."):
+                videos = self._fetch_creator_videos(adapter, storage, creator)
+        elif isinstance(videos, Exception):
+            # 异步预获取失败
+            raise videos
+        videos, resume = videos
+
+        out.print(f"  获取到 {len(videos)} 个视频")
+        if resume:
+            out.print(f"  [dim]已达翻页上限 ({Config.FETCH_MAX_PAGES} 页)，更早的视频下次运行从截断处继续获取[/dim]")
+        summary.fetched = len(videos)
 
         # 显示最新视频的日期
         if videos:
             latest_date = max(v.create_time for v in videos)
-            console.print(f"  最新视频日期: {latest_date}")
+            out.print(f"  最新视频日期: {latest_date}")
 
         # 过滤新视频
         new_videos = []
@@ -66,137 +119,503 @@ class CortexCore:
             else:
                 existing_count += 1
 
-        console.print(f"  新视频: {len(new_videos)} 个 (已存在: {existing_count} 个)")
+        out.print(f"  新视频: {len(new_videos)} 个 (已存在: {existing_count} 个)")
+        summary.new = len(new_videos)
 
         if not new_videos:
-            console.print(f"  [dim]没有新视频，跳过[/dim]")
-            return
-
-        # 处理每个视频
-        for video in track(new_videos, description="处理视频"):
-            try:
-                # 1. 下载视频
-                temp_video_path = f"/tmp/{video.video_id}.mp4"
-                if not adapter.download_video(video, temp_video_path):
-                    console.print(f"    [red]✗[/red] {video.title[:30]} - 下载失败")
+            out.print(f"  [dim]没有新视频，跳过[/dim]")
+            self._advance_high_water(storage, videos, [], resume)
+            self.config.update_last_check(name)
+            return summary
+
+        # 处理每个视频：下载 → 提取音频 → 上传 → 转写 分阶段流水线并发
+        failed_videos = []
+        backend = None if skip_transcribe else self._get_transcriber(creator)
+        ingest = creator.get('ingest', Config.INGEST_MODE)
+        try:
+            pipeline = self._build_pipeline(adapter, storage, backend, ingest)
+            jobs = pipeline.process(new_videos)
+            for job in track(jobs, total=len(new_videos), description="处理视频", console=out, disable=quiet):
+                video = job.item
+                if 'video_path' not in job.data:
+                    out.print(f"    [red]✗[/red] {video.title[:30]} - {str(job.error)[:40]}")
+                    failed_videos.append(video)
                     continue
 
-                # 2. 保存视频
-                import shutil
-                final_path = storage.save_video(video.video_id, temp_video_path, video.create_time)
-
-                # 3. 转录（如果未跳过）
-                transcription_text = None
-                if not skip_transcribe:
-                    try:
-                        from transcriber import transcribe_video
-                        transcription_text = transcribe_video(str(final_path))
+                if 'cache_hit' in job.data:
+                    if job.data['cache_hit']:
+                        summary.cache_hits += 1
+                    else:
+                        summary.cache_misses += 1
+                        if job.data.get('transcript') and not backend.writes_cache:
+                            get_transcript_cache().put(job.data['cache_key'], job.data['transcript'])
+
+                try:
+                    # 转写失败不影响视频和元数据保存
+                    transcription_text = job.data.get('transcript')
+                    if job.error:
+                        out.print(f"    [yellow]⚠[/yellow] {video.title[:30]} - 转写失败: {str(job.error)[:30]}")
+                        summary.transcribe_failed += 1
+                    elif transcription_text:
                         storage.save_transcript(video.video_id, transcription_text, video.create_time)
-                    except Exception as e:
-                        console.print(f"    [yellow]⚠[/yellow] {video.title[:30]} - 转写失败: {str(e)[:30]}")
-
-                # 4. 保存元数据
-                storage.save_metadata(video.video_id, {
-                    'video_id': video.video_id,
-                    'title': video.title,
-                    'author': video.author,
-                    'create_time': video.create_time,
-                    'platform': video.platform,
-                    'share_url': video.share_url,
-                    'statistics': video.statistics,
-                    'downloaded_at': datetime.now().isoformat(),
-                    'file_size': Path(temp_video_path).stat().st_size,
-                    'transcribed': transcription_text is not None
-                })
-
-                status = f"{'+' + str(len(transcription_text)) + '字' if transcription_text else '视频'}"
-                console.print(f"    [green]✓[/green] {video.title[:40]} [{status}]")
-
-                # 清理临时文件
-                Path(temp_video_path).unlink(missing_ok=True)
-
-            except Exception as e:
-                console.print(f"    [red]✗[/red] {video.title[:30]} - {str(e)[:40]}")
+                        summary.transcribed += 1
+
+                    # 静音裁剪：记录裁掉的时长和保留区间（用于把时间戳映射回原视频）
+                    offset_map = job.data.get('offset_map')
+                    if offset_map:
+                        summary.trimmed_seconds += offset_map.removed_seconds
+
+                    # 保存元数据
+                    metadata = {
+                        'video_id': video.video_id,
+                        'title': video.title,
+                        'author': video.author,
+                        'create_time': video.create_time,
+                        'platform': video.platform,
+                        'share_url': video.share_url,
+                        'statistics': video.statistics,
+                        'downloaded_at': datetime.now().isoformat(),
+                        'file_size': job.data['file_size'],
+                        'transcribed': transcription_text is not None
+                    }
+                    if ingest == 'audio':
+                        metadata['ingest'] = 'audio'
+                    if offset_map:
+                        metadata['vad'] = {
+                            'removed_seconds': round(offset_map.removed_seconds, 2),
+                            'segments': [[round(start, 2), round(end, 2)] for start, end in offset_map.segments],
+                        }
+                    storage.save_metadata(video.video_id, metadata)
+
+                    status = f"{'+' + str(len(transcription_text)) + '字' if transcription_text else '视频'}"
+                    if offset_map and offset_map.removed_seconds >= 1:
+                        status += f", 裁剪 {offset_map.removed_seconds:.0f}s"
+                    out.print(f"    [green]✓[/green] {video.title[:40]} [{status}]")
+                    summary.downloaded += 1
+
+                except Exception as e:
+                    out.print(f"    [red]✗[/red] {video.title[:30]} - {str(e)[:40]}")
+                    failed_videos.append(video)
+        finally:
+            if backend:
+                backend.close()
+        self._advance_high_water(storage, videos, failed_videos, resume)
+        # 元数据日志中旧版本行过多时后台压缩
+        storage.maybe_compact_metadata()
+        self._enforce_quota(storage, out)
+        summary.failed = len(failed_videos)
+        if summary.cache_hits or summary.cache_misses:
+            out.print(f"  转写缓存: 命中 {summary.cache_hits} / 未命中 {summary.cache_misses}")
+        if summary.trimmed_seconds:
+            out.print(f"  静音裁剪: 共裁掉 {summary.trimmed_seconds:.0f}s")
 
         # 更新最后检查时间
         self.config.update_last_check(name)
-        console.print(f"[green]✓ 完成[/green]")
+        out.print(f"[green]✓ 完成[/green]")
+        return summary
 
-    def _transcribe_existing_videos(self, storage, name: str, skip_transcribe: bool):
-        """给已下载但未转录的视频补充转录"""
-        import shutil
-        from transcriber import transcribe_video
+    def _fetch_creator_videos(self, adapter, storage: StorageManager, creator: dict
+                              ) -> Tuple[List[Video], Optional[str]]:
+        """按抓取模式获取视频列表
 
-        # 找出已下载但未转录的视频
+        Returns:
+            (视频列表, 截断处游标)；增量模式因翻页上限停止时返回游标，否则为 None
+        """
+        if creator.get('fetch_mode', Config.FETCH_MODE) == 'incremental':
+            return adapter.fetch_new_videos(
+                creator['id'],
+                is_known=storage.exists,
+                days=creator.get('days', 7),
+                since=storage.get_high_water(),
+                page_size=Config.FETCH_PAGE_SIZE,
+                max_pages=Config.FETCH_MAX_PAGES,
+                resume=storage.get_resume_cursor(),
+                retry_since=min(storage.get_retry().values(), default=None),
+            )
+        return adapter.fetch_videos(creator['id'], count=50), None
+
+    async def _afetch_creator_videos(self, adapter, storage: StorageManager, creator: dict
+                                     ) -> Tuple[List[Video], Optional[str]]:
+        """按抓取模式异步获取视频列表（返回值同 _fetch_creator_videos）"""
+        if creator.get('fetch_mode', Config.FETCH_MODE) == 'incremental':
+            return await adapter.afetch_new_videos(
+                creator['id'],
+                is_known=storage.exists,
+                days=creator.get('days', 7),
+                since=storage.get_high_water(),
+                page_size=Config.FETCH_PAGE_SIZE,
+                max_pages=Config.FETCH_MAX_PAGES,
+                resume=storage.get_resume_cursor(),
+                retry_since=min(storage.get_retry().values(), default=None),
+            )
+        return await adapter.afetch_videos(creator['id'], count=50), None
+
+    async def afetch_all(self, creators: List[dict], concurrency: int
+                         ) -> Dict[str, Union[Tuple[List[Video], Optional[str]], Exception]]:
+        """在一个事件循环中并发获取所有创作者的视频列表（全局并发上限 + 按平台并发上限）
+
+        Returns:
+            {创作者名称: (视频列表, 截断处游标) 或 获取失败的异常}
+        """
+        limit = asyncio.Semaphore(concurrency)
+        platform_limits = {
+            platform: asyncio.Semaphore(n)
+            for platform, n in Config.PLATFORM_CONCURRENCY.items()
+        }
+
+        async def fetch(creator: dict) -> Tuple[List[Video], Optional[str]]:
+            platform_limit = platform_limits.get(creator['platform'])
+            async with limit, platform_limit or contextlib.nullcontext():
+                adapter = get_adapter(creator['platform'], creator)
+                return await self._afetch_creator_videos(adapter, StorageManager(creator['name']), creator)
+
+        try:
+            results = await asyncio.gather(*(fetch(c) for c in creators), return_exceptions=True)
+        finally:
+            await close_async_client()
+        return {creator['name']: result for creator, result in zip(creators, results)}
+
+    def _build_pipeline(self, adapter, storage: StorageManager, backend: Optional[TranscriberBackend],
+                        ingest: str = 'video') -> Pipeline:
+        """构建 下载 → (提取音频 → 上传 → 转写) 流水线
+
+        ingest 为 audio 时只下载纯音频流（没有时为最低码率视频），直接交给转写。
+        """
+
+        def download_audio(job: Job):
+            video = job.item
+            path = adapter.download_audio(video, str(get_scratch_dir() / video.video_id))
+            if not path:
+                raise Exception("下载失败")
+            path = Path(path)
+            try:
+                job.data['file_size'] = path.stat().st_size
+                if FILE_FIELDS.get(path.suffix) == 'audio_file':
+                    job.data['video_path'] = storage.save_audio(video.video_id, str(path), video.create_time)
+                else:
+                    job.data['video_path'] = storage.save_video(video.video_id, str(path), video.create_time)
+            finally:
+                path.unlink(missing_ok=True)
+
+        def download(job: Job):
+            video = job.item
+            # 下载到与创作者目录同一文件系统的暂存目录，完成后直接改名移入（不复制）
+            temp_video_path = get_scratch_dir() / f"{video.video_id}.mp4"
+            try:
+                if not adapter.download_video(video, str(temp_video_path)):
+                    raise Exception("下载失败")
+                job.data['file_size'] = temp_video_path.stat().st_size
+                job.data['video_path'] = storage.save_video(video.video_id, str(temp_video_path), video.create_time)
+            finally:
+                # 清理临时文件（未完成的 .part 保留用于续传）
+                temp_video_path.unlink(missing_ok=True)
+
+        stages = [Stage('download', download_audio if ingest == 'audio' else download,
+                        Config.PIPELINE_DOWNLOAD_WORKERS)]
+        if backend:
+            stages += self._transcription_stages(backend)
+        return Pipeline(stages, queue_size=Config.PIPELINE_QUEUE_SIZE)
+
+    def _transcription_stages(self, backend: TranscriberBackend) -> List[Stage]:
+        """转写阶段：查缓存 → 转写引擎各阶段（读取 job.data['video_path']，写入 job.data['transcript']）"""
+        from audio import audio_fingerprint
+        cache = get_transcript_cache() if backend.cacheable else None
+        stages = backend.stages()
+
+        def lookup_cache(job: Job):
+            job.data['cache_key'] = f"{backend.name}:{audio_fingerprint(Path(job.data['video_path']))}"
+            cached = cache.get(job.data['cache_key'])
+            job.data['cache_hit'] = cached is not None
+            if cached is not None:
+                job.data['transcript'] = cached
+                job.finished = True
+
+        if cache:
+            # 命中缓存的视频在此阶段直接完成，不再进入转写引擎
+            stages.insert(0, Stage('cache', lookup_cache, Config.PIPELINE_EXTRACT_WORKERS))
+        return stages
+
+    def _get_transcriber(self, creator: dict) -> TranscriberBackend:
+        """获取创作者使用的转写引擎（creator['transcriber'] 优先，默认 Config.TRANSCRIBER）"""
+        return get_transcriber(creator.get('transcriber', Config.TRANSCRIBER), creator)
+
+    def _advance_high_water(self, storage: StorageManager, videos: List, failed_videos: List,
+                            resume: Optional[str] = None):
+        """推进抓取高水位，记录待重试的失败视频
+
+        有失败的视频时，高水位只推进到最早失败的那个，并记入重试列表：下次翻页越过比它新的已知视频，
+        直到翻到它为止（否则停在已保存的视频上，再也翻不到下面的失败视频）。
+        翻页因上限截断（resume 为截断处游标）时保存游标、不推进：更早的视频还没获取，推进后会被当作已处理跳过。
+        """
+        storage.set_resume_cursor(resume)
+        # 上次的重试项：本次没翻到且翻页被截断的继续保留；已翻过它的位置仍没出现的（已删除、超出窗口）不再重试
+        fetched = {v.video_id for v in videos}
+        retry = {video_id: create_time for video_id, create_time in storage.get_retry().items()
+                 if resume and video_id not in fetched}
+        retry.update({v.video_id: v.create_time for v in failed_videos if not v.pinned})
+        storage.set_retry(retry)
+        if resume:
+            return
+        timeline = [v for v in videos if not v.pinned]
+        failed_timeline = [v for v in failed_videos if not v.pinned]
+        if failed_timeline:
+            storage.set_high_water(min(v.create_time for v in failed_timeline))
+        elif timeline:
+            storage.set_high_water(max(v.create_time for v in timeline))
+
+    def _transcribe_existing_videos(self, storage, name: str, skip_transcribe: bool,
+                                    out: Console, summary: 'CreatorSummary', backend: TranscriberBackend):
+        """给已下载但未转录的视频补充转录"""
+        # 找出已下载但未转录的视频（索引查询）
         videos_to_transcribe = []
-        for video_file in storage.get_creator_dir().glob("*.mp4"):
-            video_id = video_file.stem
-            if not storage.has_transcript(video_id):
-                # 读取元数据获取标题
-                metadata = storage.get_metadata(video_id)
-                title = metadata.get('title', video_id) if metadata else video_id
-                videos_to_transcribe.append({
-                    'video_id': video_id,
-                    'path': video_file,
-                    'title': title
-                })
+        for record in storage.list_untranscribed():
+            video_id = record['video_id']
+            # 读取元数据获取标题
+            metadata = storage.get_metadata(video_id)
+            title = metadata.get('title', video_id) if metadata else video_id
+            videos_to_transcribe.append({
+                'video_id': video_id,
+                'path': record['path'],
+                'title': title
+            })
 
         if not videos_to_transcribe:
-            console.print(f"  [dim]没有需要转录的视频[/dim]")
+            out.print(f"  [dim]没有需要转录的视频[/dim]")
             return
 
-        console.print(f"  需要转录: {len(videos_to_transcribe)} 个视频")
+        out.print(f"  需要转录: {len(videos_to_transcribe)} 个视频")
+        summary.new = len(videos_to_transcribe)
 
-        for video_info in track(videos_to_transcribe, description="转录中"):
-            try:
-                if not skip_transcribe:
-                    transcription_text = transcribe_video(str(video_info['path']))
+        if skip_transcribe:
+            for video_info in videos_to_transcribe:
+                out.print(f"    [dim]⊘[/dim] {video_info['title'][:40]} [跳过]")
+        else:
+            # 批量转录（百炼：并行上传，多个文件合并为一个识别任务）
+            stats = {}
+            with out.status(f"[yellow]批量转录 {len(videos_to_transcribe)} 个视频..."):
+                results = backend.transcribe_many(
+                    [str(info['path']) for info in videos_to_transcribe],
+                    stats=stats,
+                )
+            summary.cache_hits = stats.get('hits', 0)
+            summary.cache_misses = stats.get('misses', 0)
+            summary.trimmed_seconds = stats.get('trimmed_seconds', 0.0)
+
+            for video_info in videos_to_transcribe:
+                try:
+                    transcription_text = results.get(str(video_info['path']), Exception("无转录结果"))
+                    if isinstance(transcription_text, Exception):
+                        raise transcription_text
                     storage.save_transcript(video_info['video_id'], transcription_text)
-                    console.print(f"    [green]✓[/green] {video_info['title'][:40]} [+{len(transcription_text)}字]")
-                else:
-                    console.print(f"    [dim]⊘[/dim] {video_info['title'][:40]} [跳过]")
-            except Exception as e:
-                console.print(f"    [red]✗[/red] {video_info['title'][:30]} - {str(e)[:30]}")
+                    out.print(f"    [green]✓[/green] {video_info['title'][:40]} [+{len(transcription_text)}字]")
+                    summary.transcribed += 1
+                except Exception as e:
+                    out.print(f"    [red]✗[/red] {video_info['title'][:30]} - {str(e)[:30]}")
+                    summary.transcribe_failed += 1
+
+            if summary.cache_hits or summary.cache_misses:
+                out.print(f"  转写缓存: 命中 {summary.cache_hits} / 未命中 {summary.cache_misses}")
+            if summary.trimmed_seconds:
+                out.print(f"  静音裁剪: 共裁掉 {summary.trimmed_seconds:.0f}s")
+            self._enforce_quota(storage, out)
 
         self.config.update_last_check(name)
-        console.print(f"[green]✓ 完成[/green]")
+        out.print(f"[green]✓ 完成[/green]")
 
-    def run_once(self, skip_transcribe: bool = False, transcribe_existing: bool = False, force_check: bool = False):
+    def _enforce_quota(self, storage: StorageManager, out: Console):
+        """磁盘配额：本批处理完成后检查该创作者和全局预算，超出时淘汰已处理的视频"""
+        report = enforce_quota(storage.creator_key)
+        if not report:
+            return
+        if report['done']:
+            transcoded = sum(1 for e in report['done'] if e.action == 'audio')
+            out.print(f"  磁盘配额: 删除 {len(report['done']) - transcoded} 个视频, 转为音频 {transcoded} 个, "
+                      f"释放 {report['freed'] / 1024 / 1024:.1f}MB")
+        for error in report['errors'][:3]:
+            out.print(f"    [yellow]⚠[/yellow] 配额淘汰失败: {error[:60]}")
+
+    def run_once(self, skip_transcribe: bool = False, transcribe_existing: bool = False, force_check: bool = False,
+                 concurrency: int = None, use_async: bool = None):
         """运行一次所有创作者
 
         Args:
             skip_transcribe: 是否跳过转录
             transcribe_existing: 是否给已下载但未转录的视频补充转录
             force_check: 是否强制检查（忽略时间间隔）
+            concurrency: 同时处理的创作者数（默认 Config.RUN_CONCURRENCY，>1 时并发并输出汇总表）
+            use_async: 先在一个事件循环中并发获取所有创作者的视频列表（默认 Config.RUN_ASYNC）
+
+        Returns:
+            各创作者的处理汇总（处理失败的创作者 error 不为空）
         """
+        concurrency = concurrency or Config.RUN_CONCURRENCY
+        use_async = Config.RUN_ASYNC if use_async is None else use_async
         creators = self.config.get_enabled()
 
         if not creators:
             console.print("[yellow]没有启用的创作者[/yellow]")
-            return
+            return []
 
         if force_check:
             console.print(f"\n[bold]Cortex - 强制检查 {len(creators)} 个创作者[/bold]")
         else:
             console.print(f"\n[bold]Cortex - 处理 {len(creators)} 个创作者[/bold]")
 
+        # 检查是否需要更新（除非强制检查）
+        due_creators = []
         for creator in creators:
-            # 检查是否需要更新（除非强制检查）
-            if not force_check:
-                # 检查时间间隔
-                last_check = creator.get('last_check')
-                if last_check:
-                    from datetime import datetime, timedelta
-                    last_time = datetime.fromisoformat(last_check)
-                    interval = timedelta(hours=creator.get('interval_hours', 48))
-                    if datetime.now() - last_time < interval:
-                        console.print(f"\n🎯 处理创作者: {creator['name']}")
-                        console.print(f"  [dim]距离上次检查不足 {creator.get('interval_hours', 48)} 小时，跳过[/dim]")
-                        continue
-
-            self.process_creator(creator, skip_transcribe, transcribe_existing)
-
+            if not force_check and not self._is_due(creator):
+                if concurrency <= 1:
+                    console.print(f"\n🎯 处理创作者: {creator['name']}")
+                    console.print(f"  [dim]距离上次检查不足 {creator.get('interval_hours', 48)} 小时，跳过[/dim]")
+                continue
+            due_creators.append(creator)
+
+        http_before = get_session().connection_stats()
+        prefetched = {}
+        if use_async and not transcribe_existing and due_creators:
+            with console.status(f"[yellow]并发获取 {len(due_creators)} 个创作者的视频列表..."):
+                prefetched = asyncio.run(self.afetch_all(due_creators, Config.FETCH_CONCURRENCY))
+
+        if concurrency > 1:
+            summaries = self._run_concurrent(due_creators, skip_transcribe, transcribe_existing, concurrency,
+                                             prefetched)
+            self._print_summary(summaries, skipped=len(creators) - len(due_creators))
+        else:
+            summaries = []
+            for creator in due_creators:
+                summary = self._process_isolated(creator, skip_transcribe, transcribe_existing,
+                                                 videos=prefetched.get(creator['name']))
+                if summary.error:
+                    console.print(f"  [red]✗ 处理失败: {summary.error[:80]}[/red]")
+                summaries.append(summary)
+
+        self._print_http_stats(http_before)
         console.print("\n[bold green]✓ 全部完成[/bold green]")
+        return summaries
+
+    def _process_isolated(self, creator: dict, skip_transcribe: bool, transcribe_existing: bool,
+                          quiet: bool = False, videos: Union[Tuple[List[Video], Optional[str]], Exception] = None
+                          ) -> CreatorSummary:
+        """处理单个创作者，失败时记入汇总而不是抛出（一个创作者失败不影响其他创作者）"""
+        start = time.monotonic()
+        try:
+            summary = self.process_creator(creator, skip_transcribe, transcribe_existing, quiet=quiet, videos=videos)
+        except Exception as e:
+            summary = CreatorSummary(name=creator['name'], platform=creator['platform'], error=str(e))
+        summary.elapsed = time.monotonic() - start
+        return summary
+
+    def _is_due(self, creator: dict) -> bool:
+        """距离上次检查是否已超过间隔"""
+        last_check = creator.get('last_check')
+        if not last_check:
+            return True
+        from datetime import timedelta
+        last_time = datetime.fromisoformat(last_check)
+        interval = timedelta(hours=creator.get('interval_hours', 48))
+        return datetime.now() - last_time >= interval
+
+    def _run_concurrent(self, creators: List[dict], skip_transcribe: bool, transcribe_existing: bool,
+                        concurrency: int, prefetched: Dict[str, Union[Tuple[List[Video], Optional[str]], Exception]] = None
+                        ) -> List[CreatorSummary]:
+        """并发处理多个创作者：全局并发上限 + 按平台并发上限（控制 API 配额）"""
+        prefetched = prefetched or {}
+        platform_limits = {
+            platform: threading.Semaphore(limit)
+            for platform, limit in Config.PLATFORM_CONCURRENCY.items()
+        }
+
+        def run(creator: dict) -> CreatorSummary:
+            limit = platform_limits.get(creator['platform'])
+            with limit or contextlib.nullcontext():
+                return self._process_isolated(creator, skip_transcribe, transcribe_existing, quiet=True,
+                                              videos=prefetched.get(creator['name']))
+
+        summaries = []
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="creator") as pool:
+            futures = [pool.submit(run, creator) for creator in creators]
+            with console.status(f"[yellow]并发处理中 (并发 {concurrency})...") as status:
+                for future in as_completed(futures):
+                    summaries.append(future.result())
+                    status.update(f"[yellow]并发处理中 (并发 {concurrency})... {len(summaries)}/{len(creators)}")
+
+        summaries.sort(key=lambda x: x.name)
+        return summaries
+
+    def _print_summary(self, summaries: List[CreatorSummary], skipped: int = 0):
+        """输出汇总表"""
+        table = Table(title="运行汇总")
+        table.add_column("创作者", style="cyan")
+        table.add_column("平台", style="green")
+        table.add_column("获取", justify="right")
+        table.add_column("新视频", justify="right")
+        table.add_column("下载", justify="right")
+        table.add_column("转写", justify="right")
+        table.add_column("失败", justify="right", style="red")
+        table.add_column("缓存命中", justify="right")
+        table.add_column("裁剪", justify="right")
+        table.add_column("耗时", justify="right")
+        table.add_column("状态")
+
+        for s in summaries:
+            status = f"[red]✗ {s.error[:40]}[/red]" if s.error else "[green]✓[/green]"
+            table.add_row(
+                s.name,
+                s.platform,
+                str(s.fetched),
+                str(s.new),
+                str(s.downloaded),
+                f"{s.transcribed}" + (f" (失败 {s.transcribe_failed})" if s.transcribe_failed else ""),
+                str(s.failed),
+                f"{s.cache_hits}/{s.cache_hits + s.cache_misses}",
+                f"{s.trimmed_seconds:.0f}s",
+                f"{s.elapsed:.1f}s",
+                status,
+            )
+
+        console.print()
+        console.print(table)
+
+        errors = sum(1 for s in summaries if s.error)
+        console.print(
+            f"  创作者: {len(summaries)} 个处理, {skipped} 个未到检查时间, {errors} 个出错 | "
+            f"新视频 {sum(s.new for s in summaries)} | 下载 {sum(s.downloaded for s in summaries)} | "
+            f"转写 {sum(s.transcribed for s in summaries)} | 失败 {sum(s.failed for s in summaries)} | "
+            f"缓存命中 {sum(s.cache_hits for s in summaries)}/"
+            f"{sum(s.cache_hits + s.cache_misses for s in summaries)} | "
+            f"裁剪 {sum(s.trimmed_seconds for s in summaries):.0f}s"
+        )
+
+    def _print_http_stats(self, before: dict):
+        """输出本次运行各主机的请求数、新建连接数（握手次数）、重试和错误"""
+        rows = []
+        for host, stats in get_session().connection_stats().items():
+            prev = before.get(host, {})
+            delta = {key: value - prev.get(key, 0) for key, value in stats.items()}
+            if delta.get('requests'):
+                rows.append((host, delta))
+        if not rows:
+            return
+
+        table = Table(title="HTTP 连接")
+        table.add_column("主机", style="cyan")
+        table.add_column("请求", justify="right")
+        table.add_column("新建连接", justify="right")
+        table.add_column("重试", justify="right", style="yellow")
+        table.add_column("错误", justify="right", style="red")
+        table.add_column("平均耗时", justify="right")
+        for host, delta in sorted(rows, key=lambda row: -row[1]['requests']):
+            table.add_row(
+                host,
+                str(int(delta['requests'])),
+                str(int(delta.get('connections', 0))),
+                str(int(delta['retries'])),
+                str(int(delta['errors'])),
+                f"{delta['seconds'] / delta['requests']:.2f}s",
+            )
+        console.print()
+        console.print(table)
 
 
 class CortexScheduler:
@@ -0,0 +1,188 @@
+"""转录全文检索模块 - SQLite FTS5 倒排索引，中文按二元组（bigram）切分"""
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+# 连续的中日韩字符 / 连续的字母数字
+_CJK_RUN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3040-\u30ff\uac00-\ud7af]+')
+_WORD = re.compile(r'[0-9a-z]+')
+_TOKEN = re.compile(_CJK_RUN.pattern + '|' + _WORD.pattern)
+
+
+def _bigrams(run: str, tail: bool = False) -> List[str]:
+    """重叠二元组；tail 时末尾再加最后一个字（每个字都是某个词元的开头，单字可按前缀匹配）"""
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) if tail else len(run) - 1)]
+
+
+def tokenize(text: str) -> str:
+    """切分为空格分隔的词元：中文连续片段切成重叠的二元组，英文数字按词（小写）"""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        run = match.group()
+        tokens += _bigrams(run, tail=True) if _CJK_RUN.fullmatch(run) else [run]
+    return ' '.join(tokens)
+
+
+def build_query(query: str) -> Optional[str]:
+    """把用户输入转成 FTS5 查询：每个词的二元组组成短语（即子串匹配），多个词之间为 AND
+
+    单个汉字按前缀匹配以它开头的二元组。
+    """
+    terms = []
+    for match in _TOKEN.finditer(query.lower()):
+        run = match.group()
+        if _CJK_RUN.fullmatch(run) and len(run) == 1:
+            terms.append(f'"{run}"*')
+        elif _CJK_RUN.fullmatch(run):
+            terms.append('"' + ' '.join(_bigrams(run)) + '"')
+        else:
+            terms.append(f'"{run}"')
+    return ' AND '.join(terms) or None
+
+
+def make_snippet(text: str, query: str, width: int = 40) -> str:
+    """截取第一个命中词附近的片段，命中词用 rich 标记高亮"""
+    terms = [t for t in re.split(r'\s+', query.strip()) if t]
+    lowered = text.lower()
+    positions = [(lowered.find(t.lower()), t) for t in terms]
+    positions = [(pos, t) for pos, t in positions if pos >= 0]
+    if not positions:
+        return text[:width * 2].replace('\n', ' ')
+    pos, _ = min(positions)
+    start = max(0, pos - width)
+    snippet = text[start:pos + width].replace('\n', ' ').replace('[', r'\[')
+    for term in terms:
+        snippet = re.sub(re.escape(term), lambda m: f"[bold yellow]{m.group()}[/bold yellow]", snippet,
+                         flags=re.IGNORECASE)
+    return ('…' if start else '') + snippet + ('…' if pos + width < len(text) else '')
+
+
+class SearchIndex:
+    """转录全文索引 - 转录保存时增量写入，按 BM25 排序，可按创作者 / 日期过滤"""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path or Config.SEARCH_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    creator TEXT NOT NULL,
+                    creator_key TEXT NOT NULL,
+                    video_id TEXT NOT NULL,
+                    title TEXT,
+                    create_time TEXT,
+                    transcript_file TEXT,
+                    updated_at TEXT,
+                    UNIQUE (creator_key, video_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_docs_creator ON docs (creator, create_time);
+                CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(tokens);
+            """)
+
+    def add(self, creator: str, creator_key: str, video_id: str, text: str, create_time: str = None,
+            transcript_file: str = None, title: str = None):
+        """写入/更新一个视频的转录"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, title FROM docs WHERE creator_key = ? AND video_id = ?", (creator_key, video_id)
+            ).fetchone()
+            if row:
+                doc_id = row['id']
+                self._conn.execute(
+                    "UPDATE docs SET creator = ?, title = ?, create_time = COALESCE(?, create_time), "
+                    "transcript_file = COALESCE(?, transcript_file), updated_at = ? WHERE id = ?",
+                    (creator, title or row['title'], create_time, transcript_file,
+                     datetime.now().isoformat(), doc_id)
+                )
+                self._conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (doc_id,))
+            else:
+                doc_id = self._conn.execute(
+                    "INSERT INTO docs (creator, creator_key, video_id, title, create_time, transcript_file, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (creator, creator_key, video_id, title, create_time, transcript_file, datetime.now().isoformat())
+                ).lastrowid
+            self._conn.execute("INSERT INTO docs_fts (rowid, tokens) VALUES (?, ?)", (doc_id, tokenize(text)))
+
+    def set_title(self, creator_key: str, video_id: str, title: str):
+        """更新标题（元数据在转录之后保存）"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE docs SET title = ? WHERE creator_key = ? AND video_id = ?", (title, creator_key, video_id)
+            )
+
+    def remove_creator(self, creator_key: str):
+        """删除一个创作者的全部索引（重建前调用）"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE creator_key = ?)", (creator_key,)
+            )
+            self._conn.execute("DELETE FROM docs WHERE creator_key = ?", (creator_key,))
+
+    def search(self, query: str, creator: str = None, since: str = None, until: str = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """全文检索
+
+        Args:
+            query: 关键词，多个词用空格分隔（同时包含）
+            creator: 只查该创作者
+            since: 起始日期（YYYY-MM-DD，含）
+            until: 结束日期（YYYY-MM-DD，含）
+            limit: 最多返回条数
+
+        Returns:
+            [{'creator', 'creator_key', 'video_id', 'title', 'create_time', 'transcript_file', 'score'}]，
+            按相关度从高到低
+        """
+        match = build_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT d.creator, d.creator_key, d.video_id, d.title, d.create_time, d.transcript_file, "
+            "bm25(docs_fts) AS score FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+            "WHERE docs_fts MATCH ?"
+        )
+        params: list = [match]
+        if creator:
+            sql += " AND d.creator = ?"
+            params.append(creator)
+        if since:
+            sql += " AND substr(d.create_time, 1, 10) >= ?"
+            params.append(since)
+        if until:
+            sql += " AND substr(d.create_time, 1, 10) <= ?"
+            params.append(until)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """获取进程内共享的检索索引"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+        return _index
@@ -1,13 +1,103 @@
 """存储管理模块"""
+import errno
 import json
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
 from config import Config, CreatorConfig
+from catalog import get_catalog
+from metadata_log import MetadataLog, LOG_NAME
+from search_index import get_search_index
+
+# Linux FICLONE ioctl：写时复制克隆文件（btrfs / xfs 等支持 reflink 的文件系统）
+FICLONE = 0x40049409
+
+
+def get_scratch_dir() -> Path:
+    """下载暂存目录（默认在 DATA_DIR 下，与创作者目录同一文件系统，完成后直接改名移入）"""
+    scratch_dir = Path(Config.SCRATCH_DIR or Config.DATA_DIR / ".scratch")
+    scratch_dir.mkdir(parents=True, exist_ok=True)
+    return scratch_dir
+
+
+def cleanup_scratch(ttl_hours: float = None) -> int:
+    """清理暂存目录中崩溃遗留的文件（未完成的 .part 在 TTL 内保留用于断点续传）
+
+    Returns:
+        删除的文件数
+    """
+    ttl_hours = Config.SCRATCH_TTL_HOURS if ttl_hours is None else ttl_hours
+    cutoff = time.time() - ttl_hours * 3600
+    removed = 0
+    for path in get_scratch_dir().iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """尝试 reflink 克隆（不复制数据块），不支持时返回 False"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, 'rb') as s, open(dest, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def place_file(src: Path, dest: Path, keep_source: bool = False) -> Path:
+    """把文件放到目标位置，尽量不复制数据
+
+    移动：同一文件系统直接 os.replace（原子改名），跨文件系统时复制后删除源文件。
+    保留源文件：依次尝试硬链接、reflink，都不支持时才复制。
+    复制都先写到目标目录的临时文件再 os.replace，目标位置不会出现写了一半的文件。
+    """
+    src, dest = Path(src), Path(dest)
+    if not keep_source:
+        try:
+            os.replace(src, dest)
+            return dest
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+    else:
+        try:
+            dest.unlink(missing_ok=True)
+            os.link(src, dest)
+            return dest
+        except OSError:
+            pass
+
+    temp = dest.with_name(f".{dest.name}.tmp")
+    try:
+        if not _reflink(src, temp):
+            shutil.copyfile(src, temp)
+        os.replace(temp, dest)
+    finally:
+        temp.unlink(missing_ok=True)
+    if not keep_source:
+        src.unlink(missing_ok=True)
+    return dest
 
 
 class StorageManager:
-    """存储管理器 - 使用视频ID作为文件名，天然去重"""
+    """存储管理器 - 使用视频ID作为文件名，天然去重
+
+    文件查找走 SQLite 索引（catalog.db），不再逐次 glob 扫描目录。
+    """
 
     def __init__(self, creator_name: str):
         self.creator_name = creator_name
@@ -15,6 +105,13 @@ class StorageManager:
         creator_config = CreatorConfig()
         self.creator_dir = creator_config.get_creator_dir(creator_name)
         self.creator_dir.mkdir(parents=True, exist_ok=True)
+        # 索引以目录名为键；首次使用时从现有文件建立索引
+        self.creator_key = self.creator_dir.name
+        self.catalog = get_catalog()
+        # 元数据追加写入每个创作者一个 metadata.jsonl
+        self.metadata_log = MetadataLog(self.creator_dir)
+        if not self.catalog.is_indexed(self.creator_key):
+            self.reindex()
 
     def _get_filename(self, video_id: str, create_time: str = None) -> str:
         """生成文件名（带日期前缀）
@@ -36,62 +133,275 @@ class StorageManager:
                 pass
         return video_id
 
+    def _base_name(self, video_id: str, create_time: str = None) -> str:
+        """文件名：优先沿用索引中已有的文件名，保证同一视频的文件同名"""
+        if not create_time:
+            record = self.catalog.get(self.creator_key, video_id)
+            if record:
+                return record['base_name']
+        return self._get_filename(video_id, create_time)
+
+    def _indexed_path(self, video_id: str, field: str) -> Optional[Path]:
+        """从索引获取文件路径"""
+        record = self.catalog.get(self.creator_key, video_id)
+        if record and record[field]:
+            return self.creator_dir / record[field]
+        return None
+
     def exists(self, video_id: str) -> bool:
         """检查视频是否已处理"""
-        return len(list(self.creator_dir.glob(f"*_{video_id}.*"))) > 0
+        return self.catalog.exists(self.creator_key, video_id)
 
-    def save_video(self, video_id: str, video_path: str, create_time: str = None) -> Path:
-        """保存视频文件"""
-        import shutil
-        filename = self._get_filename(video_id, create_time)
+    def save_video(self, video_id: str, video_path: str, create_time: str = None, keep_source: bool = False) -> Path:
+        """保存视频文件（默认移入创作者目录，源文件应在 get_scratch_dir() 中以便直接改名）"""
+        filename = self._base_name(video_id, create_time)
         dest = self.creator_dir / f"{filename}.mp4"
-        shutil.copy(video_path, dest)
+        place_file(Path(video_path), dest, keep_source=keep_source)
+        self.catalog.upsert(self.creator_key, video_id, filename, create_time, video_file=dest.name,
+                            video_size=dest.stat().st_size)
+        return dest
+
+    def save_audio(self, video_id: str, audio_path: str, create_time: str = None, keep_source: bool = False) -> Path:
+        """保存音频文件（扩展名沿用源文件，如 .ogg / .mp3）"""
+        audio_path = Path(audio_path)
+        filename = self._base_name(video_id, create_time)
+        dest = self.creator_dir / f"{filename}{audio_path.suffix}"
+        place_file(audio_path, dest, keep_source=keep_source)
+        self.catalog.upsert(self.creator_key, video_id, filename, create_time, audio_file=dest.name,
+                            audio_size=dest.stat().st_size)
         return dest
 
+    def remove_video(self, video_id: str) -> int:
+        """删除视频文件（转录、元数据、音频保留）
+
+        Returns:
+            释放的字节数
+        """
+        path = self._indexed_path(video_id, 'video_file')
+        if not path:
+            return 0
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            size = 0
+        self.catalog.upsert(self.creator_key, video_id, video_file=None, video_size=None)
+        return size
+
     def save_transcript(self, video_id: str, transcript: str, create_time: str = None) -> Path:
         """保存转录文本"""
-        filename = self._get_filename(video_id, create_time)
+        filename = self._base_name(video_id, create_time)
         dest = self.creator_dir / f"{filename}.txt"
         dest.write_text(transcript, encoding='utf-8')
+        self.catalog.upsert(self.creator_key, video_id, filename, create_time, transcript_file=dest.name)
+        # 增量写入全文索引
+        get_search_index().add(self.creator_name, self.creator_key, video_id, transcript, create_time, dest.name)
         return dest
 
     def save_metadata(self, video_id: str, metadata: Dict[str, Any]) -> Path:
-        """保存视频元数据"""
+        """保存视频元数据（追加到元数据日志，METADATA_JSON_EXPORT 时另外导出单独的 JSON 文件）"""
         create_time = metadata.get('create_time')
-        filename = self._get_filename(video_id, create_time)
+        filename = self._base_name(video_id, create_time)
+        # 追加和更新索引在同一把锁内，压缩不会覆盖刚写入的位置
+        with self.metadata_log.lock:
+            offset, length = self.metadata_log.append(video_id, metadata)
+            self.catalog.upsert(self.creator_key, video_id, filename, create_time, metadata_file=LOG_NAME,
+                                metadata_offset=offset, metadata_length=length)
+        if Config.METADATA_JSON_EXPORT:
+            self._export_json(filename, metadata)
+        if metadata.get('title'):
+            get_search_index().set_title(self.creator_key, video_id, metadata['title'])
+        return self.metadata_log.path
+
+    def _export_json(self, filename: str, metadata: Dict[str, Any]) -> Path:
         dest = self.creator_dir / f"{filename}.json"
         dest.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding='utf-8')
         return dest
 
     def has_transcript(self, video_id: str) -> bool:
         """检查是否已有转录文本"""
-        return len(list(self.creator_dir.glob(f"*_{video_id}.txt"))) > 0
+        return self._indexed_path(video_id, 'transcript_file') is not None
 
     def get_transcript(self, video_id: str) -> Optional[str]:
         """获取转录文本"""
-        for txt_file in self.creator_dir.glob(f"*_{video_id}.txt"):
-            return txt_file.read_text(encoding='utf-8')
+        path = self._indexed_path(video_id, 'transcript_file')
+        if path and path.exists():
+            return path.read_text(encoding='utf-8')
         return None
 
     def get_metadata(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """获取元数据"""
-        for json_file in self.creator_dir.glob(f"*_{video_id}.json"):
-            return json.loads(json_file.read_text(encoding='utf-8'))
+        """获取元数据（按索引中的偏移读取一行，旧版本的单独 JSON 文件同样支持）"""
+        record = self.catalog.get(self.creator_key, video_id)
+        if not record or not record['metadata_file']:
+            return None
+        if record['metadata_file'] == LOG_NAME:
+            metadata = self.metadata_log.read_at(video_id, record['metadata_offset'] or 0,
+                                                 record['metadata_length'] or 0)
+            if metadata is None:
+                # 偏移失效（压缩中途退出等），从日志重建位置
+                metadata = self._index_metadata_log().get(video_id)
+            return metadata
+        path = self.creator_dir / record['metadata_file']
+        if path.exists():
+            return json.loads(path.read_text(encoding='utf-8'))
         return None
 
+    def list_untranscribed(self) -> list[Dict[str, Any]]:
+        """列出已下载但未转录的视频（索引记录，附带视频路径；视频已转为音频时为音频路径）"""
+        records = [
+            record for record in self.catalog.list(self.creator_key, has_transcript=False)
+            if record['video_file'] or record['audio_file']
+        ]
+        for record in records:
+            record['path'] = self.creator_dir / (record['video_file'] or record['audio_file'])
+        return records
+
     def list_videos(self) -> list[Dict[str, Any]]:
-        """列出所有已处理的视频"""
-        videos = []
-        for json_file in self.creator_dir.glob("*.json"):
+        """列出所有已处理的视频（顺序读一遍元数据日志，加上旧版本的单独 JSON 文件）"""
+        logged = self.metadata_log.read_all()
+        videos = list(logged.values())
+        for record in self._legacy_metadata_records():
+            if record['video_id'] in logged:
+                continue
             try:
-                metadata = json.loads(json_file.read_text(encoding='utf-8'))
-                videos.append(metadata)
+                json_file = self.creator_dir / record['metadata_file']
+                videos.append(json.loads(json_file.read_text(encoding='utf-8')))
             except:
                 continue
         # 按创建时间排序
         videos.sort(key=lambda x: x.get('create_time', ''), reverse=True)
         return videos
 
+    def get_high_water(self) -> Optional[str]:
+        """获取抓取高水位"""
+        return self.catalog.get_high_water(self.creator_key)
+
+    def set_high_water(self, create_time: str):
+        """推进抓取高水位"""
+        self.catalog.set_high_water(self.creator_key, create_time)
+
+    def get_resume_cursor(self) -> Optional[str]:
+        """获取上次翻页截断处的游标"""
+        return self.catalog.get_resume_cursor(self.creator_key)
+
+    def set_resume_cursor(self, cursor: Optional[str]):
+        """保存翻页截断处的游标（None 清除）"""
+        self.catalog.set_resume_cursor(self.creator_key, cursor)
+
+    def get_retry(self) -> Dict[str, str]:
+        """获取待重试的失败视频 {视频ID: 发布时间}"""
+        return self.catalog.get_retry(self.creator_key)
+
+    def set_retry(self, retry: Dict[str, str]):
+        """保存待重试的失败视频"""
+        self.catalog.set_retry(self.creator_key, retry)
+
+    def reindex(self) -> int:
+        """扫描目录重建该创作者的索引（包括元数据日志中的位置）
+
+        Returns:
+            索引的视频数
+        """
+        with self.metadata_log.lock:
+            self.catalog.reindex(self.creator_key, self.creator_dir)
+            self._index_metadata_log()
+        return len(self.catalog.list(self.creator_key))
+
+    def reindex_search(self) -> int:
+        """从现有转录文件重建该创作者的全文索引
+
+        Returns:
+            索引的转录数
+        """
+        index = get_search_index()
+        index.remove_creator(self.creator_key)
+        titles = {video_id: m.get('title') for video_id, m in self.metadata_log.read_all().items()}
+        count = 0
+        for record in self.catalog.list(self.creator_key, has_transcript=True):
+            path = self.creator_dir / record['transcript_file']
+            try:
+                text = path.read_text(encoding='utf-8')
+            except OSError:
+                continue
+            title = titles.get(record['video_id'])
+            if title is None and record['metadata_file'] and record['metadata_file'] != LOG_NAME:
+                title = (self.get_metadata(record['video_id']) or {}).get('title')
+            index.add(self.creator_name, self.creator_key, record['video_id'], text, record['create_time'],
+                      record['transcript_file'], title)
+            count += 1
+        return count
+
+    def _legacy_metadata_records(self) -> list[Dict[str, Any]]:
+        """元数据仍是单独 JSON 文件（旧版本）的索引记录"""
+        return [
+            record for record in self.catalog.list(self.creator_key, has_metadata=True)
+            if record['metadata_file'] != LOG_NAME
+        ]
+
+    def _index_metadata_log(self) -> Dict[str, Dict[str, Any]]:
+        """顺序读取元数据日志，把每个视频最新记录的位置写入索引
+
+        Returns:
+            {视频ID: 元数据}
+        """
+        with self.metadata_log.lock:
+            records = self.metadata_log.scan()
+            self.catalog.set_metadata_offsets(self.creator_key, {
+                video_id: (self._base_name(video_id, metadata.get('create_time')), metadata.get('create_time'),
+                           offset, length)
+                for video_id, (metadata, offset, length) in records.items()
+            })
+        return {video_id: metadata for video_id, (metadata, _, _) in records.items()}
+
+    def compact_metadata(self) -> Dict[str, int]:
+        """压缩元数据日志：旧版本的单独 JSON 文件先并入日志（文件保留），再只保留每个视频的最新记录
+
+        Returns:
+            {'before', 'after', 'imported'} 压缩前后字节数、并入的 JSON 文件数
+        """
+        with self.metadata_log.lock:
+            imported = 0
+            for record in self._legacy_metadata_records():
+                try:
+                    metadata = json.loads((self.creator_dir / record['metadata_file']).read_text(encoding='utf-8'))
+                except:
+                    continue
+                self.metadata_log.append(record['video_id'], metadata)
+                imported += 1
+
+            path = self.metadata_log.path
+            before = path.stat().st_size if path.exists() else 0
+            offsets = self.metadata_log.compact()
+            self.catalog.set_metadata_offsets(self.creator_key, {
+                video_id: (self._base_name(video_id), None, offset, length)
+                for video_id, (offset, length) in offsets.items()
+            })
+            after = path.stat().st_size
+        return {'before': before, 'after': after, 'imported': imported}
+
+    def maybe_compact_metadata(self, background: bool = True) -> bool:
+        """旧版本行占比超过 METADATA_COMPACT_RATIO 时压缩元数据日志（默认在后台线程中执行）
+
+        Returns:
+            是否触发了压缩
+        """
+        path = self.metadata_log.path
+        size = path.stat().st_size if path.exists() else 0
+        if size < Config.METADATA_COMPACT_MIN_KB * 1024:
+            return False
+        live = sum(
+            record['metadata_length'] or 0
+            for record in self.catalog.list(self.creator_key, has_metadata=True)
+            if record['metadata_file'] == LOG_NAME
+        )
+        if self.metadata_log.garbage_ratio(live) < Config.METADATA_COMPACT_RATIO:
+            return False
+        if background:
+            threading.Thread(target=self.compact_metadata, name=f"compact-{self.creator_key}", daemon=True).start()
+        else:
+            self.compact_metadata()
+        return True
+
     def get_creator_dir(self) -> Path:
         """获取创作者目录"""
         return self.creator_dir
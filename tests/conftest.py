@@ -0,0 +1,35 @@
+"""测试公共夹具：数据目录、各 SQLite 单例指向临时目录"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import catalog
+import rate_limiter
+import search_index
+import transcript_cache
+from config import Config
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """隔离的数据目录（creators.json、索引、缓存、限流状态都在临时目录中）"""
+    data = tmp_path / "data"
+    monkeypatch.setattr(Config, "DATA_DIR", data)
+    monkeypatch.setattr(Config, "KNOWLEDGE_DIR", tmp_path / "knowledge")
+    monkeypatch.setattr(Config, "CREATORS_FILE", tmp_path / "creators.json")
+    monkeypatch.setattr(Config, "CATALOG_DB", data / "catalog.db")
+    monkeypatch.setattr(Config, "TRANSCRIPT_CACHE_DB", data / "transcript_cache.db")
+    monkeypatch.setattr(Config, "ASR_TASKS_DB", data / "asr_tasks.db")
+    monkeypatch.setattr(Config, "RATE_LIMIT_DB", data / "rate_limit.db")
+    monkeypatch.setattr(Config, "SEARCH_DB", data / "search.db")
+    monkeypatch.setattr(Config, "SCRATCH_DIR", "")
+    monkeypatch.setattr(Config, "DISK_QUOTA_GB", 0.0)
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(transcript_cache, "_cache", None)
+    monkeypatch.setattr(rate_limiter, "_limiter", None)
+    monkeypatch.setattr(search_index, "_index", None)
+    Config.ensure_dirs()
+    return data
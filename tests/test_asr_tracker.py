@@ -0,0 +1,62 @@
+"""识别任务跟踪测试"""
+import threading
+from types import SimpleNamespace
+
+import asr_tracker
+import transcriber
+from asr_tracker import AsrTracker
+from config import Config
+
+
+def test_task_results_mapped_once_off_poll_thread(data_dir, monkeypatch):
+    """任务结束后结果只映射一次（只下载一次识别结果），且不在轮询线程中进行"""
+    monkeypatch.setattr(Config, "ASR_POLL_INTERVAL", 0.01)
+    urls = ["https://oss/a.opus", "https://oss/b.opus"]
+    response = SimpleNamespace(status_code=200, message="", output=SimpleNamespace(
+        task_id="t1", task_status="SUCCEEDED",
+        results=[{'file_url': url, 'transcription_url': f"{url}.json"} for url in urls],
+    ))
+    monkeypatch.setattr(asr_tracker.Transcription, "async_call", staticmethod(lambda **kwargs: response))
+    monkeypatch.setattr(asr_tracker.Transcription, "fetch", staticmethod(lambda task: response))
+
+    parsed = []
+
+    def parse(item):
+        parsed.append((item['file_url'], threading.current_thread().name))
+        return f"文本 {item['file_url']}"
+
+    deleted = []
+    monkeypatch.setattr(transcriber, "_parse_transcription_result", parse)
+    monkeypatch.setattr(transcriber, "queue_oss_delete", deleted.append)
+    monkeypatch.setattr(transcriber, "_tracker", AsrTracker(on_done=transcriber._on_task_done))
+
+    results = transcriber._transcribe_batches(urls, keys={url: f"key-{url}" for url in urls})
+
+    assert results == {url: f"文本 {url}" for url in urls}
+    assert sorted(url for url, _ in parsed) == urls
+    assert not any(thread == 'asr-tracker' for _, thread in parsed)
+    assert sorted(deleted) == urls
+    assert transcriber.get_transcript_cache().get(f"key-{urls[0]}") == f"文本 {urls[0]}"
+
+
+def test_task_record_kept_until_on_done_succeeds(data_dir, monkeypatch):
+    """on_done 失败（如写缓存时进程退出）时保留任务记录，重启后仍能找回该任务"""
+    monkeypatch.setattr(Config, "ASR_POLL_INTERVAL", 0.01)
+    response = SimpleNamespace(status_code=200, message="", output=SimpleNamespace(
+        task_id="t1", task_status="SUCCEEDED", results=[],
+    ))
+    monkeypatch.setattr(asr_tracker.Transcription, "async_call", staticmethod(lambda **kwargs: response))
+    monkeypatch.setattr(asr_tracker.Transcription, "fetch", staticmethod(lambda task: response))
+
+    def on_done(response, file_urls, keys):
+        raise RuntimeError("写入缓存失败")
+
+    tracker = AsrTracker(on_done=on_done)
+    future = tracker.submit(["https://oss/a.opus"], {"https://oss/a.opus": "key-a"})
+    assert isinstance(future.exception(timeout=5), RuntimeError)
+
+    restarted = AsrTracker(on_done=lambda response, file_urls, keys: "ok")
+    found = restarted.find("key-a")
+    assert found and found[1] == "https://oss/a.opus"
+    assert found[0].result(timeout=5) == "ok"
+    assert AsrTracker(on_done=on_done).pending() == 0
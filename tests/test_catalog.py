@@ -0,0 +1,47 @@
+"""视频索引测试"""
+from catalog import Catalog, parse_filename
+
+
+def test_parse_filename():
+    """文件名 {日期}_{视频ID} 或 {视频ID}"""
+    assert parse_filename("2026-10-01_7412345678901234567") == ("7412345678901234567", "2026-10-01")
+    assert parse_filename("7412345678901234567") == ("7412345678901234567", None)
+    # 日期部分本身带下划线时按最后一个下划线切分
+    assert parse_filename("2026_10_01_abc") == ("abc", "2026_10_01")
+
+
+def test_reindex_groups_files_by_video(tmp_path):
+    """重建索引时同一视频的各类文件归到一条记录，未知后缀忽略"""
+    creator_dir = tmp_path / "A"
+    creator_dir.mkdir()
+    (creator_dir / "2026-10-01_v1.mp4").write_bytes(b"\0" * 100)
+    (creator_dir / "2026-10-01_v1.txt").write_text("转录", encoding='utf-8')
+    (creator_dir / "v2.ogg").write_bytes(b"\0" * 10)
+    (creator_dir / "notes.md").write_text("忽略", encoding='utf-8')
+
+    catalog = Catalog(tmp_path / "catalog.db")
+    assert catalog.reindex("A", creator_dir) == 2
+    v1 = catalog.get("A", "v1")
+    assert v1['video_file'] == "2026-10-01_v1.mp4" and v1['transcript_file'] == "2026-10-01_v1.txt"
+    assert v1['base_name'] == "2026-10-01_v1" and v1['video_size'] == 100
+    assert catalog.get("A", "v2")['audio_file'] == "v2.ogg"
+    assert catalog.is_indexed("A") and not catalog.exists("A", "notes")
+
+
+def test_fetch_state_fields_independent(tmp_path):
+    """高水位、截断游标、重试列表分别更新，互不覆盖；高水位只前进"""
+    catalog = Catalog(tmp_path / "catalog.db")
+    catalog.set_high_water("A", "2026-10-02")
+    catalog.set_resume_cursor("A", "1700000000000")
+    catalog.set_retry("A", {"v1": "2026-10-01"})
+    catalog.set_high_water("A", "2026-10-01")
+
+    assert catalog.get_high_water("A") == "2026-10-02"
+    assert catalog.get_resume_cursor("A") == "1700000000000"
+    assert catalog.get_retry("A") == {"v1": "2026-10-01"}
+
+    catalog.set_resume_cursor("A", None)
+    catalog.set_retry("A", {})
+    assert catalog.get_resume_cursor("A") is None and catalog.get_retry("A") == {}
+    assert catalog.get_high_water("A") == "2026-10-02"
+    assert catalog.get_high_water("B") is None and catalog.get_retry("B") == {}
@@ -0,0 +1,77 @@
+"""抖音适配器测试"""
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import platforms.douyin as douyin
+from platforms.base import Video
+from platforms.douyin import DouyinAdapter
+
+
+@pytest.fixture
+def adapter(data_dir, monkeypatch):
+    """直链下载总是失败、留下按总长预分配的 .part 的适配器"""
+    def download_direct(self, url, output_path, resolve_url):
+        with open(f"{output_path}.part", 'wb') as f:
+            f.truncate(1024 * 1024)
+        return False
+
+    monkeypatch.setattr(DouyinAdapter, "_download_direct", download_direct)
+    return DouyinAdapter({'platform': 'douyin', 'name': 'A'})
+
+
+def make_video(**urls) -> Video:
+    return Video(video_id="v1", title="视频", author="A", create_time="2026-10-01T00:00:00",
+                 video_url=urls.get('video_url', "https://cdn/v1.mp4"), share_url="https://share/v1",
+                 statistics={}, platform="douyin", audio_url=urls.get('audio_url', ""))
+
+
+def fake_ytdlp(monkeypatch, seen_parts, ext):
+    """yt-dlp 替身：记录启动时是否还有遗留的 .part，然后写出完整文件"""
+    def run(cmd, **kwargs):
+        output = cmd[cmd.index("-o") + 1].replace("%(ext)s", ext)
+        seen_parts.append(sorted(p.name for p in Path(output).parent.glob("*.part")))
+        Path(output).write_bytes(b"\1" * 20000)
+        return SimpleNamespace(returncode=0, stdout=f"{output}\n", stderr="")
+
+    monkeypatch.setattr(douyin.subprocess, "run", run)
+
+
+def test_ytdlp_fallback_discards_preallocated_part(adapter, tmp_path, monkeypatch):
+    """直链失败后 yt-dlp 启动前删除预分配的 .part，避免 yt-dlp 把它当作已下载的内容"""
+    seen_parts = []
+    fake_ytdlp(monkeypatch, seen_parts, "mp4")
+    output = tmp_path / "v1.mp4"
+
+    assert adapter.download_video(make_video(), str(output))
+    assert seen_parts == [[]]
+    assert output.read_bytes() == b"\1" * 20000
+
+
+def test_audio_ytdlp_fallback_discards_preallocated_part(adapter, tmp_path, monkeypatch):
+    seen_parts = []
+    fake_ytdlp(monkeypatch, seen_parts, "m4a")
+
+    path = adapter.download_audio(make_video(audio_url="https://cdn/v1.m4a"), str(tmp_path / "v1"))
+    assert path == str(tmp_path / "v1.m4a")
+    assert seen_parts == [[]]
+
+
+def test_audio_ytdlp_fallback_rejects_non_audio_formats(adapter, tmp_path, monkeypatch):
+    """yt-dlp 只选 m4a / mp3；意外得到 webm 时丢弃，退回下载完整视频（不会把 webm 按 .mp4 保存）"""
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        output = cmd[cmd.index("-o") + 1].replace("%(ext)s", "webm")
+        Path(output).write_bytes(b"\1" * 20000)
+        return SimpleNamespace(returncode=0, stdout=f"{output}\n", stderr="")
+
+    monkeypatch.setattr(douyin.subprocess, "run", run)
+    path = adapter.download_audio(make_video(), str(tmp_path / "v1"))
+
+    assert commands[0][commands[0].index("-f") + 1] == "bestaudio[ext=m4a]/bestaudio[ext=mp3]"
+    assert not (tmp_path / "v1.webm").exists()
+    # 第二次调用是 download_video 的 yt-dlp 降级，输出完整视频
+    assert path == str(tmp_path / "v1.mp4") and len(commands) == 2
@@ -0,0 +1,101 @@
+"""分段下载测试：断点续传、地址过期重新获取"""
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import downloader
+from downloader import _RangeRequestHandler, download_file, part_paths
+
+SIZE = 64 * 1024
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """本地 Range 文件服务：/video.bin 正常下载，/expired.bin 返回 403；记录每个请求的 Range"""
+    monkeypatch.setattr(downloader, "MIN_PART_SIZE", 16 * 1024)
+    root = tmp_path / "cdn"
+    root.mkdir()
+    data = os.urandom(SIZE)
+    (root / "video.bin").write_bytes(data)
+    requests_seen = []
+
+    class Handler(_RangeRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, self.headers.get('Range')))
+            if self.path.startswith('/expired'):
+                self.send_error(403)
+                return
+            super().do_GET()
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), lambda *args: Handler(*args, directory=str(root)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield base, data, requests_seen
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_multi_connection_download(server, tmp_path):
+    base, data, requests_seen = server
+    output = tmp_path / "out.mp4"
+
+    assert download_file(f"{base}/video.bin", str(output), connections=4) == SIZE
+    assert output.read_bytes() == data
+    assert not any(path.exists() for path in part_paths(str(output)))
+    # 探测 + 4 个分段
+    assert len(requests_seen) == 5
+
+
+def test_resume_from_part_state(server, tmp_path):
+    """按 .part.json 记录的进度续传：已完成的分段不再请求，未完成的从断点继续"""
+    base, data, requests_seen = server
+    output = tmp_path / "out.mp4"
+    part_path, state_path = part_paths(str(output))
+    half = SIZE // 2
+    # 第一段已完成，第二段下载了 1000 字节
+    part_path.write_bytes(data[:half + 1000] + b"\0" * (SIZE - half - 1000))
+    state_path.write_text(json.dumps({
+        'url': f"{base}/video.bin", 'etag': None, 'length': SIZE,
+        'parts': [[0, half - 1, half], [half, SIZE - 1, 1000]],
+    }))
+
+    assert download_file(f"{base}/video.bin", str(output)) == SIZE
+    assert output.read_bytes() == data
+    assert [r for _, r in requests_seen] == ["bytes=0-0", f"bytes={half + 1000}-{SIZE - 1}"]
+    assert not state_path.exists()
+
+
+def test_state_ignored_when_length_changes(server, tmp_path):
+    """记录的文件长度与服务器不一致时重新下载"""
+    base, data, _ = server
+    output = tmp_path / "out.mp4"
+    part_path, state_path = part_paths(str(output))
+    part_path.write_bytes(b"\1" * 100)
+    state_path.write_text(json.dumps({'url': "x", 'etag': None, 'length': 100, 'parts': [[0, 99, 100]]}))
+
+    assert download_file(f"{base}/video.bin", str(output)) == SIZE
+    assert output.read_bytes() == data
+
+
+def test_forbidden_resolves_new_url_once(server, tmp_path):
+    """地址过期（403）时调用 resolve_url 获取新地址，只重新获取一次"""
+    base, data, _ = server
+    output = tmp_path / "out.mp4"
+    calls = []
+
+    def resolve():
+        calls.append(True)
+        return f"{base}/video.bin"
+
+    assert download_file(f"{base}/expired.bin", str(output), resolve_url=resolve) == SIZE
+    assert output.read_bytes() == data
+    assert calls == [True]
+
+    with pytest.raises(Exception, match="403"):
+        download_file(f"{base}/expired.bin", str(tmp_path / "other.mp4"),
+                      resolve_url=lambda: f"{base}/expired.bin")
+    with pytest.raises(Exception, match="403"):
+        download_file(f"{base}/expired.bin", str(tmp_path / "other.mp4"))
@@ -0,0 +1,125 @@
+"""增量抓取测试：翻页上限截断、截断处继续、高水位推进"""
+import asyncio
+from datetime import datetime, timedelta
+
+from config import CreatorConfig
+from platforms.base import PlatformAdapter, Video
+from scheduler import CortexCore
+from storage import StorageManager
+
+BASE = datetime.now() - timedelta(days=1)
+
+
+def make_video(n: int) -> Video:
+    """第 n 个发布的视频（n 越大越新）"""
+    return Video(video_id=f"v{n:03d}", title=f"视频{n}", author="A",
+                 create_time=(BASE + timedelta(minutes=n)).isoformat(),
+                 video_url="", share_url="", statistics={}, platform="fake")
+
+
+class TimelineAdapter(PlatformAdapter):
+    """按内存中的时间线翻页，游标为上一页最后一个视频的发布时间（与抖音 max_cursor 一样不受新发布影响）"""
+
+    def __init__(self, timeline):
+        super().__init__({'platform': 'fake'})
+        self.timeline = timeline  # 从新到旧
+        self.pages_fetched = 0
+
+    def fetch_videos(self, creator_id, count=20):
+        return self.timeline[:count]
+
+    def download_video(self, video, output_path):
+        return True
+
+    def iter_video_pages(self, creator_id, page_size=20, cursor=None):
+        while True:
+            rest = [v for v in self.timeline if cursor is None or v.create_time < cursor]
+            page = rest[:page_size]
+            self.pages_fetched += 1
+            more = len(rest) > page_size
+            cursor = page[-1].create_time if page else None
+            yield page, cursor if more else None
+            if not more:
+                break
+
+
+def test_page_cap_reports_truncation():
+    """翻到上限仍没遇到已知视频时返回截断处游标，遇到已知视频时返回 None"""
+    adapter = TimelineAdapter([make_video(n) for n in range(50, 0, -1)])
+    known = {f"v{n:03d}" for n in range(1, 6)}
+
+    videos, resume = adapter.fetch_new_videos("A", known.__contains__, page_size=10, max_pages=2)
+    assert [v.video_id for v in videos] == [f"v{n:03d}" for n in range(50, 30, -1)]
+    assert resume == make_video(31).create_time
+    assert adapter.pages_fetched == 2
+
+    videos, resume = adapter.fetch_new_videos("A", known.__contains__, page_size=10, max_pages=10)
+    assert len(videos) == 45 and resume is None
+
+
+def test_truncated_fetch_resumes_without_losing_videos(data_dir):
+    """多次运行（期间有新发布）逐步补齐截断处之后的视频，补齐前不推进高水位"""
+    CreatorConfig().add("A", "fake", "a")
+    storage = StorageManager("A")
+    core = CortexCore()
+    adapter = TimelineAdapter([make_video(n) for n in range(50, 0, -1)])
+    known = {f"v{n:03d}" for n in range(1, 6)}
+    storage.set_high_water(make_video(5).create_time)
+
+    def run(use_async=False):
+        kwargs = dict(since=storage.get_high_water(), page_size=10, max_pages=2,
+                      resume=storage.get_resume_cursor())
+        if use_async:
+            videos, resume = asyncio.run(adapter.afetch_new_videos("A", known.__contains__, **kwargs))
+        else:
+            videos, resume = adapter.fetch_new_videos("A", known.__contains__, **kwargs)
+        assert not known & {v.video_id for v in videos}
+        known.update(v.video_id for v in videos)
+        core._advance_high_water(storage, videos, [], resume)
+        return resume
+
+    assert run() is not None
+    assert storage.get_high_water() == make_video(5).create_time
+
+    # 两次运行之间发布了新视频
+    adapter.timeline[:0] = [make_video(52), make_video(51)]
+    assert run(use_async=True) is not None
+    assert run() is not None
+    assert storage.get_high_water() == make_video(5).create_time
+
+    assert run() is None
+    assert storage.get_resume_cursor() is None
+    assert known == {f"v{n:03d}" for n in range(1, 53)}
+    assert storage.get_high_water() > make_video(5).create_time
+
+
+def test_failed_video_retried_on_next_run(data_dir):
+    """失败的视频排在本次保存的视频下面，下次运行仍会翻到并重试；成功后移出重试列表"""
+    CreatorConfig().add("A", "fake", "a")
+    storage = StorageManager("A")
+    core = CortexCore()
+    adapter = TimelineAdapter([make_video(n) for n in range(10, 0, -1)])
+    known = {f"v{n:03d}" for n in range(1, 6)}
+    storage.set_high_water(make_video(5).create_time)
+
+    def run(fail=()):
+        videos, resume = adapter.fetch_new_videos(
+            "A", known.__contains__, since=storage.get_high_water(), page_size=3, max_pages=10,
+            resume=storage.get_resume_cursor(), retry_since=min(storage.get_retry().values(), default=None),
+        )
+        failed = [v for v in videos if v.video_id in fail]
+        known.update(v.video_id for v in videos if v not in failed)
+        core._advance_high_water(storage, videos, failed, resume)
+        return [v.video_id for v in videos]
+
+    assert run(fail={"v007"}) == ["v010", "v009", "v008", "v007", "v006"]
+    assert storage.get_retry() == {"v007": make_video(7).create_time}
+
+    assert run() == ["v007"]
+    assert storage.get_retry() == {}
+    assert storage.get_high_water() == make_video(7).create_time
+
+    # 重试成功后恢复为遇到已知视频即停止
+    adapter.pages_fetched = 0
+    assert run() == []
+    assert adapter.pages_fetched == 1
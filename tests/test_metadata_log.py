@@ -0,0 +1,55 @@
+"""元数据日志测试：追加、按偏移读取、压缩"""
+from metadata_log import MetadataLog
+
+
+def test_append_and_read_at(tmp_path):
+    log = MetadataLog(tmp_path)
+    first = log.append("v1", {'title': "第一个", 'create_time': "2026-10-01"})
+    second = log.append("v2", {'title': "第二个", 'create_time': "2026-10-02"})
+
+    assert log.read_at("v1", *first) == {'video_id': "v1", 'title': "第一个", 'create_time': "2026-10-01"}
+    assert log.read_at("v2", *second)['title'] == "第二个"
+    # 偏移指向别的视频、越界时返回 None
+    assert log.read_at("v2", *first) is None
+    assert log.read_at("v1", second[0] + second[1], 10) is None
+
+
+def test_latest_record_wins(tmp_path):
+    """同一视频更新时追加新行，scan / read_all 以最后一行为准"""
+    log = MetadataLog(tmp_path)
+    log.append("v1", {'title': "旧"})
+    latest = log.append("v1", {'title': "新"})
+
+    records = log.scan()
+    assert records["v1"][0]['title'] == "新"
+    assert records["v1"][1:] == latest
+    assert log.read_all() == {"v1": {'video_id': "v1", 'title': "新"}}
+
+
+def test_torn_line_skipped_and_separated(tmp_path):
+    """崩溃留下写了一半的行：scan 跳过它，下一次追加先补换行"""
+    log = MetadataLog(tmp_path)
+    log.append("v1", {'title': "完整"})
+    with open(log.path, 'ab') as f:
+        f.write('{"video_id": "v2", "title": "写了一'.encode('utf-8'))
+
+    offset, length = log.append("v3", {'title': "之后"})
+    assert log.read_at("v3", offset, length)['title'] == "之后"
+    assert set(log.read_all()) == {"v1", "v3"}
+
+
+def test_compact_round_trip(tmp_path):
+    """压缩后只剩每个视频的最新记录（按创建时间从新到旧），返回的新偏移可直接读取"""
+    log = MetadataLog(tmp_path)
+    log.append("v1", {'title': "旧", 'create_time': "2026-10-01"})
+    log.append("v2", {'title': "二", 'create_time': "2026-10-02"})
+    log.append("v1", {'title': "新", 'create_time': "2026-10-01"})
+    assert log.garbage_ratio() > 0
+
+    offsets = log.compact()
+    assert log.garbage_ratio() == 0
+    assert list(offsets) == ["v2", "v1"]
+    assert log.read_at("v1", *offsets["v1"])['title'] == "新"
+    assert log.read_at("v2", *offsets["v2"])['title'] == "二"
+    assert len(log.path.read_bytes().splitlines()) == 2
+    assert not list(tmp_path.glob(".*.tmp"))
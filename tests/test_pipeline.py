@@ -0,0 +1,80 @@
+"""流水线测试"""
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from pipeline import Job, Pipeline, Stage
+
+
+def test_all_items_pass_every_stage():
+    def double(job):
+        job.data['value'] = job.item * 2
+
+    def add_one(job):
+        job.data['value'] += 1
+
+    jobs = list(Pipeline([Stage('double', double, 2), Stage('add', add_one, 3)]).process(range(20)))
+    assert sorted(job.data['value'] for job in jobs) == [n * 2 + 1 for n in range(20)]
+    assert all(job.ok and set(job.timings) == {'double', 'add'} for job in jobs)
+
+
+def test_failed_and_finished_jobs_skip_later_stages():
+    """某阶段失败或提前完成的任务直接交付，不进入后续阶段，也不影响其他任务"""
+    reached = []
+
+    def first(job):
+        if job.item == 1:
+            raise RuntimeError("坏了")
+        if job.item == 2:
+            job.finished = True
+
+    def second(job):
+        reached.append(job.item)
+
+    jobs = {job.item: job for job in Pipeline([Stage('first', first), Stage('second', second)]).process([0, 1, 2, 3])}
+    assert sorted(reached) == [0, 3]
+    assert str(jobs[1].error) == "坏了" and jobs[1].failed_stage == 'first'
+    assert jobs[2].ok and jobs[2].finished
+
+
+def test_async_stage_does_not_hold_worker():
+    """阶段返回 Future 时线程立即处理下一个任务，Future 完成后再交付（失败记入该任务）"""
+    futures = []
+
+    def submit(job):
+        future = Future()
+        futures.append((job.item, future))
+        if len(futures) == 3:
+            # 单线程阶段已提交全部任务，说明没有等待前面的 Future
+            for item, f in futures:
+                threading.Timer(0.01, f.set_exception if item == 1 else f.set_result,
+                                (RuntimeError("识别失败"),) if item == 1 else (None,)).start()
+        return future
+
+    def after(job):
+        job.data['after'] = True
+
+    jobs = {job.item: job for job in Pipeline([Stage('asr', submit, 1), Stage('after', after)]).process([0, 1, 2])}
+    assert jobs[0].data['after'] and jobs[2].data['after']
+    assert jobs[1].failed_stage == 'asr' and 'after' not in jobs[1].data
+
+
+def test_stages_overlap():
+    """总耗时趋近最慢阶段而不是各阶段之和"""
+    def slow(job):
+        time.sleep(0.05)
+
+    start = time.monotonic()
+    list(Pipeline([Stage('a', slow), Stage('b', slow)]).process(range(6)))
+    assert time.monotonic() - start < 0.05 * 12 * 0.8
+
+
+def test_invalid_stages():
+    with pytest.raises(ValueError):
+        Pipeline([])
+    with pytest.raises(ValueError):
+        Pipeline([Stage('a', lambda job: None, 0)])
+    assert list(Pipeline([Stage('a', lambda job: None)]).process([])) == []
+    assert [job.data for job in Pipeline([Stage('a', lambda job: None)]).process([Job(1, {'k': 1})])] == [{'k': 1}]
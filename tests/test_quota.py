@@ -0,0 +1,33 @@
+"""磁盘配额测试"""
+import audio
+from config import CreatorConfig
+from quota import DiskQuota
+from storage import StorageManager, get_scratch_dir
+
+
+def test_keep_audio_extracts_into_scratch_dir(data_dir, monkeypatch):
+    """转为音频时提取到暂存目录再移入创作者目录，不经过系统临时目录"""
+    CreatorConfig().add("A", "douyin", "A" * 10)
+    storage = StorageManager("A")
+    create_time = "2026-10-01T00:00:00"
+    source = get_scratch_dir() / "v1.mp4"
+    source.write_bytes(b"\0" * 4096)
+    storage.save_video("v1", str(source), create_time)
+    storage.save_metadata("v1", {'video_id': "v1", 'create_time': create_time})
+
+    output_dirs = []
+
+    def extract_audio(video_path, profile=None, start=None, end=None, output_dir=None):
+        output_dirs.append(output_dir)
+        audio_path = output_dir / f"{video_path.stem}.ogg"
+        audio_path.write_bytes(b"\0" * 128)
+        return audio_path
+
+    monkeypatch.setattr(audio, "extract_audio", extract_audio)
+    report = DiskQuota(policy='oldest', keep_audio=True, global_gb=1 / 1024 ** 3).enforce()
+
+    assert not report['errors'] and len(report['done']) == 1
+    assert output_dirs == [get_scratch_dir()]
+    assert not list(get_scratch_dir().iterdir())
+    assert [p.suffix for p in storage.creator_dir.iterdir() if p.suffix in ('.mp4', '.ogg')] == ['.ogg']
+    assert report['freed'] == 4096 - 128
@@ -0,0 +1,74 @@
+"""限流测试：令牌桶、429 降速（AIMD）、用量统计"""
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可控的时钟"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+    return now
+
+
+def make_limiter(tmp_path, api_key="key", **kwargs):
+    kwargs.setdefault('rate', 1.0)
+    kwargs.setdefault('burst', 2)
+    return RateLimiter(api_key, db_path=tmp_path / "rate_limit.db", endpoint_rates={},
+                       cost_per_call=0.001, endpoint_costs={'fetch_one_video': 0.002}, **kwargs)
+
+
+def test_token_bucket_burst_then_rate(tmp_path, clock):
+    """桶满时允许 burst 个突发请求，之后按速率排队（预占：等待时间逐个累加）"""
+    limiter = make_limiter(tmp_path)
+    assert [limiter.reserve("feed") for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+
+    # 欠 2 个令牌，3 秒后补回 3 个：还清欠账后只剩 1 个
+    clock[0] += 3
+    assert limiter.reserve("feed") == 0.0
+    assert limiter.reserve("feed") == pytest.approx(1.0)
+
+
+def test_buckets_shared_per_key_and_endpoint(tmp_path, clock):
+    """同一 Key 的多个实例（多进程）共享桶；不同接口、不同 Key 各自独立"""
+    first, second = make_limiter(tmp_path), make_limiter(tmp_path)
+    first.reserve("feed")
+    first.reserve("feed")
+    assert second.reserve("feed") == 1.0
+    assert second.reserve("detail") == 0.0
+    assert make_limiter(tmp_path, api_key="other").reserve("feed") == 0.0
+
+
+def test_throttled_halves_rate_and_recovers(tmp_path, clock):
+    """429 时速率减半并清空令牌，成功请求逐步加回配置速率；不低于 MIN_RATE_RATIO"""
+    limiter = make_limiter(tmp_path, rate=10.0, burst=5)
+    limiter.reserve("feed")
+    limiter.record("feed", throttled=True)
+    assert limiter.current_rate("feed") == 5.0
+    # 令牌清空，下一个请求按减半后的速率等待
+    assert limiter.reserve("feed") == pytest.approx(1 / 5.0)
+
+    limiter.record("feed")
+    assert limiter.current_rate("feed") == pytest.approx(6.0)
+    for _ in range(10):
+        limiter.record("feed")
+    assert limiter.current_rate("feed") == 10.0
+
+    for _ in range(10):
+        limiter.record("feed", throttled=True)
+    assert limiter.current_rate("feed") == pytest.approx(10.0 * rate_limiter.MIN_RATE_RATIO)
+
+
+def test_usage_counts_calls_throttles_and_cost(tmp_path, clock):
+    limiter = make_limiter(tmp_path)
+    limiter.record("feed", creator="A")
+    limiter.record("feed", creator="A", throttled=True)
+    limiter.record("fetch_one_video", creator="B")
+
+    usage = {row['creator']: row for row in limiter.usage()}
+    assert usage["A"]['calls'] == 2 and usage["A"]['throttled'] == 1
+    assert usage["A"]['cost'] == pytest.approx(0.002)
+    assert usage["B"]['cost'] == pytest.approx(0.002)
+    assert limiter.usage(since="2999-01-01") == []
@@ -0,0 +1,50 @@
+"""调度器测试"""
+from config import CreatorConfig
+from scheduler import CortexCore
+
+
+def test_failed_prefetch_does_not_abort_serial_run(data_dir, monkeypatch):
+    """--async 串行处理时，一个创作者的预获取失败只记入它自己的汇总，其余创作者照常处理"""
+    creators = CreatorConfig()
+    for name in ("A", "B", "C"):
+        creators.add(name, "douyin", f"{name * 10}")
+
+    async def afetch_all(self, due_creators, concurrency):
+        return {"A": ([], None), "B": RuntimeError("接口超时"), "C": ([], None)}
+
+    monkeypatch.setattr(CortexCore, "afetch_all", afetch_all)
+    summaries = CortexCore().run_once(force_check=True, concurrency=1, use_async=True)
+
+    by_name = {s.name: s for s in summaries}
+    assert set(by_name) == {"A", "B", "C"}
+    assert by_name["B"].error == "接口超时"
+    assert by_name["A"].error is None and by_name["C"].error is None
+    # 失败的创作者不更新检查时间，下次运行仍会处理
+    last_checks = {c['name']: c['last_check'] for c in CreatorConfig().get_all()}
+    assert last_checks["A"] and last_checks["C"] and not last_checks["B"]
+
+
+def test_backend_closed_when_pipeline_fails(data_dir, monkeypatch):
+    """流水线抛出异常时转写引擎仍然关闭"""
+    from platforms.base import Video
+
+    creators = CreatorConfig()
+    creators.add("A", "douyin", "A" * 10)
+    closed = []
+
+    class Backend:
+        def close(self):
+            closed.append(True)
+
+    def build_pipeline(self, adapter, storage, backend, ingest):
+        raise RuntimeError("流水线启动失败")
+
+    monkeypatch.setattr(CortexCore, "_get_transcriber", lambda self, creator: Backend())
+    monkeypatch.setattr(CortexCore, "_build_pipeline", build_pipeline)
+    video = Video(video_id="v1", title="视频", author="A", create_time="2026-10-01T00:00:00",
+                  video_url="", share_url="", statistics={}, platform="douyin")
+
+    summary = CortexCore()._process_isolated(creators.get_all()[0], False, False, quiet=True,
+                                             videos=([video], None))
+    assert summary.error == "流水线启动失败"
+    assert closed == [True]
@@ -0,0 +1,46 @@
+"""全文检索测试：中文二元组切分、查询构造、检索过滤"""
+from search_index import SearchIndex, build_query, make_snippet, tokenize
+
+
+def test_tokenize_cjk_bigrams_and_words():
+    """中文切成重叠二元组（末尾再加最后一个字），英文数字按词小写"""
+    assert tokenize("学习编程") == "学习 习编 编程 程"
+    assert tokenize("用Python写 3 个脚本") == "用 python 写 3 个脚 脚本 本"
+    assert tokenize("，。!") == ""
+
+
+def test_build_query():
+    """每个中文词的二元组组成短语，单字前缀匹配，多个词 AND"""
+    assert build_query("编程") == '"编程"'
+    assert build_query("学习编程") == '"学习 习编 编程"'
+    assert build_query("码") == '"码"*'
+    assert build_query("Python 脚本") == '"python" AND "脚本"'
+    assert build_query("  ，。 ") is None
+
+
+def test_search_matches_substrings_with_filters(tmp_path):
+    index = SearchIndex(tmp_path / "search.db")
+    index.add("A", "a", "v1", "今天我们来聊一聊如何学习编程", create_time="2026-10-01T08:00:00", title="编程")
+    index.add("B", "b", "v2", "学习做饭的第一步是买菜", create_time="2026-10-05T08:00:00")
+    index.add("A", "a", "v3", "Python 脚本入门", create_time="2026-10-09T08:00:00")
+
+    assert [r['video_id'] for r in index.search("学习编程")] == ["v1"]
+    assert {r['video_id'] for r in index.search("学习")} == {"v1", "v2"}
+    # 单字按前缀匹配，词在句末也能命中
+    assert [r['video_id'] for r in index.search("菜")] == ["v2"]
+    assert [r['video_id'] for r in index.search("python")] == ["v3"]
+    assert [r['video_id'] for r in index.search("学习", creator="B")] == ["v2"]
+    assert [r['video_id'] for r in index.search("学习", since="2026-10-02")] == ["v2"]
+    assert [r['video_id'] for r in index.search("学习", until="2026-10-01")] == ["v1"]
+    assert index.search("学习 python") == []
+
+    # 更新同一视频时替换旧文本
+    index.add("A", "a", "v1", "改成讲摄影", create_time="2026-10-01T08:00:00")
+    assert [r['video_id'] for r in index.search("摄影")] == ["v1"]
+    assert [r['video_id'] for r in index.search("学习编程")] == []
+    assert index.count() == 3
+
+
+def test_make_snippet_highlights_first_match():
+    snippet = make_snippet("开头" + "填充" * 30 + "关键词在这里" + "结尾", "关键词", width=4)
+    assert snippet == "…填充填充[bold yellow]关键词[/bold yellow]在…"
@@ -0,0 +1,21 @@
+"""转写模块测试"""
+from transcriber import _stitch_segments
+
+
+def test_stitch_removes_overlap():
+    """相邻段硬切重叠的文字只保留一份"""
+    texts = ["今天我们来聊一聊如何学习编程", "如何学习编程首先要多写代码", "多写代码然后多读别人的代码"]
+    assert _stitch_segments(texts) == "今天我们来聊一聊如何学习编程首先要多写代码然后多读别人的代码"
+
+
+def test_stitch_ignores_short_overlap():
+    """短于 min_overlap 的重合不当作重叠"""
+    assert _stitch_segments(["我们的目标", "目标是什么"]) == "我们的目标目标是什么"
+
+
+def test_stitch_joins_cjk_without_space():
+    """中文分段直接相连，拉丁文字之间保留空格"""
+    assert _stitch_segments(["第一段。", "第二段"]) == "第一段。第二段"
+    assert _stitch_segments(["用 Python", "写脚本"]) == "用 Python写脚本"
+    assert _stitch_segments(["hello world,", "this is it"]) == "hello world, this is it"
+    assert _stitch_segments(["", "  只有一段  ", ""]) == "只有一段"
@@ -1,10 +1,16 @@
 """转录模块 - 阿里云百炼（独立版本）"""
+import atexit
+import queue
+import re
 import subprocess
-import tempfile
+import threading
+import time
 import os
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from urllib.parse import urlparse
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Union
 
 # 导入阿里云 SDK
 try:
@@ -18,6 +24,10 @@ except ImportError:
     raise ImportError("缺少依赖库，请运行: pip install alibabacloud-oss-v2 alibabacloud_sts20150401 alibabacloud_tea_openapi dashscope")
 
 from config import Config
+from transcript_cache import get_transcript_cache
+from asr_tracker import AsrTracker
+from audio import (_get_profile, _ffmpeg_audio_cmd, supports_streaming, extract_audio, audio_fingerprint,
+                   trim_silence, probe_duration, detect_silences, plan_segments)
 
 
 def transcribe_video(video_path: str) -> str:
@@ -29,117 +39,262 @@ def transcribe_video(video_path: str) -> str:
     Returns:
         转录文本
     """
-    # 1. 提取音频
-    audio_file = extract_audio(Path(video_path))
-
-    # 2. 上传到 OSS
-    oss_url = upload_to_oss(audio_file)
-
-    # 3. 调用识别
-    transcription = transcribe_audio(oss_url)
-
-    # 4. 删除 OSS 临时文件
-    try:
-        delete_oss_file(oss_url)
-    except:
-        pass
+    # 0. 按音频内容查缓存，命中则直接返回
+    cache = get_transcript_cache()
+    cache_key = f"{CACHE_PREFIX}:{audio_fingerprint(Path(video_path))}" if cache else None
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    resumed = resume_transcription(cache_key) if cache_key else None
+    if resumed:
+        # 重启前已提交的同一段音频，继续等待原任务
+        transcription = resumed.result()
+    elif is_long_audio(Path(video_path)):
+        # 长音频分段并行识别
+        transcription = transcribe_long_audio(Path(video_path))
+        if cache:
+            cache.put(cache_key, transcription)
+    else:
+        # 1. 提取音频并上传到 OSS
+        oss_url = prepare_audio_url(Path(video_path))
 
-    # 5. 清理本地音频文件
-    if audio_file.exists():
-        audio_file.unlink()
+        # 2. 调用识别（OSS 临时文件在任务结束后删除，结果由任务跟踪器写入转写缓存）
+        transcription = transcribe_audio(oss_url, cache_key)
 
     return transcription
 
 
-def extract_audio(video_path: Path) -> Path:
-    """从视频中提取音频"""
-    temp_dir = Path(tempfile.gettempdir())
-    audio_path = temp_dir / f"{video_path.stem}_{datetime.now().strftime('%Y%m%d%H%M%S')}.wav"
+def prepare_audio_url(video_path: Path, info: Dict = None) -> str:
+    """提取音频并上传 OSS，返回公网URL
 
-    cmd = [
-        'ffmpeg',
-        '-i', str(video_path),
-        '-vn',  # 不处理视频
-        '-acodec', 'pcm_s16le',  # 音频编码
-        '-ar', '16000',  # 采样率
-        '-ac', '1',  # 单声道
-        '-y',
-        str(audio_path)
-    ]
+    开启 Config.VAD_TRIM 时先裁掉静音段再上传，时间映射写入 info['offset_map']；
+    否则音频格式支持流式输出且开启 Config.AUDIO_STREAMING 时，ffmpeg 输出直接分片上传，不写临时文件；
+    其余情况先提取到临时文件再上传。
+    """
+    if Config.VAD_TRIM:
+        audio_file, offset_map = trim_silence(video_path)
+        if info is not None:
+            info['offset_map'] = offset_map
+    elif Config.AUDIO_STREAMING and supports_streaming(Config.AUDIO_PROFILE):
+        return stream_audio_to_oss(video_path)
+    else:
+        audio_file = extract_audio(video_path)
+    try:
+        return upload_to_oss(audio_file)
+    finally:
+        # 清理本地音频文件
+        audio_file.unlink(missing_ok=True)
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
 
-    if result.returncode != 0:
-        raise Exception(f"音频提取失败: {result.stderr[:100]}")
+def is_long_audio(video_path: Path) -> bool:
+    """是否超过 Config.CHUNK_MIN_SECONDS，需要分段识别"""
+    if not Config.CHUNK_MIN_SECONDS:
+        return False
+    return probe_duration(video_path) > Config.CHUNK_MIN_SECONDS
 
-    return audio_path
 
+def transcribe_long_audio(video_path: Path, segment_seconds: float = None) -> str:
+    """长音频分段识别
 
-def get_sts_token():
+    在静音处切成约 segment_seconds 秒的若干段，并行提取上传后合并为一个识别任务，
+    按顺序拼接（去掉硬切重叠部分的重复文字）；失败的段单独重试，最多 Config.CHUNK_RETRIES 次。
+    """
+    segment_seconds = segment_seconds or Config.CHUNK_SECONDS
+    duration = probe_duration(video_path)
+    segments = plan_segments(duration, detect_silences(video_path), segment_seconds, Config.CHUNK_OVERLAP_SECONDS)
+
+    def upload_segment(index: int) -> str:
+        start, end = segments[index]
+        audio_file = extract_audio(video_path, start=start, end=end)
+        try:
+            return upload_to_oss(audio_file)
+        finally:
+            audio_file.unlink(missing_ok=True)
+
+    texts: Dict[int, str] = {}
+    errors: Dict[int, Exception] = {}
+    pending = list(range(len(segments)))
+    for _ in range(Config.CHUNK_RETRIES + 1):
+        if not pending:
+            break
+        errors.clear()
+        url_to_index: Dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=Config.PIPELINE_UPLOAD_WORKERS) as pool:
+            futures = {pool.submit(upload_segment, index): index for index in pending}
+            for future in as_completed(futures):
+                try:
+                    url_to_index[future.result()] = futures[future]
+                except Exception as e:
+                    errors[futures[future]] = e
+
+        for url, result in _transcribe_batches(list(url_to_index)).items():
+            if isinstance(result, Exception):
+                errors[url_to_index[url]] = result
+            else:
+                texts[url_to_index[url]] = result
+        pending = sorted(errors)
+
+    if pending:
+        raise Exception(f"{len(pending)}/{len(segments)} 段识别失败: {errors[pending[0]]}")
+
+    return _stitch_segments([texts[index] for index in range(len(segments))])
+
+
+# 中日韩文字及全角标点（分段拼接时与这类字符相邻不加空格）
+_CJK = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]')
+
+
+def _stitch_segments(texts: List[str], min_overlap: int = 4, max_overlap: int = 80) -> str:
+    """按顺序拼接分段文本，去掉相邻段重叠部分的重复文字"""
+    stitched = ''
+    for text in texts:
+        text = text.strip()
+        # 找前一段结尾与本段开头最长的重合
+        for size in range(min(max_overlap, len(stitched), len(text)), min_overlap - 1, -1):
+            if stitched.endswith(text[:size]):
+                text = text[size:].lstrip()
+                break
+        if text:
+            # 中文直接相连（多余的空格会让检索的二元分词漏掉跨段的词），拉丁文字之间用空格
+            separator = ' ' if stitched and not (_CJK.match(stitched[-1]) or _CJK.match(text[0])) else ''
+            stitched = f"{stitched}{separator}{text}"
+    return stitched
+
+
+# 流式上传的分片大小（OSS 要求除最后一片外不小于 100KB）；内存占用约为 分片大小 × (队列长度 + 1)
+OSS_PART_SIZE = 1024 * 1024
+STREAM_QUEUE_PARTS = 2
+
+
+# OSS 临时音频的对象前缀
+OSS_PREFIX = 'cortex-transcription/'
+
+# DeleteMultipleObjects 单次最多删除的对象数（攒批大小见 Config.OSS_DELETE_BATCH）
+OSS_DELETE_MAX = 1000
+
+# 转写缓存键前缀（不同识别引擎的结果分开缓存）
+CACHE_PREFIX = 'bailian'
+
+# paraformer 单个识别任务最多支持的文件数
+ASR_BATCH_SIZE = 100
+
+# STS 临时凭证有效期与提前刷新时间（秒）
+STS_DURATION_SECONDS = 3600
+STS_REFRESH_MARGIN = 300
+
+_sts_lock = threading.Lock()
+_sts_client = None
+_sts_token = None
+_sts_expires_at = 0.0
+
+_oss_lock = threading.Lock()
+_oss_client = None
+
+
+def _assume_role() -> dict:
     """调用 STS AssumeRole 获取临时凭证"""
-    access_key_id = Config.ALIYUN_ACCESS_KEY_ID
-    access_key_secret = Config.ALIYUN_ACCESS_KEY_SECRET
-    role_arn = Config.ALIYUN_STS_ROLE_ARN
-
-    # 创建 STS client
-    sts_config = OpenApiConfig(
-        access_key_id=access_key_id,
-        access_key_secret=access_key_secret,
-        endpoint='sts.cn-beijing.aliyuncs.com',
-        region_id='cn-beijing'
-    )
-    sts_client = StsClient(sts_config)
+    global _sts_client
+
+    # 创建 STS client（进程内复用）
+    if _sts_client is None:
+        sts_config = OpenApiConfig(
+            access_key_id=Config.ALIYUN_ACCESS_KEY_ID,
+            access_key_secret=Config.ALIYUN_ACCESS_KEY_SECRET,
+            endpoint='sts.cn-beijing.aliyuncs.com',
+            region_id='cn-beijing'
+        )
+        _sts_client = StsClient(sts_config)
 
     # 调用 AssumeRole
     request = AssumeRoleRequest(
-        role_arn=role_arn,
+        role_arn=Config.ALIYUN_STS_ROLE_ARN,
         role_session_name='cortex-transcription-session',
-        duration_seconds=3600
+        duration_seconds=STS_DURATION_SECONDS
     )
 
-    response = sts_client.assume_role(request)
+    requested_at = time.time()
+    response = _sts_client.assume_role(request)
     credentials = response.body.credentials
 
+    # 过期时间以服务端返回为准，解析失败则按申请的有效期估算
+    try:
+        expires_at = datetime.fromisoformat(credentials.expiration.replace('Z', '+00:00')).timestamp()
+    except Exception:
+        expires_at = requested_at + STS_DURATION_SECONDS
+
     return {
         'access_key_id': credentials.access_key_id,
         'access_key_secret': credentials.access_key_secret,
-        'security_token': credentials.security_token
+        'security_token': credentials.security_token,
+        'expires_at': expires_at,
     }
 
 
-def upload_to_oss(audio_file: Path) -> str:
-    """上传文件到OSS并返回公网URL"""
-    # 获取 STS 临时凭证
-    sts_token = get_sts_token()
+def get_sts_token(force_refresh: bool = False) -> dict:
+    """获取 STS 临时凭证（进程内缓存，过期前 STS_REFRESH_MARGIN 秒自动刷新，线程安全）"""
+    global _sts_token, _sts_expires_at
 
-    # 处理 region 格式：oss-cn-beijing -> cn-beijing
-    oss_region = Config.OSS_REGION
-    if oss_region.startswith('oss-'):
-        region = oss_region[4:]
-    else:
-        region = oss_region
+    with _sts_lock:
+        if force_refresh or _sts_token is None or time.time() >= _sts_expires_at - STS_REFRESH_MARGIN:
+            _sts_token = _assume_role()
+            _sts_expires_at = _sts_token['expires_at']
+        return _sts_token
 
-    # 使用临时凭证创建 OSS client
-    credentials_provider = oss.credentials.StaticCredentialsProvider(
+
+def _get_oss_credentials() -> oss.credentials.Credentials:
+    """OSS SDK 每次请求时获取凭证，走 STS 缓存"""
+    sts_token = get_sts_token()
+    return oss.credentials.Credentials(
         sts_token['access_key_id'],
         sts_token['access_key_secret'],
-        sts_token['security_token']
+        sts_token['security_token'],
+        expiration=datetime.fromtimestamp(sts_token['expires_at'], tz=timezone.utc),
     )
 
-    cfg = oss.config.load_default()
-    cfg.credentials_provider = credentials_provider
-    cfg.region = region
 
-    if Config.OSS_ENDPOINT:
-        cfg.endpoint = Config.OSS_ENDPOINT
+def get_oss_client() -> 'oss.Client':
+    """获取进程内共享的 OSS client（上传和删除共用，凭证自动刷新）"""
+    global _oss_client
 
-    client = oss.Client(cfg)
+    with _oss_lock:
+        if _oss_client is None:
+            # 处理 region 格式：oss-cn-beijing -> cn-beijing
+            oss_region = Config.OSS_REGION
+            if oss_region.startswith('oss-'):
+                region = oss_region[4:]
+            else:
+                region = oss_region
 
-    # 生成对象名称（使用时间戳+随机字符串，避免中文和特殊字符导致URL编码问题）
+            cfg = oss.config.load_default()
+            cfg.credentials_provider = oss.credentials.CredentialsProviderFunc(_get_oss_credentials)
+            cfg.region = region
+
+            if Config.OSS_ENDPOINT:
+                cfg.endpoint = Config.OSS_ENDPOINT
+
+            _oss_client = oss.Client(cfg)
+        return _oss_client
+
+
+def _new_object_key(suffix: str) -> str:
+    """生成对象名称（使用时间戳+随机字符串，避免中文和特殊字符导致URL编码问题）"""
     import uuid
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     random_id = str(uuid.uuid4())[:8]
-    key = f"cortex-transcription/{timestamp}_{random_id}.wav"
+    return f"{OSS_PREFIX}{timestamp}_{random_id}{suffix}"
+
+
+def _public_url(key: str) -> str:
+    """生成公网URL"""
+    return f"https://{Config.OSS_BUCKET}.{Config.OSS_REGION}.aliyuncs.com/{key}"
+
+
+def upload_to_oss(audio_file: Path) -> str:
+    """上传文件到OSS并返回公网URL"""
+    client = get_oss_client()
+    key = _new_object_key(audio_file.suffix)
 
     # 上传（设置为 public-read 以便百炼 API 访问）
     result = client.put_object_from_file(
@@ -154,41 +309,212 @@ def upload_to_oss(audio_file: Path) -> str:
     if result.status_code != 200:
         raise Exception(f"OSS上传失败: {result.status_code}")
 
-    # 生成公网URL
-    oss_url = f"https://{Config.OSS_BUCKET}.{Config.OSS_REGION}.aliyuncs.com/{key}"
+    return _public_url(key)
 
-    return oss_url
 
+def stream_audio_to_oss(video_path: Path, profile: str = None) -> str:
+    """ffmpeg 输出写入管道，边编码边分片上传 OSS，不落地临时文件
 
-def transcribe_audio(oss_url: str) -> str:
-    """调用阿里云百炼进行语音识别"""
-    # 设置API Key
-    dashscope.api_key = Config.BAILIAN_API_KEY
+    读取线程把管道数据切成 OSS_PART_SIZE 的分片放入有界队列，主线程逐片上传，
+    编码与上传重叠进行，内存占用有上限。
+    """
+    audio_profile = _get_profile(profile)
+    if 'format' not in audio_profile:
+        raise ValueError(f"音频格式 {profile or Config.AUDIO_PROFILE} 不支持流式输出")
+
+    client = get_oss_client()
+    key = _new_object_key(f".{audio_profile['ext']}")
+
+    cmd = _ffmpeg_audio_cmd(video_path, audio_profile, 'pipe:1')
+    cmd[1:1] = ['-nostdin', '-loglevel', 'error']
+    cmd[-1:-1] = ['-f', audio_profile['format']]
 
-    # 异步提交任务
-    task_response = Transcription.async_call(
-        model='paraformer-v2',
-        file_urls=[oss_url]
+    init = client.initiate_multipart_upload(
+        oss.InitiateMultipartUploadRequest(bucket=Config.OSS_BUCKET, key=key)
     )
+    upload_id = init.upload_id
 
-    if task_response.status_code != 200:
-        raise Exception(f"识别任务提交失败: {task_response.message}")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    chunks: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_PARTS)
 
-    task_id = task_response.output.task_id
+    def read_parts():
+        try:
+            while True:
+                chunk = proc.stdout.read(OSS_PART_SIZE)
+                chunks.put(chunk)
+                if not chunk:
+                    break
+        except Exception:
+            chunks.put(b'')
 
-    # 等待识别完成
-    result = Transcription.wait(task=task_id)
+    reader = threading.Thread(target=read_parts, daemon=True)
+    reader.start()
 
-    if result.status_code != 200:
-        raise Exception(f"识别失败: {result.message}")
+    try:
+        parts = []
+        while True:
+            chunk = chunks.get()
+            if not chunk:
+                break
+            part_number = len(parts) + 1
+            result = client.upload_part(oss.UploadPartRequest(
+                bucket=Config.OSS_BUCKET,
+                key=key,
+                upload_id=upload_id,
+                part_number=part_number,
+                body=chunk,
+            ))
+            parts.append(oss.UploadPart(part_number=part_number, etag=result.etag))
+
+        if proc.wait() != 0:
+            raise Exception(f"音频提取失败: {proc.stderr.read().decode(errors='ignore')[:100]}")
+        if not parts:
+            raise Exception("音频提取失败: 输出为空")
+
+        # 完成上传（设置为 public-read 以便百炼 API 访问）
+        result = client.complete_multipart_upload(oss.CompleteMultipartUploadRequest(
+            bucket=Config.OSS_BUCKET,
+            key=key,
+            upload_id=upload_id,
+            acl='public-read',
+            complete_multipart_upload=oss.CompleteMultipartUpload(parts=parts),
+        ))
+        if result.status_code != 200:
+            raise Exception(f"OSS上传失败: {result.status_code}")
+    except Exception:
+        proc.kill()
+        # 排空队列让读取线程退出
+        while reader.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        try:
+            client.abort_multipart_upload(oss.AbortMultipartUploadRequest(
+                bucket=Config.OSS_BUCKET, key=key, upload_id=upload_id
+            ))
+        except Exception:
+            pass
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+
+    return _public_url(key)
+
+
+def transcribe_audio(oss_url: str, key: str = None) -> str:
+    """调用阿里云百炼进行语音识别（阻塞等待结果）"""
+    return transcribe_audio_async(oss_url, key).result()
+
+
+def transcribe_audio_async(oss_url: str, key: str = None) -> Future:
+    """提交识别任务并立即返回 Future（结果为转录文本），由任务跟踪器统一轮询
 
-    # 获取识别结果
-    results = result.output.results
-    if not results or len(results) == 0:
-        raise Exception("转写结果为空")
+    Args:
+        oss_url: 音频公网 URL（任务结束后自动删除）
+        key: 音频哈希，用于重启后找回任务
+    """
+    try:
+        future = get_asr_tracker().submit([oss_url], {oss_url: key} if key else None)
+    except Exception:
+        queue_oss_delete(oss_url)
+        raise
+    return _then(future, lambda results: _unwrap(results[oss_url]))
+
+
+def resume_transcription(key: str) -> Optional[Future]:
+    """找回重启前已提交、仍在进行中的识别任务（结果为转录文本）"""
+    found = get_asr_tracker().find(key)
+    if not found:
+        return None
+    future, oss_url = found
+    return _then(future, lambda results: _unwrap(results[oss_url]))
+
+
+def _then(future: Future, func) -> Future:
+    """Future 完成后对结果调用 func，返回新的 Future"""
+    chained: Future = Future()
+
+    def done(f: Future):
+        try:
+            chained.set_result(func(f.result()))
+        except Exception as e:
+            chained.set_exception(e)
+
+    future.add_done_callback(done)
+    return chained
+
+
+def _unwrap(result: Union[str, Exception]) -> str:
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _map_task_results(response, file_urls: List[str]) -> Dict[str, Union[str, Exception]]:
+    """把识别任务结果按 file_url 映射为 {file_url: 转录文本 或 失败异常}"""
+    if response.status_code != 200:
+        error = Exception(f"识别失败: {response.message}")
+        return {url: error for url in file_urls}
+
+    results: Dict[str, Union[str, Exception]] = {}
+    for item in response.output.results or []:
+        url = item.get('file_url')
+        if url not in file_urls:
+            continue
+        if item.get('subtask_status', 'SUCCEEDED') != 'SUCCEEDED':
+            results[url] = Exception(
+                f"识别失败: {item.get('message') or item.get('code') or item.get('subtask_status')}"
+            )
+            continue
+        try:
+            results[url] = _parse_transcription_result(item)
+        except Exception as e:
+            results[url] = e
+
+    if response.output.task_status != 'SUCCEEDED' and not results:
+        error = Exception(f"识别失败: {response.output.get('message') or response.output.task_status}")
+        return {url: error for url in file_urls}
+    for url in file_urls:
+        results.setdefault(url, Exception("转写结果为空"))
+    return results
+
+
+def _on_task_done(response, file_urls: List[str], keys: Dict[str, str]) -> Dict[str, Union[str, Exception]]:
+    """识别任务结束：映射结果，写入转写缓存（含重启后恢复的任务），删除 OSS 临时文件
+
+    Returns:
+        {file_url: 转录文本 或 失败异常}，作为任务 Future 的结果
+    """
+    try:
+        results = _map_task_results(response, file_urls)
+        cache = get_transcript_cache()
+        if cache and keys:
+            for url, result in results.items():
+                if keys.get(url) and not isinstance(result, Exception):
+                    cache.put(keys[url], result)
+        return results
+    finally:
+        for url in file_urls:
+            queue_oss_delete(url)
 
-    transcription_result = results[0]
 
+_tracker: Optional[AsrTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_asr_tracker() -> AsrTracker:
+    """获取进程内共享的识别任务跟踪器（首次获取时恢复上次未完成的任务）"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = AsrTracker(on_done=_on_task_done)
+        return _tracker
+
+
+def _parse_transcription_result(transcription_result: dict) -> str:
+    """从单个文件的识别结果中取出文本"""
     # 尝试不同的字段名
     transcription_text = (
         transcription_result.get('transcription') or
@@ -199,8 +525,8 @@ def transcribe_audio(oss_url: str) -> str:
 
     # 如果没有直接的文本，从 transcription_url 下载
     if not transcription_text and transcription_result.get('transcription_url'):
-        import requests
-        response = requests.get(transcription_result['transcription_url'])
+        from http_client import get_session
+        response = get_session().get(transcription_result['transcription_url'])
         response.raise_for_status()
 
         download_data = response.json()
@@ -227,46 +553,206 @@ def transcribe_audio(oss_url: str) -> str:
     return transcription_text
 
 
-def delete_oss_file(oss_url: str):
-    """删除 OSS 临时文件"""
-    # 从 URL 提取 key
-    # URL 格式: https://bucket.region.aliyuncs.com/key
-    parsed = urlparse(oss_url)
-    key = parsed.path.lstrip('/')
+def _transcribe_batches(oss_urls: List[str], batch_size: int = ASR_BATCH_SIZE,
+                        keys: Dict[str, str] = None) -> Dict[str, Union[str, Exception]]:
+    """分批提交识别任务，所有批次先全部提交再统一等待（OSS 临时文件在任务结束后删除）
 
-    # 获取 STS 临时凭证
-    sts_token = get_sts_token()
-
-    # 处理 region 格式
-    oss_region = Config.OSS_REGION
-    if oss_region.startswith('oss-'):
-        region = oss_region[4:]
-    else:
-        region = oss_region
+    Returns:
+        {OSS URL: 转录文本 或 失败异常}
+    """
+    results: Dict[str, Union[str, Exception]] = {}
+    tracker = get_asr_tracker()
+    tasks = []
+    for i in range(0, len(oss_urls), batch_size):
+        batch = oss_urls[i:i + batch_size]
+        try:
+            batch_keys = {url: keys[url] for url in batch if url in keys} if keys else None
+            tasks.append((tracker.submit(batch, batch_keys), batch))
+        except Exception as e:
+            for url in batch:
+                results[url] = e
+                queue_oss_delete(url)
+
+    # 等待每个任务完成，按 file_url 映射结果
+    for future, batch in tasks:
+        try:
+            results.update(future.result())
+        except Exception as e:
+            for url in batch:
+                results[url] = e
+
+    return results
+
+
+def transcribe_videos(video_paths: List[str], upload_workers: int = 4, batch_size: int = ASR_BATCH_SIZE,
+                      stats: Dict[str, float] = None) -> Dict[str, Union[str, Exception]]:
+    """批量转录视频
+
+    并行提取音频并上传，每个识别任务提交最多 batch_size 个文件，所有批次先全部提交再统一等待。
 
-    # 使用临时凭证创建 OSS client
-    credentials_provider = oss.credentials.StaticCredentialsProvider(
-        sts_token['access_key_id'],
-        sts_token['access_key_secret'],
-        sts_token['security_token']
-    )
+    Args:
+        video_paths: 视频文件路径列表
+        upload_workers: 提取音频/上传并发数
+        batch_size: 单个识别任务的文件数上限
+        stats: 传入字典时累加统计：转写缓存 hits / misses，静音裁剪 trimmed_seconds
 
-    cfg = oss.config.load_default()
-    cfg.credentials_provider = credentials_provider
-    cfg.region = region
+    Returns:
+        {视频路径: 转录文本 或 失败异常}
+    """
+    results: Dict[str, Union[str, Exception]] = {}
+    cache = get_transcript_cache()
+    path_hashes: Dict[str, str] = {}
+    stats_lock = threading.Lock()
+
+    # 1. 并行查缓存 / 提取音频 + 上传 OSS（命中缓存的返回 None）
+    def prepare(video_path: str) -> Optional[str]:
+        if cache:
+            cache_key = f"{CACHE_PREFIX}:{audio_fingerprint(Path(video_path))}"
+            path_hashes[video_path] = cache_key
+            cached = cache.get(cache_key)
+            if stats is not None:
+                with stats_lock:
+                    key = 'misses' if cached is None else 'hits'
+                    stats[key] = stats.get(key, 0) + 1
+            if cached is not None:
+                results[video_path] = cached
+                return None
+            resumed = resume_transcription(cache_key)
+            if resumed:
+                # 重启前已提交的同一段音频，继续等待原任务
+                results[video_path] = resumed.result()
+                return None
+        if is_long_audio(Path(video_path)):
+            # 长音频单独分段识别，不进入批量任务
+            results[video_path] = transcribe_long_audio(Path(video_path))
+            if cache:
+                cache.put(path_hashes[video_path], results[video_path])
+            return None
+        info: Dict = {}
+        oss_url = prepare_audio_url(Path(video_path), info)
+        if stats is not None and 'offset_map' in info:
+            with stats_lock:
+                stats['trimmed_seconds'] = stats.get('trimmed_seconds', 0) + info['offset_map'].removed_seconds
+        return oss_url
+
+    url_to_path: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=upload_workers) as pool:
+        futures = {pool.submit(prepare, str(path)): str(path) for path in video_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                oss_url = future.result()
+                if oss_url:
+                    url_to_path[oss_url] = path
+            except Exception as e:
+                results[path] = e
+
+    # 2. 分批识别，按 file_url 把结果映射回视频（结果由任务跟踪器写入转写缓存）
+    keys = {url: path_hashes[path] for url, path in url_to_path.items() if path in path_hashes}
+    for url, result in _transcribe_batches(list(url_to_path), batch_size, keys).items():
+        results[url_to_path[url]] = result
+
+    return results
+
+
+def _object_key(oss_url: str) -> str:
+    """从 URL 提取对象名称（URL 格式: https://bucket.region.aliyuncs.com/key）"""
+    return urlparse(oss_url).path.lstrip('/')
 
-    if Config.OSS_ENDPOINT:
-        cfg.endpoint = Config.OSS_ENDPOINT
 
-    client = oss.Client(cfg)
+def delete_oss_file(oss_url: str):
+    """立即删除单个 OSS 临时文件"""
+    client = get_oss_client()
 
     # 删除文件
     result = client.delete_object(
         oss.DeleteObjectRequest(
             bucket=Config.OSS_BUCKET,
-            key=key
+            key=_object_key(oss_url)
         )
     )
 
     if result.status_code not in [200, 204]:
         raise Exception(f"OSS删除失败: {result.status_code}")
+
+
+_delete_lock = threading.Lock()
+_delete_queue: List[str] = []
+
+
+def queue_oss_delete(oss_url: str):
+    """把 OSS 临时文件加入删除队列，攒够 Config.OSS_DELETE_BATCH 个后批量删除
+
+    进程退出时会清空队列；异常退出遗留的对象由 sweep_oss 按 TTL 清理。
+    """
+    with _delete_lock:
+        _delete_queue.append(_object_key(oss_url))
+        if len(_delete_queue) < Config.OSS_DELETE_BATCH:
+            return
+    flush_oss_deletes()
+
+
+def flush_oss_deletes() -> int:
+    """批量删除队列中的所有对象，返回删除数量"""
+    with _delete_lock:
+        keys = _delete_queue[:]
+        _delete_queue.clear()
+    if not keys:
+        return 0
+    try:
+        return delete_oss_objects(keys)
+    except Exception:
+        # 删除失败不影响转写，遗留对象由 sweep 清理
+        return 0
+
+
+atexit.register(flush_oss_deletes)
+
+
+def delete_oss_objects(keys: List[str]) -> int:
+    """DeleteMultipleObjects 批量删除（每次最多 OSS_DELETE_MAX 个），返回删除数量"""
+    client = get_oss_client()
+    deleted = 0
+    for i in range(0, len(keys), OSS_DELETE_MAX):
+        batch = keys[i:i + OSS_DELETE_MAX]
+        result = client.delete_multiple_objects(
+            oss.DeleteMultipleObjectsRequest(
+                bucket=Config.OSS_BUCKET,
+                objects=[oss.DeleteObject(key=key) for key in batch],
+                quiet=True,
+            )
+        )
+        if result.status_code != 200:
+            raise Exception(f"OSS批量删除失败: {result.status_code}")
+        deleted += len(batch)
+    return deleted
+
+
+def sweep_oss(ttl_hours: float = None, dry_run: bool = False) -> Dict[str, int]:
+    """清理 OSS_PREFIX 下超过 TTL 的遗留临时文件（进程崩溃未删除的音频）
+
+    Args:
+        ttl_hours: 保留时长（小时），默认 Config.OSS_SWEEP_TTL_HOURS
+        dry_run: 只统计不删除
+
+    Returns:
+        {'scanned', 'expired', 'bytes', 'deleted'}
+    """
+    ttl_hours = ttl_hours if ttl_hours is not None else Config.OSS_SWEEP_TTL_HOURS
+    cutoff = datetime.now(timezone.utc).timestamp() - ttl_hours * 3600
+    client = get_oss_client()
+
+    report = {'scanned': 0, 'expired': 0, 'bytes': 0, 'deleted': 0}
+    expired: List[str] = []
+    paginator = client.list_objects_v2_paginator()
+    for page in paginator.iter_page(oss.ListObjectsV2Request(bucket=Config.OSS_BUCKET, prefix=OSS_PREFIX)):
+        for obj in page.contents or []:
+            report['scanned'] += 1
+            if obj.last_modified and obj.last_modified.timestamp() < cutoff:
+                expired.append(obj.key)
+                report['bytes'] += obj.size or 0
+    report['expired'] = len(expired)
+
+    if expired and not dry_run:
+        report['deleted'] = delete_oss_objects(expired)
+    return report
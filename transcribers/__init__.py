@@ -0,0 +1,23 @@
+"""转写引擎"""
+from .base import TranscriberBackend
+from .bailian import BailianTranscriber
+from .local import LocalTranscriber
+from .fake import FakeTranscriber
+
+# 转写引擎注册表
+TRANSCRIBERS = {
+    'bailian': BailianTranscriber,
+    'local': LocalTranscriber,
+    'fake': FakeTranscriber,
+}
+
+
+def get_transcriber(name: str, config=None):
+    """获取转写引擎"""
+    transcriber_class = TRANSCRIBERS.get(name)
+    if not transcriber_class:
+        raise ValueError(f"不支持的转写引擎: {name}")
+    return transcriber_class(config)
+
+
+__all__ = ['TranscriberBackend', 'BailianTranscriber', 'LocalTranscriber', 'FakeTranscriber', 'get_transcriber']
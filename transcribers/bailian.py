@@ -0,0 +1,114 @@
+"""阿里云百炼转写引擎（OSS 上传 + paraformer 识别）"""
+from pathlib import Path
+from typing import Dict, List, Union
+
+from .base import TranscriberBackend
+from pipeline import Stage, Job
+from config import Config
+from transcript_cache import get_transcript_cache
+
+
+class BailianTranscriber(TranscriberBackend):
+    """阿里云百炼转写引擎"""
+
+    name = 'bailian'
+    # 识别任务结束时由任务跟踪器写入缓存（含重启后恢复的任务），长音频在识别阶段写入
+    writes_cache = True
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.workers = Config.PIPELINE_TRANSCRIBE_WORKERS
+        # 恢复上次进程退出时仍在进行中的识别任务
+        from transcriber import get_asr_tracker
+        get_asr_tracker()
+
+    def transcribe(self, video_path: Path) -> str:
+        """提取音频 → 上传 OSS → 百炼识别"""
+        from transcriber import transcribe_video
+        return transcribe_video(str(video_path))
+
+    def stages(self) -> List[Stage]:
+        """提取音频 → 上传 OSS → 百炼识别，分阶段并发"""
+        from transcriber import (extract_audio, trim_silence, upload_to_oss, stream_audio_to_oss,
+                                 supports_streaming, transcribe_audio_async, resume_transcription,
+                                 is_long_audio, transcribe_long_audio)
+
+        def route(func):
+            """重启前已提交的任务直接续接；长音频跳过整段提取/上传，在识别阶段分段处理"""
+            def run(job: Job):
+                cache_key = job.data.get('cache_key')
+                resumed = resume_transcription(cache_key) if cache_key else None
+                if resumed:
+                    job.data['asr_future'] = resumed
+                elif is_long_audio(Path(job.data['video_path'])):
+                    job.data['long_audio'] = True
+                else:
+                    func(job)
+            return run
+
+        def extract(job: Job):
+            job.data['audio_path'] = extract_audio(Path(job.data['video_path']))
+
+        def trim(job: Job):
+            job.data['audio_path'], job.data['offset_map'] = trim_silence(Path(job.data['video_path']))
+
+        def upload(job: Job):
+            if 'audio_path' not in job.data:
+                return
+            audio_path = job.data['audio_path']
+            try:
+                job.data['oss_url'] = upload_to_oss(audio_path)
+            finally:
+                audio_path.unlink(missing_ok=True)
+
+        def stream_upload(job: Job):
+            job.data['oss_url'] = stream_audio_to_oss(Path(job.data['video_path']))
+
+        def transcribe(job: Job):
+            if job.data.get('long_audio'):
+                job.data['transcript'] = transcribe_long_audio(Path(job.data['video_path']))
+                if job.data.get('cache_key'):
+                    get_transcript_cache().put(job.data['cache_key'], job.data['transcript'])
+                return None
+            # 异步阶段：提交后立即返回，由任务跟踪器轮询，不占用阶段线程
+            future = job.data.get('asr_future') or transcribe_audio_async(
+                job.data['oss_url'], job.data.get('cache_key')
+            )
+
+            def done(f):
+                if not f.exception():
+                    job.data['transcript'] = f.result()
+
+            future.add_done_callback(done)
+            return future
+
+        if Config.VAD_TRIM:
+            # 静音裁剪需要完整解码，替代提取阶段（不走流式上传）
+            stages = [
+                Stage('trim', route(trim), Config.PIPELINE_EXTRACT_WORKERS),
+                Stage('upload', upload, Config.PIPELINE_UPLOAD_WORKERS),
+            ]
+        elif Config.AUDIO_STREAMING and supports_streaming():
+            # 流式：提取与上传在同一阶段边编码边上传
+            stages = [Stage('upload', route(stream_upload), Config.PIPELINE_UPLOAD_WORKERS)]
+        else:
+            stages = [
+                Stage('extract', route(extract), Config.PIPELINE_EXTRACT_WORKERS),
+                Stage('upload', upload, Config.PIPELINE_UPLOAD_WORKERS),
+            ]
+        return stages + [Stage('transcribe', transcribe, self.workers)]
+
+    def close(self):
+        """批量删除本批次遗留在删除队列中的 OSS 临时文件"""
+        from transcriber import flush_oss_deletes
+        flush_oss_deletes()
+
+    def transcribe_many(self, video_paths: List[str],
+                        stats: Dict[str, float] = None) -> Dict[str, Union[str, Exception]]:
+        """并行上传，多个文件合并为一个识别任务"""
+        from transcriber import transcribe_videos
+        return transcribe_videos(
+            [str(path) for path in video_paths],
+            upload_workers=Config.PIPELINE_UPLOAD_WORKERS,
+            stats=stats,
+        )
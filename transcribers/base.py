@@ -0,0 +1,88 @@
+"""转写引擎基类"""
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Union
+
+from pipeline import Stage, Job
+
+
+class TranscriberBackend(ABC):
+    """转写引擎基类"""
+
+    # 引擎名称，同时作为转写缓存键前缀
+    name = 'base'
+    # 是否走转写缓存（按音频内容哈希，需要 ffmpeg）
+    cacheable = True
+    # 转写结果由引擎自己写入缓存（流水线不再写入）
+    writes_cache = False
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or {}
+        self.workers = 1
+
+    @abstractmethod
+    def transcribe(self, video_path: Path) -> str:
+        """转录单个视频
+
+        Args:
+            video_path: 视频文件路径
+
+        Returns:
+            转录文本
+        """
+        pass
+
+    def stages(self) -> List[Stage]:
+        """流水线转写阶段（读取 job.data['video_path']，写入 job.data['transcript']）
+
+        默认一个阶段直接调用 transcribe，需要拆分阶段的引擎可覆盖此方法。
+        """
+        def transcribe(job: Job):
+            job.data['transcript'] = self.transcribe(Path(job.data['video_path']))
+
+        return [Stage('transcribe', transcribe, self.workers)]
+
+    def close(self):
+        """一批转写结束后调用，用于收尾（如清空待删除的临时文件），默认无操作"""
+        pass
+
+    def transcribe_many(self, video_paths: List[str],
+                        stats: Dict[str, float] = None) -> Dict[str, Union[str, Exception]]:
+        """批量转录（默认按 workers 并发逐个转录，走转写缓存）
+
+        Args:
+            video_paths: 视频文件路径列表
+            stats: 传入字典时累加转写缓存的 hits / misses
+
+        Returns:
+            {视频路径: 转录文本 或 失败异常}
+        """
+        from audio import audio_fingerprint
+        from transcript_cache import get_transcript_cache
+        cache = get_transcript_cache() if self.cacheable else None
+
+        def run(video_path: str) -> str:
+            cache_key = None
+            if cache:
+                cache_key = f"{self.name}:{audio_fingerprint(Path(video_path))}"
+                cached = cache.get(cache_key)
+                if stats is not None:
+                    key = 'misses' if cached is None else 'hits'
+                    stats[key] = stats.get(key, 0) + 1
+                if cached is not None:
+                    return cached
+            text = self.transcribe(Path(video_path))
+            if cache:
+                cache.put(cache_key, text)
+            return text
+
+        results: Dict[str, Union[str, Exception]] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {str(path): pool.submit(run, str(path)) for path in video_paths}
+            for path, future in futures.items():
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    results[path] = e
+        return results
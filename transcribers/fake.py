@@ -0,0 +1,36 @@
+"""假转写引擎 - 离线测试流水线用，不调用任何服务"""
+import time
+from pathlib import Path
+
+from config import Config
+from .base import TranscriberBackend
+
+
+class FakeTranscriber(TranscriberBackend):
+    """假转写引擎：代替 OSS 上传 + 百炼识别
+
+    按上传带宽模拟上传耗时、按固定延迟模拟识别耗时；回放夹具中有该视频的识别结果时返回录制的文本，
+    否则按文件名返回固定文本。
+    """
+
+    name = 'fake'
+    cacheable = False
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.delay = float(self.config.get('fake_delay', Config.FAKE_ASR_DELAY))
+        self.upload_mb = Config.FAKE_UPLOAD_MB
+        self.fixtures_dir = Path(Config.REPLAY_DIR) / 'asr'
+        self.workers = int(self.config.get('fake_workers', Config.FAKE_ASR_WORKERS))
+
+    def transcribe(self, video_path: Path) -> str:
+        video_path = Path(video_path)
+        if self.upload_mb:
+            time.sleep(video_path.stat().st_size / (self.upload_mb * 1024 * 1024))
+        if self.delay:
+            time.sleep(self.delay)
+        # 文件名为 {日期}_{视频ID}
+        fixture = self.fixtures_dir / f"{video_path.stem.split('_', 1)[-1]}.txt"
+        if fixture.exists():
+            return fixture.read_text(encoding='utf-8')
+        return f"[fake] {video_path.stem}"
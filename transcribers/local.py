@@ -0,0 +1,62 @@
+"""本地 CPU 转写引擎（faster-whisper / CTranslate2 int8）"""
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .base import TranscriberBackend
+from config import Config
+
+# 已加载的模型（进程内常驻复用）: (模型, 计算精度, 并发数) -> (WhisperModel, 并发槽位)
+_models: Dict[Tuple[str, str, int], Tuple[object, threading.Semaphore]] = {}
+_models_lock = threading.Lock()
+
+
+def _load_model(model_size: str, compute_type: str, workers: int) -> Tuple[object, threading.Semaphore]:
+    """加载模型（每个配置只加载一次）"""
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise ImportError("缺少依赖库，请运行: pip install faster-whisper")
+
+    key = (model_size, compute_type, workers)
+    with _models_lock:
+        if key not in _models:
+            # num_workers: CTranslate2 内部的模型副本数，可供多个线程同时转写
+            model = WhisperModel(
+                model_size,
+                device='cpu',
+                compute_type=compute_type,
+                cpu_threads=Config.LOCAL_ASR_CPU_THREADS,
+                num_workers=workers,
+            )
+            _models[key] = (model, threading.Semaphore(workers))
+        return _models[key]
+
+
+class LocalTranscriber(TranscriberBackend):
+    """本地 CPU 转写引擎 - 模型常驻内存，无需上传和排队，适合短视频"""
+
+    name = 'local'
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.model_size = self.config.get('local_asr_model', Config.LOCAL_ASR_MODEL)
+        self.compute_type = Config.LOCAL_ASR_COMPUTE_TYPE
+        self.workers = Config.LOCAL_ASR_WORKERS
+
+    def transcribe(self, video_path: Path) -> str:
+        """直接解码视频文件识别（faster-whisper 内置 PyAV 解码）"""
+        model, slots = _load_model(self.model_size, self.compute_type, self.workers)
+        with slots:
+            segments, _ = model.transcribe(
+                str(video_path),
+                language=Config.LOCAL_ASR_LANGUAGE or None,
+                beam_size=1,
+                vad_filter=True,
+            )
+            # segments 是惰性生成器，识别在遍历时进行
+            text = ''.join(segment.text.strip() for segment in segments)
+
+        if not text:
+            raise Exception("转写文本为空")
+        return text
@@ -0,0 +1,90 @@
+"""转写缓存模块 - 按音频内容哈希缓存转录文本，重复音频不再重复转写"""
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+from config import Config
+
+
+class TranscriptCache:
+    """转写缓存 - SQLite 存储，超出容量时按最近使用时间淘汰"""
+
+    def __init__(self, db_path: Path = None, max_bytes: int = None):
+        self.db_path = Path(db_path or Config.TRANSCRIPT_CACHE_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else Config.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    audio_hash TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at TEXT,
+                    last_used TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_transcripts_last_used ON transcripts (last_used);
+            """)
+
+    def get(self, audio_hash: str) -> Optional[str]:
+        """查询缓存，命中时刷新最近使用时间"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT text FROM transcripts WHERE audio_hash = ?", (audio_hash,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_used = ? WHERE audio_hash = ?",
+                (datetime.now().isoformat(), audio_hash)
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, audio_hash: str, text: str):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        now = datetime.now().isoformat()
+        size = len(text.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (audio_hash, text, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (audio_hash, text, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小不超过上限"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT audio_hash, size FROM transcripts ORDER BY last_used ASC"
+        ).fetchall()
+        for audio_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM transcripts WHERE audio_hash = ?", (audio_hash,))
+            total -= size
+
+
+_cache: Optional[TranscriptCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """获取进程内共享的转写缓存（未启用时返回 None）"""
+    global _cache
+    if not Config.TRANSCRIPT_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranscriptCache()
+        return _cache